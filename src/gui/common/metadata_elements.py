@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Callable
 from pandas import DataFrame, Series
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QLabel
 from gui.common.rendered_logs_table import RenderedLogsTable
+from logs_managing.logs_style import LogsStyle
 
 class MetadataType(ABC):
     @abstractmethod
@@ -15,7 +17,7 @@ class MetadataType(ABC):
         pass
 
 class MetadataLogLine(MetadataType):
-    def __init__(self, data:str, style:Series=None):
+    def __init__(self, data:str, style:LogsStyle=None):
         self.element = None
         self.style = style
         self.data = data
@@ -31,15 +33,34 @@ class MetadataLogLine(MetadataType):
         self.element.setContentsMargins(0,0,0,0)
         return self.element.refresh()
 
+class MetadataIndexedLogLine(MetadataLogLine):
+    ''' Log line that is read from its file only when shown, by its position in a LineIndex. '''
+    def __init__(self, data:int|str, line_index, style:LogsStyle=None):
+        self.element = None
+        self.style = style
+        self.position = int(data)
+        self.line_index = line_index
+    @property
+    def data(self): return self.line_index.get_line(self.position)
+
 class MetadataLogsSection(MetadataType):
-    def __init__(self, data:DataFrame, style:Series=None, is_iloc:bool=False):
+    ''' Section of log rows. Data can be given lazily, as a callable returning (data, style),
+        so the rows are materialized only when the section is shown.
+    '''
+    def __init__(self, data:DataFrame|Callable[[], tuple[DataFrame, LogsStyle]], style:LogsStyle=None, is_iloc:bool=False):
         self.element = None
         self.style = style
-        self.data = data
+        self.__data = data
+    @property
+    def data(self) -> DataFrame:
+        if callable(self.__data):
+            self.__data, self.style = self.__data()
+        return self.__data
     def get_value(self): return self.data
     def get_widget(self):
         if self.element is None:
-            self.element = RenderedLogsTable(self.data, self.style)
+            data = self.data
+            self.element = RenderedLogsTable(data, self.style)
         # Set size to fit 5 rows, rest is scrollable
         row_height = self.element.verticalHeader().defaultSectionSize() if hasattr(self.element, 'verticalHeader') else 24
         total_height = min(5, len(self.data)+1) * row_height + 2
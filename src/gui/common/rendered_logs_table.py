@@ -1,29 +1,52 @@
 from PyQt5.QtWidgets import QTableView, QAbstractItemView
-from PyQt5.QtCore import QAbstractTableModel, Qt, QVariant
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QVariant
 from PyQt5.QtGui import QColor
 
-from pandas import DataFrame, Series
+import numpy
+from bisect import bisect_right
+from pandas import DataFrame, Series, concat
 
-from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
+from logs_managing.logs_style import LogsStyle
+from processor.column_matching import column_contains
 
 class LogsTableModel(QAbstractTableModel):
     ''' Table model for displaying logs with metadata support. 
         Should be used in conjunction with RenderedLogsTable(or any QTableView.setModel).\n
-        Advise: Do not use directly, use RenderedLogsTable
+        Advise: Do not use directly, use RenderedLogsTable\n
+        Appended rows are kept as blocks (concatenated only when the whole data is read), styles are extended in place.
     ''' 
     def __init__(self,
                  data: DataFrame=None,
-                 styles: Series=None):
+                 styles: LogsStyle=None):
         super().__init__()
         self._visible_data = None
         self._styles = None
         self.update_model_data(data, styles)
 
+    @property
+    def _visible_data(self) -> DataFrame:
+        if len(self._data_blocks) > 1:
+            self._data_blocks = [concat(self._data_blocks)]
+            self._block_starts = [0]
+        return self._data_blocks[0]
+
+    @_visible_data.setter
+    def _visible_data(self, data: DataFrame):
+        data = data if data is not None else DataFrame()
+        self._data_blocks = [data]
+        self._block_starts = [0]
+        self._rows = len(data)
+
+    def __locate(self, row: int) -> tuple[DataFrame, int]:
+        ''' Block of a row and position of the row in it. '''
+        block = bisect_right(self._block_starts, row) - 1
+        return self._data_blocks[block], row - self._block_starts[block]
+
     def rowCount(self, _=None):
-        return len(self._visible_data)
+        return self._rows
 
     def columnCount(self, _=None):
-        return len(self._visible_data.columns)
+        return len(self._data_blocks[0].columns)
 
     def data(self, index, role=Qt.DisplayRole):
         # Default model handling
@@ -31,12 +54,13 @@ class LogsTableModel(QAbstractTableModel):
             return QVariant()
         # Display role = simply cast to string
         if role == Qt.DisplayRole:
-            return str(self._visible_data.iloc[index.row(), index.column()])
+            block, row = self.__locate(index.row())
+            return str(block.iat[row, index.column()])
         # Foreground role = use metadata column if available
         elif role == Qt.ForegroundRole:
             if self._styles is None or index.row() < 0 or index.row() >= len(self._styles):
                 return QColor("#000000")
-            fg = self._styles.iloc[index.row()][RMetaNS.General.name][RMetaNS.General.ForegroundColor].get_value()
+            fg = self._styles.get_foreground(index.row())
             if fg:
                 return QColor(fg)
             else:
@@ -45,7 +69,7 @@ class LogsTableModel(QAbstractTableModel):
         elif role == Qt.BackgroundRole:
             if self._styles is None or index.row() < 0 or index.row() >= len(self._styles):
                 return QColor("#FFFFFF")
-            bg = self._styles.iloc[index.row()][RMetaNS.General.name][RMetaNS.General.BackgroundColor].get_value()
+            bg = self._styles.get_background(index.row())
             if bg:
                 return QColor(bg)
             else:
@@ -58,9 +82,10 @@ class LogsTableModel(QAbstractTableModel):
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole:
             if orientation == Qt.Horizontal:
-                return str(self._visible_data.columns[section])
+                return str(self._data_blocks[0].columns[section])
             elif orientation == Qt.Vertical:
-                return str(self._visible_data.index[section])
+                block, row = self.__locate(section)
+                return str(block.index[row])
         return QVariant()
     
     # If the row is collapsed, show it
@@ -93,24 +118,68 @@ class LogsTableModel(QAbstractTableModel):
 
     def update_model_data(self,
                     data: DataFrame,
-                    styles: Series):
+                    styles: LogsStyle):
         ''' Update the model with new data, metadata, and collapsable information.
             This will refresh the view automatically.
         '''
         self.beginResetModel()
         self._visible_data = data
         self._styles = styles
+        # Styles are shared with the caller until rows are appended
+        self._owns_styles = False
         self.endResetModel()
 
+    def append_model_data(self,
+                    data: DataFrame,
+                    styles: LogsStyle):
+        ''' Append rows after the existing ones, without resetting the model (view keeps its position).'''
+        if data is None or data.empty:
+            return
+        first_row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(data) - 1)
+        if self._rows == 0:
+            self._visible_data = data
+        else:
+            self._data_blocks.append(data)
+            self._block_starts.append(self._rows)
+            self._rows += len(data)
+        if self._styles is not None and styles is not None:
+            self.__get_own_styles().extend(styles)
+        self.endInsertRows()
+
+    def remove_last_rows(self, count: int):
+        ''' Remove the last rows (e.g. before appending their reprocessed version). '''
+        count = min(count, self._rows)
+        if count <= 0:
+            return
+        rows = self._rows - count
+        self.beginRemoveRows(QModelIndex(), rows, self._rows - 1)
+        while self._block_starts[-1] >= rows and len(self._data_blocks) > 1:
+            self._data_blocks.pop()
+            self._block_starts.pop()
+        self._data_blocks[-1] = self._data_blocks[-1].iloc[:rows - self._block_starts[-1]]
+        self._rows = rows
+        if self._styles is not None:
+            self.__get_own_styles().truncate(rows)
+        self.endRemoveRows()
+
+    def __get_own_styles(self) -> LogsStyle:
+        ''' Styles of the model, copied once from the caller before they are changed. '''
+        if not self._owns_styles:
+            self._styles = LogsStyle(self._styles.palette).extend(self._styles)
+            self._owns_styles = True
+        return self._styles
+
 
 
 
 
 class RenderedLogsTable(QTableView):
-    def __init__(self, data:DataFrame=None, style:Series=None, selectable:bool=False):
+    def __init__(self, data:DataFrame=None, style:LogsStyle=None, selectable:bool=False):
         super().__init__()
+        self.__data = None
         self.data = data if data is not None else DataFrame()
-        self.style = style if style is not None else Series()
+        self.style = style
         self.setSortingEnabled(False)
         self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -120,7 +189,18 @@ class RenderedLogsTable(QTableView):
             self.setSelectionMode(QAbstractItemView.NoSelection)
         self.horizontalHeader().setStretchLastSection(True)
 
-    def refresh(self, data:DataFrame=None, style:Series=None):
+    @property
+    def data(self) -> DataFrame:
+        if self.__data is None and isinstance(self.model(), LogsTableModel):
+            # Appended rows are kept only by the model, until the whole data is read
+            self.__data = self.model()._visible_data
+        return self.__data
+
+    @data.setter
+    def data(self, data:DataFrame):
+        self.__data = data
+
+    def refresh(self, data:DataFrame=None, style:LogsStyle=None):
         self.setUpdatesEnabled(False)
         self.data = data if data is not None else self.data
         self.style = style if style is not None else self.style
@@ -132,6 +212,26 @@ class RenderedLogsTable(QTableView):
         self.setUpdatesEnabled(True)
         return self
     
+    def append(self, data:DataFrame, style:LogsStyle=None):
+        ''' Append rows to the shown table (e.g. lines appended to followed log files). '''
+        if data is None or data.empty:
+            return self
+        if not isinstance(self.model(), LogsTableModel):
+            return self.refresh(data, style)
+        self.model().append_model_data(data, style)
+        self.__data = None
+        self.style = self.model()._styles
+        return self
+
+    def remove_last_rows(self, count:int):
+        ''' Remove the last shown rows (e.g. before appending their reprocessed version). '''
+        if count <= 0 or not isinstance(self.model(), LogsTableModel):
+            return self
+        self.model().remove_last_rows(count)
+        self.__data = None
+        self.style = self.model()._styles
+        return self
+
     def show_model(self):
         if self.data is not None:
             self.setModel(
@@ -150,8 +250,10 @@ class RenderedLogsTable(QTableView):
         return (iloc_indexes, loc_indexes)
 
     def get_search_indexes(self, search_text: str) -> list[int]:
-        mask = self.data.astype(str).apply(lambda x: x.str.contains(search_text, case=False, na=False)).any(axis=1)
-        indexes = self.data.index[mask]
-        iloc_indexes = [self.data.index.get_loc(idx) for idx in indexes]
-        loc_indexes = [self.data.index[idx] for idx in iloc_indexes]
+        # Plain words (most searches) are found without the regex engine, see column_contains
+        mask = numpy.zeros(len(self.data), dtype=bool)
+        for column in self.data.columns:
+            mask |= column_contains(self.data[column], search_text, case=False).to_numpy(dtype=bool)
+        iloc_indexes = numpy.flatnonzero(mask).tolist()
+        loc_indexes = self.data.index[iloc_indexes].tolist()
         return (iloc_indexes, loc_indexes)
@@ -1,9 +1,10 @@
-import threading
 from PyQt5.QtWidgets import QStatusBar, QLabel
 from PyQt5.QtWidgets import QStatusBar, QLabel, QProgressBar
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QApplication
 
+from processor.run_scheduler import RunScheduler
+
 class StatusManager:
     _instance = None
 
@@ -19,8 +20,14 @@ class StatusManager:
         return self.status_bar
 
 class StatusBar(QStatusBar):
+    # Emitted from the background thread, handled in the main thread
+    progress_changed = pyqtSignal(str, int, int)
+    run_done = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
+        self.progress_changed.connect(self.set_progress)
+        self.run_done.connect(self.finish_run)
         self.setSizeGripEnabled(False)
         self.setVisible(True)
         
@@ -58,19 +65,27 @@ class StatusBar(QStatusBar):
         self.progress_bar.setMaximum(100)
         self.label.setText("Ready")
 
-    def call_in_background(self, background_cmd: callable, on_done: callable = None):
-        """Run worker_method in a separate thread, then call on_done in the main thread when finished."""
-        def worker():
-            background_cmd()
-            self.stop_progress()
-            self.set_status("Ready")
-            if on_done:
-                QTimer.singleShot(0, on_done)
+    def set_progress(self, text: str, done: int, total: int):
+        self.progress_bar.setMinimum(0)
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(min(done, max(total, 1)))
+        self.set_status(text)
+
+    def finish_run(self, on_done: callable = None):
+        self.stop_progress()
+        self.set_status("Ready")
+        if on_done:
+            on_done()
 
+    def call_in_background(self, background_cmd: callable, on_done: callable = None, key: str = "run"):
+        """Schedule background_cmd(run_token) in the background thread of RunScheduler, then call on_done in the main thread when finished.
+        Only one command runs at a time. A command scheduled while another one with the same key runs cancels it."""
         self.start_progress()
         self.set_status("Processing...")
-        thread = threading.Thread(target=worker)
-        thread.start()
+        RunScheduler().submit(background_cmd,
+                              on_done=lambda: self.run_done.emit(on_done),
+                              key=key,
+                              on_progress=self.progress_changed.emit)
     
     def call(self, cmd: callable):
         """Run cmd in the main thread. (For long GUI processes)"""
@@ -9,10 +9,12 @@ from gui.common.table_config_entry import TableConfigEntry, TABLE_EDIT_TYPE
 from gui.common.bool_config_entry import BoolConfigEntry
 
 class ColorLogsSection(QVBoxLayout):
-    def __init__(self, parent, call_update_cb=None):
+    def __init__(self, parent, call_update_cb=None, on_edited_cb=None):
         super().__init__()
         self.parent = parent
         self.call_update_cb = call_update_cb
+        # Called whenever content is updated (e.g. after editing, for live preview)
+        self.on_edited_cb = on_edited_cb
 
         # Add separator
         separator = QFrame()
@@ -60,6 +62,8 @@ class ColorLogsSection(QVBoxLayout):
         self.update_colors()
         self.enable_coloring.update_content()
         self.preset_selector.update_content()
+        if self.on_edited_cb:
+            self.on_edited_cb()
     
     def update_colors(self):
         self.color_pattern_editor.table.blockSignals(True)
@@ -19,6 +19,8 @@ class EditorPrompt(QDialog):
         self.layout.setAlignment(Qt.AlignTop)
 
         self.on_run_cmd = on_run_cmd
+        # Created after the editing sections, which already update (and request live preview) on creation
+        self.preview_logs_section = None
 
         # A horizontal box with horizontally aligned updatable label,
         # A "Browse" button, and a "Save" button, stuck to the top
@@ -26,14 +28,14 @@ class EditorPrompt(QDialog):
         self.open_files_section.setAlignment(Qt.AlignTop)
         self.layout.addLayout(self.open_files_section)
 
-        self.process_logs_section = ProcessLogsSection(self, self.update)
+        self.process_logs_section = ProcessLogsSection(self, self.update, self.schedule_live_preview)
         self.process_logs_section.setAlignment(Qt.AlignTop)
         self.layout.addLayout(self.process_logs_section)
 
         hbox = QHBoxLayout()
         hbox.addStretch(1)
 
-        self.color_logs_section = ColorLogsSection(self, self.update)
+        self.color_logs_section = ColorLogsSection(self, self.update, self.schedule_live_preview)
         self.color_logs_section.setAlignment(Qt.AlignTop)
         hbox.addLayout(self.color_logs_section)
 
@@ -42,7 +44,7 @@ class EditorPrompt(QDialog):
         separator.setFrameShadow(QFrame.Sunken)
         hbox.addWidget(separator)
 
-        self.filter_logs_section = FilterLogsSection(self, self.update)
+        self.filter_logs_section = FilterLogsSection(self, self.update, self.schedule_live_preview)
         self.filter_logs_section.setAlignment(Qt.AlignTop)
         hbox.addLayout(self.filter_logs_section)
 
@@ -73,6 +75,10 @@ class EditorPrompt(QDialog):
         if self.on_run_cmd:
             self.on_run_cmd()
 
+    def schedule_live_preview(self):
+        if self.preview_logs_section is not None:
+            self.preview_logs_section.schedule_live_preview()
+
     def update(self):
         self.open_files_section.update_content()
         self.process_logs_section.update_content()
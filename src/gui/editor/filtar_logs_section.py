@@ -13,10 +13,12 @@ from gui.common.string_config_entry import StringConfigEntry
 from gui.common.enum_config_entry import EnumConfigEntry
 
 class FilterLogsSection(QVBoxLayout):
-    def __init__(self, parent, call_update_cb=None):
+    def __init__(self, parent, call_update_cb=None, on_edited_cb=None):
         super().__init__()
         self.parent = parent
         self.call_update_cb = call_update_cb
+        # Called whenever content is updated (e.g. after editing, for live preview)
+        self.on_edited_cb = on_edited_cb
 
         # Add separator
         separator = QFrame()
@@ -74,4 +76,6 @@ class FilterLogsSection(QVBoxLayout):
         self.filter_pattern_editor.update_content()
         self.contextualize_lines_count.update_content()
         self.contextualize_lines_type.update_content()
-        self.preset_selector.update_content()
\ No newline at end of file
+        self.preset_selector.update_content()
+        if self.on_edited_cb:
+            self.on_edited_cb()
\ No newline at end of file
@@ -1,19 +1,29 @@
 from PyQt5.QtWidgets import QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QMessageBox, QTableWidget, QTableWidgetItem, QLineEdit, QFrame
 from PyQt5.QtGui import QIntValidator, QColor
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 from pandas import DataFrame
 
 from util.config_store import ConfigManager as CfgMan
 from processor.processor_manager import ProcessorManager
-from logs_managing.logs_manager import LogsManager
 
 from gui.common.rendered_logs_table import RenderedLogsTable
+from gui.common.bool_config_entry import BoolConfigEntry
+
+# Live preview runs once no edit was made for this long
+LIVE_PREVIEW_DELAY_MS = 300
 
 class PreviewLogsSection(QVBoxLayout):
     def __init__(self, parent:None):
         super().__init__()
         self.parent = parent
+        # Container with processed first lines of logs, shown in the preview table
+        self.preview_container = None
+        # Restarted on every edit, so only the last one of quick consecutive edits runs the preview
+        self.live_preview_timer = QTimer()
+        self.live_preview_timer.setSingleShot(True)
+        self.live_preview_timer.setInterval(LIVE_PREVIEW_DELAY_MS)
+        self.live_preview_timer.timeout.connect(self.preview_logs_cmd)
 
         # Add separator
         separator = QFrame()
@@ -30,6 +40,13 @@ class PreviewLogsSection(QVBoxLayout):
         hbox = QHBoxLayout()
         hbox.addWidget(self.label)
         hbox.addWidget(self.preview_button)
+        self.live_preview_entry = BoolConfigEntry(
+            self,
+            "Live preview:",
+            CfgMan().r.preferences.live_preview
+        )
+        hbox.addLayout(self.live_preview_entry.container)
+        hbox.addStretch(1)
         self.addLayout(hbox)
         
         self.preview_logs_table = RenderedLogsTable()
@@ -72,10 +89,26 @@ class PreviewLogsSection(QVBoxLayout):
     def setState(self, enabled=True):
         self.label.setEnabled(enabled)
 
+    def update_content(self):
+        self.live_preview_entry.update_content()
+        self.schedule_live_preview()
+
+    def schedule_live_preview(self):
+        # Preview runs are scheduled with the same key, so a still running preview of older patterns is cancelled
+        if CfgMan().get(CfgMan().r.preferences.live_preview, True):
+            self.live_preview_timer.start()
+        else:
+            self.live_preview_timer.stop()
+
     def update_preview_table(self):
-        data = LogsManager().get_data(CfgMan().get(CfgMan().r.preferences.preview_max_lines, 5), show_collapsed=True)
-        style = LogsManager().get_style(CfgMan().get(CfgMan().r.preferences.preview_max_lines, 5), show_collapsed=True)
+        if self.preview_container is None:
+            return
+        data = self.preview_container.get_data(CfgMan().get(CfgMan().r.preferences.preview_max_lines, 5), show_collapsed=True)
+        style = self.preview_container.get_style(CfgMan().get(CfgMan().r.preferences.preview_max_lines, 5), show_collapsed=True)
         self.preview_logs_table.refresh(data,style)
 
     def preview_logs_cmd(self):
-        self.parent.status_bar.call_in_background(ProcessorManager().run, self.update_preview_table)
\ No newline at end of file
+        # Process only the first lines into a separate container, logs shown in the main window stay as they are
+        def preview(run_token):
+            self.preview_container = ProcessorManager().preview(CfgMan().get(CfgMan().r.preferences.preview_max_lines, 5), run_token)
+        self.parent.status_bar.call_in_background(preview, self.update_preview_table, key="preview")
\ No newline at end of file
@@ -6,12 +6,15 @@ from util.config_store import ConfigManager as CfgMan
 from gui.common.preset_selector import PresetSelector
 
 from gui.common.string_config_entry import StringConfigEntry
+from gui.common.bool_config_entry import BoolConfigEntry
 
 class ProcessLogsSection(QVBoxLayout):
-    def __init__(self, parent, call_update_cb=None):
+    def __init__(self, parent, call_update_cb=None, on_edited_cb=None):
         super().__init__()
         self.parent = parent
         self.call_update_cb = call_update_cb
+        # Called whenever content is updated (e.g. after editing, for live preview)
+        self.on_edited_cb = on_edited_cb
 
         # Add separator
         separator = QFrame()
@@ -42,10 +45,28 @@ class ProcessLogsSection(QVBoxLayout):
         )
         self.addLayout(self.timestamp_format_entry.container)
 
+        self.timestamp_parse_format_entry = StringConfigEntry(
+            self,
+            "Timestamp Parse Format:",
+            CfgMan().r.process_logs.timestamp_parse_format
+        )
+        self.addLayout(self.timestamp_parse_format_entry.container)
+
+        self.infer_column_types_entry = BoolConfigEntry(
+            self,
+            "Infer Column Types:",
+            CfgMan().r.process_logs.infer_column_types
+        )
+        self.addLayout(self.infer_column_types_entry.container)
+
         self.setAlignment(Qt.AlignTop)
         self.update_content()
 
     def update_content(self):
         self.input_pattern_entry.update_content()
         self.timestamp_format_entry.update_content()
-        self.preset_selector.update_content()
\ No newline at end of file
+        self.timestamp_parse_format_entry.update_content()
+        self.infer_column_types_entry.update_content()
+        self.preset_selector.update_content()
+        if self.on_edited_cb:
+            self.on_edited_cb()
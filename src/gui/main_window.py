@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (
-    QMainWindow, QToolBar, QAction, QShortcut, QFileDialog, QMenu, QToolButton
+    QMainWindow, QToolBar, QAction, QShortcut, QFileDialog, QMenu, QToolButton, QInputDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QKeySequence
 
 from logs_managing.logs_manager import LogsManager
@@ -20,8 +20,12 @@ from gui.footer_notebook import FooterNotebook, FOOTER_PAGE
 from gui.meatadata_content import MetadataContent
 
 class DrLoggerMainWindow(QMainWindow):
+    # Emitted from the background thread for every chunk of rows processed in streaming mode
+    chunk_streamed = pyqtSignal(object, bool)
+
     def __init__(self):
         super().__init__()
+        self.chunk_streamed.connect(self.show_streamed_chunk)
 
         self.setWindowTitle("DrLogger - All-in-one Log Viewer")
         self.setGeometry(200, 200, 1500, 700)
@@ -52,6 +56,8 @@ class DrLoggerMainWindow(QMainWindow):
                 "Save All Logs... (Ctrl+S)": self.save_logs_cmd,
                 "Save Selected Logs...": self.save_selected_logs_cmd,
                 "Copy Selected Logs to Clipboard (Ctrl+C)": self.copy_selected_to_clipboard,
+                "Start/Stop Following Logs": self.toggle_follow_cmd,
+                "Go to Time... (Ctrl+T)": self.go_to_time_cmd,
             },
             "Editor": self.editor_prompt.show_updated,
             "Presets": self.presets_prompt.show_updated,
@@ -72,6 +78,7 @@ class DrLoggerMainWindow(QMainWindow):
 
         QShortcut(QKeySequence("Ctrl+C"), self, self.copy_selected_to_clipboard)
         QShortcut(QKeySequence("Ctrl+S"), self, self.save_logs_cmd)
+        QShortcut(QKeySequence("Ctrl+T"), self, self.go_to_time_cmd)
 
         QShortcut(QKeySequence(Qt.Key_Return), self, self.find_toolbar.find_next)
 
@@ -80,6 +87,13 @@ class DrLoggerMainWindow(QMainWindow):
         self.status_bar = StatusBar()
         self.setStatusBar(self.status_bar)
 
+        # Follow (tail) mode, periodically appends lines appended to opened files
+        self.follow_timer = QTimer(self)
+        self.follow_timer.timeout.connect(self.follow_tick)
+        self.follow_in_progress = False
+        self.follow_result = None
+        self.followed_update = None
+
     def set_table_font(self, size):
         font = QFont()
         font.setPointSize(size)
@@ -103,7 +117,71 @@ class DrLoggerMainWindow(QMainWindow):
         self.main_table.refresh(data,style)
 
     def update(self):
-        self.status_bar.call_in_background(ProcessorManager().run, self.update_table)
+        self.status_bar.call_in_background(
+            lambda run_token: ProcessorManager().run(run_token, on_chunk=self.chunk_streamed.emit),
+            self.update_table
+        )
+
+    def show_streamed_chunk(self, logs_container, first_chunk: bool):
+        # Show rows while the rest of the files is still being read
+        data = logs_container.get_data(show_collapsed=True)
+        style = logs_container.get_style(show_collapsed=True)
+        if first_chunk:
+            self.main_table.refresh(data, style)
+        else:
+            self.main_table.append(data, style)
+
+    def toggle_follow_cmd(self):
+        if self.follow_timer.isActive():
+            self.follow_timer.stop()
+            self.status_bar.set_status("Stopped following logs")
+        else:
+            self.follow_timer.start(max(CfgMan().get(CfgMan().r.open_logs.follow_interval_ms, 1000), 100))
+            self.status_bar.set_status("Following logs...")
+
+    def follow_tick(self):
+        # Skip the tick if appended lines from the previous one are still being processed
+        if self.follow_in_progress:
+            return
+        self.follow_in_progress = True
+        self.followed_update = None
+        def set_followed_update(logs_container, removed_rows):
+            self.followed_update = (logs_container, removed_rows)
+        def follow(run_token):
+            try:
+                self.follow_result = ProcessorManager().follow(run_token, on_appended=set_followed_update)
+            except Exception as e:
+                print(f"Error following logs: {e}")
+                self.follow_result = 0
+        self.status_bar.call_in_background(follow, self.update_followed_table, key="follow")
+
+    def update_followed_table(self):
+        self.follow_in_progress = False
+        if self.follow_result is None:
+            # Files were reopened, everything has changed
+            self.update_table()
+        elif self.followed_update is not None:
+            # Only the last shown rows change, the rest of the table is kept as is
+            logs_container, removed_rows = self.followed_update
+            self.main_table.remove_last_rows(removed_rows)
+            self.main_table.append(logs_container.get_data(show_collapsed=True), logs_container.get_style(show_collapsed=True))
+
+    def go_to_time_cmd(self):
+        # Rows are found by their parsed timestamps (Timestamp Parse Format in Editor)
+        text, ok = QInputDialog.getText(self, "Go to Time", "Go to the first row logged at or after (e.g. 2024-01-31 12:00:00):")
+        if not ok or not text.strip():
+            return
+        try:
+            positions = LogsManager().get_time_range_positions(begin=text.strip())
+        except ValueError as e:
+            self.status_bar.set_status(f"Invalid time '{text.strip()}': {e}")
+            return
+        if len(positions) == 0 or self.main_table.model() is None:
+            self.status_bar.set_status("No rows with a parsed timestamp at or after the given time")
+            return
+        index = self.main_table.model().index(int(positions[0]), 0)
+        self.main_table.setCurrentIndex(index)
+        self.main_table.scrollTo(index, self.main_table.PositionAtCenter)
 
     def set_QShortcut_action(self, button: str, action: callable):
         shortcut = QShortcut(QKeySequence(button), self)
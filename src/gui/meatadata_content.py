@@ -143,8 +143,8 @@ class MetadataContent():
         self.prepare_for_generating()
 
     def prepare_for_generating(self):
-        self.metadata = DataFrame(LogsManager().get_metadata(), columns=[self.__METADATA])
-        self.metadata.insert(0, self.__WIDGET, None)
+        # Metadata of a line is built only when it is generated
+        self.metadata = DataFrame({self.__WIDGET: None, self.__METADATA: None}, index=LogsManager().get_index(), dtype=object)
 
     def show_in_footer(self, index:int):
         self.generate_for_line(index, show_in_footer=True)
@@ -162,6 +162,8 @@ class MetadataContent():
             # Wrap MetadataWidget in a scrollable area
             scroll = QScrollArea()
             scroll.setWidgetResizable(True)
+            if self.metadata.at[index, self.__METADATA] is None:
+                self.metadata.at[index, self.__METADATA] = LogsManager().get_metadata([index]).iloc[0]
             content_widget = MetadataWidget(self.metadata.at[index, self.__METADATA])
             scroll.setWidget(content_widget)
             scroll.setFrameShape(QScrollArea.NoFrame)
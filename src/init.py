@@ -1,5 +1,6 @@
 # main.py
 import cProfile
+import multiprocessing
 import sys
 from PyQt5.QtWidgets import QApplication
 
@@ -15,19 +16,43 @@ from util.config_enums import (
 from gui.main_window import DrLoggerMainWindow
 import pstats
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-
-    # Initialization purposes
-    ProcessorManager()
-    
+def register_config_stores():
+    ''' Register config stores of the application, besides configs of processors (registered by ProcessorManager). '''
     CfgMan().register(
             ConfigStore("preferences",
             Config("autoSave", True, type_of=bool),
             Config("preview_max_lines", 5, type_of=int),
+            Config("live_preview", True, type_of=bool),
             Config("presets_location_path", "", type_of=str)
         )
     )
+    # Columns produced by opening and splitting logs are cached on disk,
+    # so reopening the same unchanged files skips reading and parsing them
+    CfgMan().register(ConfigStore("parsed_logs_cache",
+        Config("enabled", True, type_of=bool),
+        Config("max_size_mb", 1024, type_of=int),
+    ))
+    # Logs can be read and processed chunk by chunk, showing first rows before files are read completely
+    CfgMan().register(ConfigStore("streaming",
+        Config("enabled", False, type_of=bool),
+        Config("first_chunk_kb", 256, type_of=int),
+        Config("max_chunk_mb", 64, type_of=int),
+    ))
+    # Processors can run over blocks of rows in a process pool (workers: 1 = disabled, 0 = one per CPU core)
+    CfgMan().register(ConfigStore("sharded_processing",
+        Config("workers", 1, type_of=int),
+        Config("min_rows_per_shard", 50000, type_of=int),
+    ))
+
+if __name__ == "__main__":
+    # Worker processes (e.g. parallel log loading) must not start the GUI in a frozen executable
+    multiprocessing.freeze_support()
+    app = QApplication(sys.argv)
+
+    # Initialization purposes
+    ProcessorManager()
+    
+    register_config_stores()
 
     viewer = DrLoggerMainWindow()
     viewer.show()
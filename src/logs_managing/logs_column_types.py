@@ -1,20 +1,22 @@
-from pandas import Series, DataFrame
+from pandas import Series, DataFrame, concat
 from typing import Union, List
 from typing import final
 from enum import Enum
 
 from gui.common.metadata_elements import MetadataType
-from logs_managing.logs_container import LogsContainer
+from logs_managing.logs_container import LogsContainer, is_data_column_dtype, concat_data_values, concat_metadata_values
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNS
 from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
 
 class DataColumn(Series):
     ''' A column that contains visible data for LogsManager table generation.
         It can contain text, numbers, etc. or anything castable to string.
-        The dtype must be string.
+        The dtype must be string, Series of compact dtypes rendered as text (see is_data_column_dtype) keep theirs.
     '''
     def __init__(self, data, name: str = None):
-        if isinstance(data, Series):
+        if isinstance(data, Series) and is_data_column_dtype(data.dtype) and data.dtype != "string":
+            super().__init__(data[:], name=data.name if data.name is not None else name)
+        elif isinstance(data, Series):
             if data.name is not None:
                 super().__init__(data[:], name=data.name, dtype="string")
             else:
@@ -25,8 +27,8 @@ class DataColumn(Series):
             raise ValueError("DataColumn must be initialized with a pandas Series or list.")
         if self.name is None:
             raise ValueError("DataColumn Series must have a name or col_name specified.")
-        # Ensure dtype is string
-        if self.dtype != "string":
+        # Ensure dtype is string (or a compact one)
+        if not is_data_column_dtype(self.dtype):
             self[:] = self.astype("string")
 
     @final
@@ -48,7 +50,8 @@ class MetadataColumn(Series):
                  data:Series|list,
                  name:str=None,
                  category:str=None,
-                 datatype:MetadataType=None):
+                 datatype:MetadataType=None,
+                 datatype_args:dict=None):
         # Initialized from Series or list
         if isinstance(data, Series):
             if data.name is not None:
@@ -68,15 +71,25 @@ class MetadataColumn(Series):
         self.__category = category if category is not None else \
             RMetaNS.General.name
         self.__datatype = datatype
+        # Additional arguments shared by all datatype instances (e.g. the LineIndex of indexed log lines)
+        self.__datatype_args = datatype_args if datatype_args is not None else {}
+
+    @property
+    def category(self) -> str:
+        return self.__category
+
+    @property
+    def datatype(self) -> MetadataType|None:
+        return self.__datatype
+
+    @property
+    def datatype_args(self) -> dict:
+        return self.__datatype_args
 
     @final
     def process(self, logs_container:LogsContainer):
-        metadata = Series([{
-            self.__category: {
-                self.name: self.__datatype(row_val) if self.__datatype is not None else row_val
-            },
-        } for row_val in self.astype(str)], name=self.name)
-        logs_container.set_metadata(metadata)
+        # Raw values are kept as a single metadata column, wrapped in datatype only when read
+        logs_container.set_metadata_column(self.__category, self.name, self, self.__datatype, self.__datatype_args)
     
     @final
     def post_process(self, logs_container:LogsContainer):
@@ -107,6 +120,10 @@ class CaptureMessageColumn(Series):
             raise ValueError("CaptureMessageColumn Series must have a name specified.")
         self.__replace = replace
 
+    @property
+    def replace(self) -> str|None:
+        return self.__replace
+
     @final
     def process(self, logs_container:LogsContainer):
         return
@@ -128,4 +145,29 @@ ORDERED_COLUMN_TYPES = [DataColumn, MetadataColumn, CaptureMessageColumn]
 ''' Order in which LogsManager processes column types. '''
 
 UNIQUE_NAME_COLUMNS = [DataColumn]
-''' Unique name columns for LogsManager (Cannot have 2 of the same name). '''
\ No newline at end of file
+''' Unique name columns for LogsManager (Cannot have 2 of the same name). '''
+def copy_column(column:COLUMN_TYPE, values:Series) -> COLUMN_TYPE:
+    ''' Column of the same type, name and attributes as column, with other values. '''
+    values = values.rename(column.name)
+    if isinstance(column, MetadataColumn):
+        return MetadataColumn(values, name=column.name, category=column.category,
+                              datatype=column.datatype, datatype_args=column.datatype_args)
+    elif isinstance(column, CaptureMessageColumn):
+        return CaptureMessageColumn(values.astype(object).where(values.notna(), None), name=column.name, replace=column.replace)
+    return DataColumn(values, name=column.name)
+
+def slice_columns(columns:List[COLUMN_TYPE], begin:int, end:int) -> List[COLUMN_TYPE]:
+    ''' Rows of columns at positions from begin to end. '''
+    return [copy_column(column, Series(column.iloc[begin:end])) for column in columns]
+
+def concat_columns(columns:List[COLUMN_TYPE], other_columns:List[COLUMN_TYPE]) -> List[COLUMN_TYPE]:
+    ''' Rows of other columns after rows of columns (both lists must have the same layout). '''
+    if [(type(column), column.name) for column in columns] != [(type(column), column.name) for column in other_columns]:
+        raise ValueError("Columns to concatenate must have the same types and names.")
+    def concat_values(column:COLUMN_TYPE, other_column:COLUMN_TYPE) -> Series:
+        if isinstance(column, DataColumn):
+            return concat_data_values([Series(column), Series(other_column)])
+        elif isinstance(column, MetadataColumn):
+            return concat_metadata_values([Series(column), Series(other_column)])
+        return concat([Series(column), Series(other_column)])
+    return [copy_column(column, concat_values(column, other_column)) for column, other_column in zip(columns, other_columns)]
@@ -1,29 +1,153 @@
-from pandas import DataFrame, Series, concat
+import numpy
+from pandas import DataFrame, Series, CategoricalDtype, concat
+from pandas.api.types import is_integer_dtype, is_string_dtype, union_categoricals
 import pandas
 
-from util.dict_merge import merge_dicts, overlay_dict
+from util.dict_merge import overlay_dict
+from logs_managing.metadata_store import MetadataStore
+from logs_managing.logs_style import LogsStyle, DEFAULT_FOREGROUND_COLOR, DEFAULT_BACKGROUND_COLOR
+from util.growable_array import GrowableArray
 
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
 from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
 
 from gui.common.metadata_elements import MetadataColoredLabel, MetadataLogsSection
 
+CAPTURED_HEADER_FOREGROUND_COLOR = "#878787"
+CAPTURED_HEADER_BACKGROUND_COLOR = "#FFFFFF"
+# Data columns with at most this many distinct values per row are kept as categories
+CATEGORY_MAX_DISTINCT_RATIO = 0.1
+# Integers with an optional minus sign, without leading zeros, plus sign or separators,
+# which are rendered back exactly as they were written
+INTEGER_PATTERN = r'(?:0|-?[1-9]\d{0,17})'
+
+def is_data_column_dtype(dtype) -> bool:
+    ''' Data columns are strings, or kept in a compact dtype that is still rendered as text
+        (categories of strings for columns with few distinct values, integers for numeric columns).
+    '''
+    if isinstance(dtype, CategoricalDtype):
+        return is_string_dtype(dtype.categories.dtype)
+    return dtype == "string" or is_integer_dtype(dtype)
+
+def infer_column_dtype(column:Series) -> Series:
+    ''' Compact dtype of a data column of text (integers, or categories if it has few distinct values),
+        column itself if none fits. Values are rendered exactly as the original text either way.
+    '''
+    distinct = Series(column.unique(), dtype="string")
+    if len(distinct) == 0:
+        return column
+    if distinct.str.fullmatch(INTEGER_PATTERN).all():
+        return column.astype("int64")
+    if len(distinct) <= len(column) * CATEGORY_MAX_DISTINCT_RATIO:
+        return column.astype("category")
+    return column
+
+def concat_data_values(parts:list[Series]) -> Series:
+    ''' Values of pieces of a data column one after another (e.g. blocks of rows processed separately).
+        Pieces in different compact dtypes (categories of other values, integers next to text) are joined as text,
+        and the dtype is inferred once over all of them, the same as if the rows were processed together.
+    '''
+    if len(parts) == 1:
+        return parts[0]
+    if all(part.dtype == parts[0].dtype for part in parts[1:]):
+        return concat(parts)
+    return infer_column_dtype(concat([part.astype("string") for part in parts]))
+
+def concat_metadata_values(parts:list[Series]) -> Series:
+    ''' Values of pieces of a metadata column one after another, categorical pieces stay categorical (with all their categories). '''
+    if len(parts) > 1 and all(isinstance(part.dtype, CategoricalDtype) for part in parts):
+        values = union_categoricals([part.array for part in parts])
+        return Series(values, index=parts[0].index.append([part.index for part in parts[1:]]), name=parts[0].name)
+    return concat(parts)
+
+class CapturedSection:
+    ''' Rows of a captured group, kept as a range of row labels in a container instead of a copy.
+        Called by MetadataLogsSection to materialize (data, style) only when the section is shown.
+        The header row is shown as it was before capturing.
+    '''
+    def __init__(self, logs_container:"LogsContainer", first_row, last_row, header_row, header_message:str, header_style:tuple[int, int]):
+        self.logs_container = logs_container
+        self.first_row, self.last_row = first_row, last_row
+        self.header_row = header_row
+        self.header_message = header_message
+        self.header_style = header_style
+
+    def __call__(self) -> tuple[DataFrame, Series]:
+        data = self.logs_container.data.loc[self.first_row:self.last_row].copy()
+        data.at[self.header_row, RColNameNS.Message] = self.header_message
+        style = self.logs_container.get_style(data.index.to_list(), show_collapsed=False)
+        header_pos = style.index.get_loc(self.header_row)
+        style.foreground[header_pos], style.background[header_pos] = self.header_style
+        return data, style
+
 class LogsContainer():
-    ''' Container for both data and all its related properties and details. '''
+    ''' Container for both data and all its related properties and details.
+        Appended rows are kept as blocks of data (and in growable arrays for the rest), so appending them does not copy
+        existing rows. Blocks are concatenated only when the whole data is read.
+    '''
     def __init__(self):
         self.clear()
     
     def clear(self):
         self.data = DataFrame()
-        self.metadata = Series([], name="METADATA")
-        self.visible_rows = Series([], dtype=bool).tolist()
+        self.metadata = MetadataStore()
+        self.style = LogsStyle()
+        self.visible_rows = numpy.empty(0, dtype=bool)
+        self.captured_sections:list[CapturedSection] = []
         return self
 
+    @property
+    def data(self) -> DataFrame:
+        if len(self.__data_blocks) > 1:
+            data = concat(self.__data_blocks)
+            for name in data.columns:
+                if any(block[name].dtype != data[name].dtype for block in self.__data_blocks):
+                    data[name] = concat_data_values([block[name] for block in self.__data_blocks])
+            self.__data_blocks = [data]
+        return self.__data_blocks[0]
+
+    @data.setter
+    def data(self, data:DataFrame):
+        self.__data_blocks = [data]
+
+    def get_rows_count(self) -> int:
+        ''' Number of rows (without concatenating appended blocks). '''
+        return sum(len(block) for block in self.__data_blocks)
+
+    @property
+    def visible_rows(self) -> numpy.ndarray:
+        ''' Boolean mask of visible (not collapsed) rows, by position. '''
+        return self.__visible_rows.values
+
+    @visible_rows.setter
+    def visible_rows(self, visible_rows):
+        self.__visible_rows = GrowableArray(numpy.asarray(visible_rows, dtype=bool))
+        self.invalidate_visible_data()
+
+    def invalidate_visible_data(self):
+        ''' Drop cached visible positions and data, must be called whenever data or collapsing changes. '''
+        self.__visible_positions = None
+        self.__visible_data = None
+
+    def get_visible_positions(self) -> numpy.ndarray:
+        if self.__visible_positions is None:
+            self.__visible_positions = numpy.flatnonzero(self.visible_rows)
+        return self.__visible_positions
+
+    def __get_visible_data(self) -> DataFrame:
+        ''' Visible rows of data, cached until data or collapsing changes (data itself if all rows are visible). '''
+        if self.__visible_data is None:
+            if len(self.get_visible_positions()) == len(self.data):
+                self.__visible_data = self.data
+            else:
+                self.__visible_data = self.data.iloc[self.get_visible_positions()]
+        return self.__visible_data
+
     def set_data_column(self, column:Series, name:str):
         print(f"Setting data column '{name}'")
         ''' Set or update the main data DataFrame. '''
-        if not isinstance(column, Series) or column.dtype != "string":
-            raise ValueError("column must be a pandas Series of strings.")
+        if not isinstance(column, Series) or not is_data_column_dtype(column.dtype):
+            raise ValueError("column must be a pandas Series of strings (or of categories of strings, or integers).")
         elif self.data.empty:
             self.data = DataFrame(column, columns=[name]).copy()
         elif len(column) != len(self.data):
@@ -34,24 +158,38 @@ class LogsContainer():
             
         # Initialize other elements
         if self.metadata.empty:
-            self.metadata = Series([{}]*len(self.data), name="METADATA")
-        if self.visible_rows == []:
-            self.visible_rows = Series([True]*len(self.data), dtype=bool).tolist()
+            self.metadata = MetadataStore(self.data.index)
+        if self.style.empty:
+            palette = self.style.palette
+            self.style = LogsStyle(palette,
+                                   numpy.full(len(self.data), palette.get_code(DEFAULT_FOREGROUND_COLOR), dtype=palette.CODE_TYPE),
+                                   numpy.full(len(self.data), palette.get_code(DEFAULT_BACKGROUND_COLOR), dtype=palette.CODE_TYPE),
+                                   self.data.index)
+        if len(self.visible_rows) == 0:
+            self.visible_rows = numpy.ones(len(self.data), dtype=bool)
+        self.invalidate_visible_data()
         return self
 
     def get_data(self, row:int|list[int]=None, show_collapsed:bool=True) -> DataFrame:
+        ''' Get (visible) rows of data. Returned frames are shared with the container (not copied),
+            they must not be modified.
+        '''
+        data = self.__get_visible_data() if show_collapsed else self.data
         if row is None:
-            return self.data[self.visible_rows].copy() if show_collapsed else \
-                self.data.copy()
+            return data
         elif isinstance(row, int):
-            return self.data[self.visible_rows].copy().head(row) if show_collapsed else \
-                self.data.copy().head(row)
+            return data.head(row)
         elif isinstance(row, list):
-            return self.data[self.visible_rows].loc[row].copy() if show_collapsed else \
-                self.data.loc[row].copy()
+            return data.loc[row]
         else:
             raise ValueError("Invalid row index type.")
         
+    def get_index(self, show_collapsed:bool=True) -> pandas.Index:
+        ''' Index labels of (visible) rows. '''
+        # Metadata is indexed like data, without having to concatenate appended blocks
+        index = self.metadata.index if len(self.metadata.index) == self.get_rows_count() else self.data.index
+        return index[self.get_visible_positions()] if show_collapsed else index
+
     def get_data_columns(self) -> list[str]:
         return self.data.columns.tolist()
 
@@ -59,36 +197,74 @@ class LogsContainer():
 
 
 
+    def set_metadata_column(self, category:str, name:str, values:Series, datatype=None, datatype_args:dict=None):
+        ''' Set or update metadata of a single key for all rows (stored as one column, not merged row by row). '''
+        if self.data.empty:
+            raise ValueError("Data must be set before setting metadata.")
+        elif len(values) != len(self.data):
+            raise ValueError("New metadata must have the same number of rows as existing data.")
+        # Values are kept typed (e.g. timestamps to select rows by time, categorical colors as codes)
+        values_array = values.array if isinstance(values.dtype, CategoricalDtype) else values.to_numpy()
+        self.metadata.set_column(category, name, values_array, datatype, datatype_args)
+        # Colors are also kept as palette codes, for the logs table
+        if category == RMetaNS.General.name and name == RMetaNS.General.ForegroundColor:
+            self.style.foreground = self.style.palette.get_codes(values)
+        elif category == RMetaNS.General.name and name == RMetaNS.General.BackgroundColor:
+            self.style.background = self.style.palette.get_codes(values)
+        return self
+
     def set_metadata(self, metadata:Series):
-        ''' Set or update the metadata Series. '''
+        ''' Set or update the metadata from a Series of (nested) dictionaries, merged into every row. '''
         if self.data.empty:
             raise ValueError("Data must be set before setting metadata.")
         elif len(metadata) != len(self.data):
             raise ValueError("New metadata must have the same number of rows as existing data.")
         elif metadata.dtype != dict:
             raise ValueError("Metadata must be a pandas Series of dictionaries.")
-        elif self.data.empty:
-            raise ValueError("Data must be set before setting metadata.")
-        elif len(metadata) != len(self.data):
-            raise ValueError("New metadata must have the same number of rows as existing data.")
-        elif self.metadata.empty:
-            self.metadata = metadata.copy()
-        else:
-            self.metadata = self.metadata.copy().combine(metadata.copy(), merge_dicts)
-        if self.visible_rows == []:
-            self.visible_rows = Series([True]*len(self.data), dtype=bool).tolist()
+        for position, row_metadata in enumerate(metadata):
+            if row_metadata:
+                self.metadata.merge_row(position, row_metadata)
+                self.__set_row_colors(position, row_metadata)
+        if len(self.visible_rows) == 0:
+            self.visible_rows = numpy.ones(len(self.data), dtype=bool)
         return self
 
     def get_metadata(self, row:int|list[int]=None, show_collapsed:bool=True) -> Series:
+        ''' Get metadata of rows as a Series of nested dictionaries (built only for the requested rows). '''
+        return self.metadata.get_rows(self.__get_positions(row, show_collapsed))
+
+    def get_time_range_positions(self, begin=None, end=None, show_collapsed:bool=True) -> numpy.ndarray:
+        ''' Positions (among visible rows, or all rows) of rows whose parsed timestamp is in [begin, end).
+            Bounds are anything pandas.Timestamp accepts, None for an open bound.
+            Timestamps are compared as integer nanoseconds, rows without a parsed timestamp are never in range.
+        '''
+        positions = self.__get_positions(None, show_collapsed)
+        column = self.metadata.columns.get((RMetaNS.General.name, RMetaNS.General.ParsedTimestamp))
+        if column is None or column.values.dtype.kind != "M":
+            return numpy.empty(0, dtype=int)
+        times = column.values.view(numpy.int64)[positions]
+        in_range = ~numpy.isnat(column.values[positions])
+        if begin is not None:
+            in_range &= times >= pandas.Timestamp(begin).value
+        if end is not None:
+            in_range &= times < pandas.Timestamp(end).value
+        return numpy.flatnonzero(in_range)
+
+    def __get_positions(self, row:int|list[int]=None, show_collapsed:bool=True) -> numpy.ndarray:
+        ''' Positions of requested rows: all (visible) rows, first N of them, or rows by index labels. '''
+        if show_collapsed:
+            positions = self.get_visible_positions()
+        else:
+            positions = numpy.arange(len(self.metadata))
         if row is None:
-            return self.metadata[self.visible_rows].copy() if show_collapsed else \
-                self.metadata.copy()
+            return positions
         elif isinstance(row, int):
-            return self.metadata[self.visible_rows].copy().head(row) if show_collapsed else \
-                self.metadata.copy().head(row)
+            return positions[:row]
         elif isinstance(row, list):
-            return self.metadata[self.visible_rows].loc[row].copy() if show_collapsed else \
-                self.metadata.loc[row].copy()
+            requested = self.metadata.index.get_indexer(row)
+            if (requested == -1).any() or not numpy.isin(requested, positions).all():
+                raise KeyError(f"Rows not found: {row}")
+            return requested
         else:
             raise ValueError("Invalid row index type.")
 
@@ -104,134 +280,164 @@ class LogsContainer():
             raise ValueError("New style must have the same number of rows as existing data.")
         elif style.dtype != dict:
             raise ValueError("Style must be a pandas Series of dictionaries.")
-        elif self.metadata.empty:
-            self.metadata = style.copy()
-        else:
-            style_column = Series({
-                    RMetaNS.General.name: {
-                    RMetaNS.General.ForegroundColor: "#000000",
-                    RMetaNS.General.BackgroundColor: "#FFFFFF",
-                    RMetaNS.General.FontStyle: "normal",
-                }
-            }*len(self.data), name="Style")
-            overlayed_style_column = style_column.combine(style, overlay_dict)
-            if overlayed_style_column != self.metadata:
-                print("Warning: Nothing has changed, make sure it is intended or that the keys are formatted as expected.")
-                return self
-            self.metadata = self.metadata.combine(overlayed_style_column, merge_dicts)
-        return self
-
-    def get_style(self, row:int|list[int]=None, show_collapsed:bool=True) -> Series:
-        style_column = Series([{
+        default_style = {
             RMetaNS.General.name: {
                 RMetaNS.General.ForegroundColor: "#000000",
-                RMetaNS.General.BackgroundColor: "#FFFFFF"
+                RMetaNS.General.BackgroundColor: "#FFFFFF",
+                RMetaNS.General.FontStyle: "normal",
             }
-            }]*len(self.metadata), index=self.metadata.index, name="Style")
-        style_column = style_column.copy().combine(self.metadata.copy(), overlay_dict)
-        if row is None:
-            return style_column[self.visible_rows] if show_collapsed else style_column
-        elif isinstance(row, int):
-            return style_column[self.visible_rows].head(row) if show_collapsed else \
-                style_column.head(row)
-        elif isinstance(row, list):
-            return style_column[self.visible_rows].loc[row] if show_collapsed else \
-                style_column.loc[row]
-        else:
-            raise ValueError("Invalid row index type.")
+        }
+        for position, row_style in enumerate(style):
+            row_style = overlay_dict(default_style, row_style)
+            self.metadata.merge_row(position, row_style)
+            self.__set_row_colors(position, row_style)
+        return self
+
+    def __set_row_colors(self, position:int, row_metadata:dict):
+        ''' Update palette codes of a row from its (nested) metadata, if it has colors. '''
+        general = row_metadata.get(RMetaNS.General.name)
+        if not isinstance(general, dict):
+            return
+        for name, codes in ((RMetaNS.General.ForegroundColor, self.style.foreground),
+                            (RMetaNS.General.BackgroundColor, self.style.background)):
+            if name in general:
+                color = general[name]
+                color = color.get_value() if hasattr(color, "get_value") else color
+                codes[position] = self.style.palette.get_code(str(color))
+
+    def get_style(self, row:int|list[int]=None, show_collapsed:bool=True) -> LogsStyle:
+        ''' Get style (foreground and background palette codes) of rows.
+            Style of all rows is returned as is (shared with the container), it must not be modified.
+        '''
+        positions = self.__get_positions(row, show_collapsed)
+        if row is None and len(positions) == len(self.style):
+            return self.style
+        return self.style.take(positions)
 
 
 
 
 
     def __capture(self,
-                  captured_header_idx:int,
-                  captured_header_repl:str,
-                  captured_data:DataFrame,
+                  captured_header_pos:int,
+                  first_pos:int,
+                  last_pos:int,
+                  header_style:tuple[int, int],
                   ):
-        # print(f"Captured:\n{captured_data}\nWith metadata:\n{captured_metadata}")
-        first_row, last_row = captured_data.index[0], captured_data.index[-1]
-        # print(f"Before capture, data is:\n{self.data}\nWith metadata:\n{self.metadata}")
-        # If we do not have some of the rows in data, we must have captured them already
-        #TODO: This check is too strict, we can capture rows that are not in data if they were captured before
-        valid_indices = [idx for idx in captured_data.index if idx in self.data.index]
-        if not valid_indices:
-            # If nothing left to capture, just return
-            return
-        captured_data = captured_data.loc[valid_indices]
-        first_row, last_row = captured_data.index[0], captured_data.index[-1]
-        # Format captured header
-        captured_header_repl = captured_header_repl.replace("{count}", str(len(captured_data)))
-        # Merge generated metadata with existing metadata
-        # TODO: Figure out a different way to merge metadata, this is too strict
-        self.metadata.at[captured_header_idx] = merge_dicts(self.metadata.at[captured_header_idx],
+        ''' Add metadata of a captured group of rows [first_pos, last_pos] to its header row. '''
+        first_row, last_row = self.data.index[first_pos], self.data.index[last_pos]
+        count = last_pos - first_pos + 1
+        captured_section = CapturedSection(self, first_row, last_row, self.data.index[captured_header_pos],
+                                           self.data.iat[captured_header_pos, self.data.columns.get_loc(RColNameNS.Message)],
+                                           header_style)
+        self.captured_sections.append(captured_section)
+        self.metadata.merge_row(captured_header_pos,
         {
             RMetaNS.General.name: {
-                RMetaNS.General.ForegroundColor: MetadataColoredLabel("#878787"),
-                RMetaNS.General.BackgroundColor: MetadataColoredLabel("#FFFFFF"),
+                RMetaNS.General.ForegroundColor: MetadataColoredLabel(CAPTURED_HEADER_FOREGROUND_COLOR),
+                RMetaNS.General.BackgroundColor: MetadataColoredLabel(CAPTURED_HEADER_BACKGROUND_COLOR),
             },
             RMetaNS.CaptureRows.name: {
-                RMetaNS.CaptureRows.CaptureRows: MetadataLogsSection(captured_data, self.metadata[captured_data.index.to_list()]),
+                RMetaNS.CaptureRows.CaptureRows: MetadataLogsSection(captured_section),
                 RMetaNS.CaptureRows.FromToIndexes: f"Lines {first_row} to {last_row}",
-                RMetaNS.CaptureRows.CollapsedInTotal: len(captured_data)
+                RMetaNS.CaptureRows.CollapsedInTotal: count
             }
         })
-        # Set header row
-        self.data.at[captured_header_idx, RColNameNS.Message] = captured_header_repl
-        # Hide captured rows
-        for idx in captured_data.index:
-            self.visible_rows[idx] = False
-        # Unhide header row
-        self.visible_rows[captured_header_idx] = True
-        # print(f"After capture, data is:\n{self.data}\nWith metadata:\n{self.metadata} and visible_rows:\n{self.visible_rows}\n")
+
+    def append(self, other:"LogsContainer"):
+        ''' Append rows of another container (e.g. processed lines appended to log files) after existing rows.
+            Rows of the other container must be indexed after the rows of this one.
+        '''
+        if other.get_rows_count() == 0:
+            return self
+        if self.get_rows_count() == 0:
+            self.data = other.data.copy()
+            self.metadata = MetadataStore().append(other.metadata)
+            self.style = LogsStyle(other.style.palette).extend(other.style)
+            self.visible_rows = other.visible_rows.copy()
+        else:
+            if other.get_index(show_collapsed=False)[0] <= self.get_index(show_collapsed=False)[-1]:
+                raise ValueError("Appended rows must be indexed after existing rows.")
+            if not other.data.columns.equals(self.__data_blocks[-1].columns):
+                raise ValueError("Appended rows must have the same data columns as existing rows.")
+            self.__data_blocks.append(other.data)
+            self.metadata.append(other.metadata)
+            self.style.extend(other.style)
+            self.__visible_rows.extend(other.visible_rows)
+            self.invalidate_visible_data()
+        # Captured sections now refer to rows in this container
+        for captured_section in other.captured_sections:
+            captured_section.logs_container = self
+        self.captured_sections.extend(other.captured_sections)
+        return self
+
+    def truncate(self, rows:int) -> int:
+        ''' Keep only the first rows (e.g. to replace the last rows by reprocessed ones).
+            Captured sections of removed rows are dropped, they must not span kept rows.
+            Returns the number of removed visible rows.
+        '''
+        rows = max(min(rows, self.get_rows_count()), 0)
+        if rows == self.get_rows_count():
+            return 0
+        boundary = self.get_index(show_collapsed=False)[rows]
+        if any(section.first_row < boundary <= section.last_row for section in self.captured_sections):
+            raise ValueError("Rows must not be truncated inside a captured section.")
+        self.captured_sections = [section for section in self.captured_sections if section.last_row < boundary]
+        removed_visible = int(numpy.count_nonzero(self.visible_rows[rows:]))
+        kept_rows = 0
+        for position, block in enumerate(self.__data_blocks):
+            if kept_rows + len(block) >= rows:
+                self.__data_blocks = self.__data_blocks[:position] + [block.iloc[:rows - kept_rows]]
+                break
+            kept_rows += len(block)
+        self.metadata.truncate(rows)
+        self.style.truncate(rows)
+        self.__visible_rows.truncate(rows)
+        self.invalidate_visible_data()
+        return removed_visible
 
     def set_collapsable(self, collapsable:Series, replace:str=None):
-        ''' Set or update the collapsable Series.'''
-        class CapturedData:
-            def __init__(self):
-                self.reset()
-
-            def reset(self):
-                self.header_idx = None
-                self.header_fmt = None
-                self.begin_idx = None
-                self.end_idx = None
-
-        captured_data = CapturedData()
+        ''' Set or update the collapsable Series.
+            Rows whose new message differs from the current one are captured in groups (consecutive runs of them).
+            A group is shown as its header: the last row with a new message (that message becomes the header),
+            or the first row of the group formatted by replace if there is none ({count} is the group size).
+            Groups are found with array operations, only the headers are processed one by one.
+        '''
         if len(self.data[RColNameNS.Message]) != len(collapsable):
             raise ValueError("collapsable Series must have the same length as the data Message column.")
-        for row_idx in self.data.index:
-            orig_message = self.data.at[row_idx, RColNameNS.Message]
-            new_message = collapsable.at[row_idx]
-            # No changes, see if we captured anything
-            if orig_message == new_message:
-                # We did capture something, save it
-                if captured_data.begin_idx is not None and captured_data.end_idx is not None:
-                    self.__capture(
-                        captured_data.begin_idx if captured_data.header_idx is None else captured_data.header_idx,
-                        replace if captured_data.header_fmt is None else captured_data.header_fmt,
-                        self.data.loc[captured_data.begin_idx:captured_data.end_idx].copy(),
-                    )
-                    # Reset captured data and metadata
-                    captured_data.reset()
-            
-            # Modified message indicates start of capture group
-            elif new_message != None:
-                # Save new message as a header for Message column
-                captured_data.header_idx, captured_data.header_fmt = row_idx, new_message
-                # Capture data and metadata
-                captured_data.begin_idx, captured_data.end_idx = row_idx if captured_data.begin_idx is None else captured_data.begin_idx, row_idx
-            
-            # None is the continuation of a capture
-            # If replace is defined, it can also be the start of a capture group
-            elif new_message is None:
-                # Capture data and metadata
-                captured_data.begin_idx, captured_data.end_idx = row_idx if captured_data.begin_idx is None else captured_data.begin_idx, row_idx
-        # Capture very end if any is left
-        if captured_data.begin_idx is not None and captured_data.end_idx is not None:
-            self.__capture(
-                captured_data.begin_idx if captured_data.header_idx is None else captured_data.header_idx,
-                replace if captured_data.header_fmt is None else captured_data.header_fmt,
-                self.data.loc[captured_data.begin_idx:captured_data.end_idx].copy(),
-            )
+        original = self.data[RColNameNS.Message].to_numpy(dtype=object)
+        new = collapsable.loc[self.data.index].to_numpy(dtype=object)
+        changed = numpy.asarray(original != new, dtype=bool)
+        if not changed.any():
+            return self
+        is_header = changed & numpy.not_equal(new, None)
+        # Runs of changed rows
+        padded = numpy.concatenate(([False], changed, [False]))
+        starts = numpy.flatnonzero(padded[1:-1] & ~padded[:-2])
+        ends = numpy.flatnonzero(padded[1:-1] & ~padded[2:])
+        # Header of each run is its last row with a new message, if it has one
+        header_candidates = numpy.flatnonzero(is_header)
+        last_candidate = numpy.searchsorted(header_candidates, ends, side="right") - 1
+        has_header = last_candidate >= 0
+        has_header[has_header] = header_candidates[last_candidate[has_header]] >= starts[has_header]
+        headers = starts.copy()
+        headers[has_header] = header_candidates[last_candidate[has_header]]
+        counts = ends - starts + 1
+        header_messages = [
+            (new[header] if header_found else replace).replace("{count}", str(count))
+            for header, header_found, count in zip(headers, has_header, counts)
+        ]
+        # Headers keep their style from before capturing in captured sections
+        for header, start, end in zip(headers, starts, ends):
+            header_style = (self.style.foreground[header], self.style.background[header])
+            self.__capture(int(header), int(start), int(end), header_style)
+        self.style.foreground[headers] = self.style.palette.get_code(CAPTURED_HEADER_FOREGROUND_COLOR)
+        self.style.background[headers] = self.style.palette.get_code(CAPTURED_HEADER_BACKGROUND_COLOR)
+        # Set header rows
+        self.data.iloc[headers, self.data.columns.get_loc(RColNameNS.Message)] = header_messages
+        # Hide captured rows, but their headers
+        visible_rows = self.visible_rows.copy()
+        visible_rows[changed] = False
+        visible_rows[headers] = True
+        self.visible_rows = visible_rows
         return self
@@ -16,18 +16,39 @@ class LogsManager():
         self.columns = []
         self.logs_container.clear()
 
-    def add_new_columns(self, new_columns:List[COLUMN_TYPE], apply_post_process:bool=False):
-        ''' Update the current columns with new columns from a processing stage.'''
-        for col in new_columns:
-            self.columns.append(col)
-            print(f"Added column '{col.name}' of type {col.__class__.__name__}")
-        self.__apply_process(new_columns)
+    def add_new_columns(self, new_columns:List[COLUMN_TYPE], apply_post_process:bool=False,
+                        logs_container:LogsContainer=None):
+        ''' Update the current columns with new columns from a processing stage.
+            If logs_container is given, columns are applied to it instead (and not kept as current columns).
+        '''
+        if logs_container is None:
+            for col in new_columns:
+                self.columns.append(col)
+                print(f"Added column '{col.name}' of type {col.__class__.__name__}")
+        self.__apply_process(new_columns, logs_container=logs_container)
         if apply_post_process:
-            self.__apply_post_process(new_columns)
+            self.__apply_post_process(new_columns, logs_container=logs_container)
     
-    def finalize(self):
+    def finalize(self, columns:List[COLUMN_TYPE]=None, logs_container:LogsContainer=None):
         ''' Finalize the logs data after all processing is done.'''
-        self.__apply_post_process(self.columns)
+        self.__apply_post_process(self.columns if columns is None else columns, logs_container=logs_container)
+
+    def append_logs(self, logs_container:LogsContainer) -> int:
+        ''' Append already processed and finalized rows (e.g. lines appended to followed files).
+            Returns the number of appended rows.
+        '''
+        self.logs_container.append(logs_container)
+        return logs_container.get_rows_count()
+
+    def truncate_logs(self, rows:int) -> int:
+        ''' Keep only the first rows (e.g. before appending reprocessed last rows).
+            Returns the number of removed visible rows.
+        '''
+        return self.logs_container.truncate(rows)
+
+    def get_rows_count(self) -> int:
+        ''' Number of all rows, including collapsed ones. '''
+        return self.logs_container.get_rows_count()
 
     def __apply_process(self,
                         columns: list[COLUMN_TYPE],
@@ -66,10 +87,16 @@ class LogsManager():
                  rows: int | list[int] = None, show_collapsed:bool=True):
         return self.logs_container.get_data(rows, show_collapsed=show_collapsed)
 
+    def get_index(self, show_collapsed:bool=True):
+        return self.logs_container.get_index(show_collapsed=show_collapsed)
+
     def get_metadata(self,
                      rows: int | list[int] = None, show_collapsed:bool=True):
         return self.logs_container.get_metadata(rows, show_collapsed=show_collapsed)
 
+    def get_time_range_positions(self, begin=None, end=None, show_collapsed:bool=True):
+        return self.logs_container.get_time_range_positions(begin, end, show_collapsed=show_collapsed)
+
     def get_style(self,
                    rows: int | list[int] = None, show_collapsed:bool=True):
         return self.logs_container.get_style(rows, show_collapsed=show_collapsed)
@@ -0,0 +1,107 @@
+import numpy
+import pandas
+from pandas import Index, RangeIndex
+
+from util.growable_array import GrowableArray
+
+DEFAULT_FOREGROUND_COLOR = "#000000"
+DEFAULT_BACKGROUND_COLOR = "#FFFFFF"
+
+class ColorPalette:
+    ''' Table of distinct colors, rows refer to their colors by index (uint16) instead of holding them. '''
+    CODE_TYPE = numpy.uint16
+
+    def __init__(self):
+        self.colors:list[str] = []
+        self.__codes:dict[str, int] = {}
+        self.get_code(DEFAULT_FOREGROUND_COLOR)
+        self.get_code(DEFAULT_BACKGROUND_COLOR)
+
+    def get_code(self, color:str) -> int:
+        if color not in self.__codes:
+            if len(self.colors) > numpy.iinfo(self.CODE_TYPE).max:
+                raise ValueError(f"Too many colors in palette: {len(self.colors)}")
+            self.__codes[color] = len(self.colors)
+            self.colors.append(color)
+        return self.__codes[color]
+
+    def get_codes(self, colors) -> numpy.ndarray:
+        ''' Codes of many colors, every distinct color is looked up only once. '''
+        if isinstance(getattr(colors, "dtype", None), pandas.CategoricalDtype):
+            # Colors already refer to their categories by codes, only categories are looked up
+            category_codes = numpy.array([self.get_code(str(color)) for color in colors.cat.categories] + [self.get_code("")], dtype=self.CODE_TYPE)
+            return category_codes[colors.cat.codes.to_numpy()]
+        codes, uniques = pandas.factorize(numpy.asarray(colors, dtype=object))
+        # Missing colors (code -1) map to the last entry, an empty color
+        unique_codes = numpy.array([self.get_code(str(color)) for color in uniques] + [self.get_code("")], dtype=self.CODE_TYPE)
+        return unique_codes[codes]
+
+    def get_color(self, code:int) -> str:
+        return self.colors[code]
+
+class LogsStyle:
+    ''' Foreground and background colors of rows, as palette codes (one uint16 per row and color).
+        Used by the logs table to look up colors of a row by its position.
+        Codes are kept in growable arrays, so rows can be appended (extend) without copying the existing ones.
+    '''
+    def __init__(self, palette:ColorPalette=None, foreground:numpy.ndarray=None, background:numpy.ndarray=None, index:Index=None):
+        self.palette = palette if palette is not None else ColorPalette()
+        self.foreground = foreground if foreground is not None else numpy.empty(0, dtype=ColorPalette.CODE_TYPE)
+        self.background = background if background is not None else numpy.empty(0, dtype=ColorPalette.CODE_TYPE)
+        self.index = index if index is not None else RangeIndex(len(self.foreground))
+        if not (len(self.foreground) == len(self.background) == len(self.index)):
+            raise ValueError("Foreground, background and index must have the same length.")
+
+    @property
+    def foreground(self) -> numpy.ndarray:
+        return self.__foreground.values
+
+    @foreground.setter
+    def foreground(self, foreground:numpy.ndarray):
+        self.__foreground = GrowableArray(numpy.asarray(foreground, dtype=ColorPalette.CODE_TYPE))
+
+    @property
+    def background(self) -> numpy.ndarray:
+        return self.__background.values
+
+    @background.setter
+    def background(self, background:numpy.ndarray):
+        self.__background = GrowableArray(numpy.asarray(background, dtype=ColorPalette.CODE_TYPE))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.index) == 0
+
+    def get_foreground(self, position:int) -> str:
+        return self.palette.get_color(self.foreground[position])
+
+    def get_background(self, position:int) -> str:
+        return self.palette.get_color(self.background[position])
+
+    def take(self, positions:numpy.ndarray|slice) -> "LogsStyle":
+        ''' Style of rows at positions (or a slice of positions). '''
+        return LogsStyle(self.palette, self.foreground[positions], self.background[positions], self.index[positions])
+
+    def extend(self, other:"LogsStyle") -> "LogsStyle":
+        ''' Append rows of other after rows of this one (in place, only rows of other are copied). '''
+        if other.palette is not self.palette:
+            other = other.with_palette(self.palette)
+        self.__foreground.extend(other.foreground)
+        self.__background.extend(other.background)
+        self.index = self.index.append(other.index)
+        return self
+
+    def truncate(self, rows:int) -> "LogsStyle":
+        ''' Keep only the first rows (in place). '''
+        self.__foreground.truncate(rows)
+        self.__background.truncate(rows)
+        self.index = self.index[:rows]
+        return self
+
+    def with_palette(self, palette:ColorPalette) -> "LogsStyle":
+        ''' Same style, with codes of another palette. '''
+        codes = palette.get_codes(self.palette.colors) if self.palette.colors else numpy.empty(0, dtype=ColorPalette.CODE_TYPE)
+        return LogsStyle(palette, codes[self.foreground], codes[self.background], self.index)
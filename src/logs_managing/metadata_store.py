@@ -0,0 +1,181 @@
+import numpy
+from pandas import Categorical, Index, RangeIndex, Series, Timestamp
+
+from util.dict_merge import merge_dicts
+from util.growable_array import GrowableArray
+
+class MetadataStoreColumn:
+    ''' Raw values of a single metadata key (one per row), wrapped in their datatype only when read.
+        Values keep their dtype (numbers, timestamps), categorical values are kept as codes of their categories.
+        Only other values (e.g. strings) are kept as Python objects.
+    '''
+    def __init__(self, values:numpy.ndarray|Categorical, datatype=None, datatype_args:dict=None, present:numpy.ndarray=None):
+        self.categories:Index|None = values.categories if isinstance(values, Categorical) else None
+        self.__values = GrowableArray(values.codes if isinstance(values, Categorical) else values)
+        self.datatype = datatype
+        self.datatype_args = datatype_args if datatype_args is not None else {}
+        # Rows that have this key (None if all of them do)
+        self.__present = GrowableArray(present) if present is not None else None
+
+    @property
+    def values(self) -> numpy.ndarray:
+        ''' Raw values (codes of categories for categorical values). '''
+        return self.__values.values
+
+    @property
+    def present(self) -> numpy.ndarray|None:
+        return self.__present.values if self.__present is not None else None
+
+    def get_missing(self, rows:int) -> numpy.ndarray|Categorical:
+        ''' Values of rows that do not have this key, in the dtype of this column. '''
+        if self.categories is not None:
+            return Categorical.from_codes(numpy.full(rows, -1), categories=self.categories)
+        if self.values.dtype == object:
+            return numpy.full(rows, None, dtype=object)
+        return numpy.zeros(rows, dtype=self.values.dtype)
+
+    def extend(self, values:numpy.ndarray|Categorical, present:numpy.ndarray=None):
+        ''' Append values of rows (present marks rows that have this key, None if all of them do).
+            Categories of categorical values are merged, values of another dtype are converted to a common one
+            (a wider number type, or Python objects).
+        '''
+        if self.__present is None and present is not None and not present.all():
+            self.__present = GrowableArray(numpy.ones(len(self.__values), dtype=bool))
+        if self.__present is not None:
+            self.__present.extend(present if present is not None else numpy.ones(len(values), dtype=bool))
+        if self.categories is not None and isinstance(values, Categorical):
+            values = self.__get_merged_codes(values)
+        elif self.categories is not None or isinstance(values, Categorical):
+            self.__set_dtype(object)
+            values = numpy.asarray(values, dtype=object)
+        elif values.dtype != self.values.dtype:
+            kinds = {values.dtype.kind, self.values.dtype.kind}
+            self.__set_dtype(numpy.result_type(values.dtype, self.values.dtype) if kinds <= set("biuf") else object)
+        self.__values.extend(values)
+
+    def __get_merged_codes(self, values:Categorical) -> numpy.ndarray:
+        ''' Codes of categorical values among categories of this column (new categories are added after existing ones). '''
+        categories = self.categories.append(values.categories.difference(self.categories, sort=False))
+        if len(categories) > len(self.categories):
+            self.categories = categories
+            self.__set_dtype(numpy.result_type(self.values.dtype, numpy.min_scalar_type(-len(categories))))
+        codes = categories.get_indexer(values.categories)[values.codes]
+        return numpy.where(values.codes >= 0, codes, -1)
+
+    def __set_dtype(self, dtype):
+        if self.categories is not None and dtype == object:
+            # Categorical values are replaced by their categories (rows without a category get None)
+            values = numpy.append(numpy.asarray(self.categories, dtype=object), None)[self.values]
+            self.categories = None
+        else:
+            # Timestamps become pandas Timestamps (not integers) as Python objects
+            values = Series(self.values).to_numpy(dtype=object) if dtype == object else self.values.astype(dtype)
+        self.__values = GrowableArray(values)
+
+    def truncate(self, rows:int):
+        self.__values.truncate(rows)
+        if self.__present is not None:
+            self.__present.truncate(rows)
+
+    def is_present(self, position:int) -> bool:
+        return self.present is None or bool(self.present[position])
+
+    def get(self, position:int):
+        value = self.values[position]
+        if self.categories is not None:
+            value = self.categories[value]
+        # Typed timestamps are shown the same as pandas shows them
+        value = str(Timestamp(value)) if self.values.dtype.kind == "M" else str(value)
+        return self.datatype(value, **self.datatype_args) if self.datatype is not None else value
+
+class MetadataStore:
+    ''' Columnar storage of row metadata: one array of raw values per (category, name)
+        instead of a nested dict per row. Nested dicts ({category: {name: value}}) are built
+        only on demand, for requested rows.
+        Values set only for a few rows (e.g. headers of captured rows) are kept sparse, by row position.
+    '''
+    def __init__(self, index:Index=None):
+        self.index = index if index is not None else RangeIndex(0)
+        self.columns:dict[tuple[str, str], MetadataStoreColumn] = {}
+        self.sparse:dict[int, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.index) == 0
+
+    def set_column(self, category:str, name:str, values, datatype=None, datatype_args:dict=None):
+        ''' Set (or replace) metadata of all rows for a key, as a single array assignment.
+            Numbers, timestamps (datetime64) and categorical values keep their type, anything else is kept as Python objects.
+            Rows without a timestamp (NaT) or a category do not have the key.
+        '''
+        present = None
+        if isinstance(values, Categorical):
+            present = None if (values.codes >= 0).all() else values.codes >= 0
+        else:
+            values = numpy.asarray(values)
+            if values.dtype.kind == "M":
+                values = values.astype("datetime64[ns]")
+                present = None if not numpy.isnat(values).any() else ~numpy.isnat(values)
+            elif values.dtype.kind not in "biuf":
+                values = values.astype(object)
+        if len(values) != len(self.index):
+            raise ValueError("New metadata must have the same number of rows as existing data.")
+        self.columns[(category, name)] = MetadataStoreColumn(values, datatype, datatype_args, present=present)
+        # Newer values replace sparse values of the same key
+        for row_metadata in self.sparse.values():
+            if isinstance(row_metadata.get(category), dict):
+                row_metadata[category].pop(name, None)
+        return self
+
+    def merge_row(self, position:int, metadata:dict):
+        ''' Merge nested metadata into a single row. '''
+        self.sparse[position] = merge_dicts(self.sparse.get(position, {}), metadata)
+        return self
+
+    def get_row(self, position:int) -> dict:
+        row_metadata = {}
+        for (category, name), column in self.columns.items():
+            if column.is_present(position):
+                row_metadata.setdefault(category, {})[name] = column.get(position)
+        if position in self.sparse:
+            row_metadata = merge_dicts(row_metadata, self.sparse[position])
+        return row_metadata
+
+    def get_rows(self, positions:numpy.ndarray) -> Series:
+        ''' Nested metadata dicts of rows at positions, as a Series indexed by row labels. '''
+        positions = numpy.asarray(positions, dtype=int)
+        return Series([self.get_row(position) for position in positions],
+                      index=self.index[positions], name="METADATA", dtype=object)
+
+    def append(self, other:"MetadataStore"):
+        ''' Append rows of another store after the rows of this one (only rows of other are copied).
+            Keys missing in either store are not present in its rows.
+        '''
+        offset, rows = len(self.index), len(other.index)
+        self.index = self.index.append(other.index)
+        for key, other_column in other.columns.items():
+            if key not in self.columns:
+                self.columns[key] = MetadataStoreColumn(other_column.get_missing(offset),
+                                                        other_column.datatype, other_column.datatype_args,
+                                                        present=numpy.zeros(offset, dtype=bool))
+            other_values = other_column.values if other_column.categories is None else \
+                Categorical.from_codes(other_column.values, categories=other_column.categories)
+            self.columns[key].extend(other_values, other_column.present)
+        for key, column in self.columns.items():
+            if key not in other.columns:
+                column.extend(column.get_missing(rows), numpy.zeros(rows, dtype=bool))
+        for position, row_metadata in other.sparse.items():
+            self.sparse[offset + position] = row_metadata
+        return self
+
+    def truncate(self, rows:int):
+        ''' Keep only the first rows. '''
+        for position in range(rows, len(self.index)):
+            self.sparse.pop(position, None)
+        self.index = self.index[:rows]
+        for column in self.columns.values():
+            column.truncate(rows)
+        return self
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+
+import numpy
+from pandas import Series
+from pandas.api.types import is_datetime64_dtype, is_integer_dtype
+
+import gui.common.metadata_elements as metadata_elements
+from logs_managing.logs_column_types import COLUMN_TYPE, DataColumn, MetadataColumn
+from util.file_storage_manager import FileStorageManager
+from util.line_index import LineIndex
+from util.log_file_reader import get_files_fingerprint
+
+CACHE_FILE_EXTENSION = ".npz"
+
+class ParsedLogsCache:
+    ''' On-disk cache of parsed log columns, keyed by the fingerprint of log files and processing config.
+        Columns are stored in a binary columnar format: every column is one UTF-8 buffer of
+        newline-joined values (log lines never contain newlines), so loading is a decode and a split.
+        Datetime metadata columns (parsed timestamps) are stored as integer nanoseconds.
+        The cache is bounded by size, least recently used entries are evicted first.
+    '''
+    def __init__(self, max_size_bytes: int, dir: str = "parsed_logs"):
+        self.max_size_bytes = max_size_bytes
+        self.dir = FileStorageManager(dir, None).get_cache_dir()
+
+    def get_key(self, file_paths: list[str], configs: dict) -> str|None:
+        ''' Key of the files (path, size, mtime) and configs that produced the columns.
+            Returns None if any of the files cannot be accessed.
+        '''
+        files = get_files_fingerprint(file_paths)
+        if files is None:
+            return None
+        fingerprint = json.dumps({"files": files, "configs": configs}, sort_keys=True, default=str)
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def get_file_path(self, key: str) -> str:
+        return os.path.join(self.dir, key + CACHE_FILE_EXTENSION)
+
+    def load(self, key: str|None) -> list[COLUMN_TYPE]|None:
+        ''' Load cached columns, or None if there are none for the key. '''
+        if key is None or not os.path.exists(self.get_file_path(key)):
+            return None
+        try:
+            with numpy.load(self.get_file_path(key), allow_pickle=False) as cached:
+                header = json.loads(cached["header"].tobytes().decode("utf-8"))
+                columns = []
+                for i, column_header in enumerate(header):
+                    if column_header.get("line_index"):
+                        columns.append(self.__deserialize_line_index_column(column_header, cached, i))
+                        continue
+                    if column_header.get("datetime"):
+                        columns.append(self.__deserialize_datetime_column(column_header, cached, i))
+                        continue
+                    rows = column_header["rows"]
+                    values = cached[f"column_{i}"].tobytes().decode("utf-8").split("\n") if rows > 0 else []
+                    columns.append(self.__deserialize_column(column_header, values))
+        except Exception as e:
+            print(f"Error loading parsed logs cache {key}: {e}")
+            return None
+        # Mark as recently used
+        os.utime(self.get_file_path(key))
+        print(f"Loaded {len(columns)} columns from parsed logs cache.")
+        return columns
+
+    def store(self, key: str|None, columns: list[COLUMN_TYPE]) -> bool:
+        ''' Store columns under the key. Only data and metadata columns of text values are supported.
+            Returns whether the columns were stored.
+        '''
+        if key is None:
+            return False
+        # Keep only the last column of each name and type, the same as applying all of them
+        last_columns = {}
+        for column in columns:
+            last_columns.pop((type(column), column.name), None)
+            last_columns[(type(column), column.name)] = column
+        header = []
+        arrays = {}
+        for i, column in enumerate(last_columns.values()):
+            if isinstance(column, MetadataColumn) and isinstance(column.datatype_args.get("line_index"), LineIndex):
+                column_header = self.__serialize_column_header(column, line_index=True)
+                if column_header is None:
+                    return False
+                header.append(column_header)
+                arrays.update(self.__serialize_line_index_column(column, i))
+                continue
+            if isinstance(column, MetadataColumn) and is_datetime64_dtype(column.dtype):
+                column_header = self.__serialize_column_header(column, datetime=True)
+                if column_header is None:
+                    return False
+                header.append(column_header)
+                arrays[f"column_{i}"] = column.to_numpy(dtype="datetime64[ns]").view(numpy.int64)
+                continue
+            column_header = self.__serialize_column_header(column)
+            if column_header is None or column.isna().any():
+                return False
+            joined = "\n".join(column.astype(str))
+            if len(column) > 0 and joined.count("\n") != len(column) - 1:
+                return False  # Values with newlines cannot be split back
+            header.append(column_header)
+            arrays[f"column_{i}"] = numpy.frombuffer(joined.encode("utf-8"), dtype=numpy.uint8)
+        arrays["header"] = numpy.frombuffer(json.dumps(header).encode("utf-8"), dtype=numpy.uint8)
+        # Write to a temporary file first, so a partially written entry is never loaded
+        tmp_file_path = self.get_file_path(key) + ".tmp"
+        try:
+            with open(tmp_file_path, "wb") as f:
+                numpy.savez(f, **arrays)
+            os.replace(tmp_file_path, self.get_file_path(key))
+        finally:
+            # Temporary files are not cache entries, they would never be evicted
+            if os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)
+        self.evict()
+        return True
+
+    def evict(self):
+        ''' Remove least recently used entries until the cache fits its maximum size. '''
+        entries = []
+        for filename in os.listdir(self.dir):
+            if filename.endswith(CACHE_FILE_EXTENSION):
+                stat = os.stat(os.path.join(self.dir, filename))
+                entries.append((stat.st_mtime, stat.st_size, filename))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, filename in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            print(f"Evicting parsed logs cache entry: {filename}")
+            os.remove(os.path.join(self.dir, filename))
+            total_size -= size
+
+    def clear(self):
+        for filename in os.listdir(self.dir):
+            if filename.endswith(CACHE_FILE_EXTENSION):
+                os.remove(os.path.join(self.dir, filename))
+
+    def __serialize_column_header(self, column: COLUMN_TYPE, line_index: bool = False, datetime: bool = False) -> dict|None:
+        if isinstance(column, DataColumn):
+            # Compact dtypes of data columns (categories, integers) are restored when loaded
+            return {"type": DataColumn.__name__, "name": column.name, "rows": len(column),
+                    "index_start": int(column.index[0]) if len(column) > 0 else 0,
+                    "dtype": "int64" if is_integer_dtype(column.dtype) else str(column.dtype)}
+        if not line_index and not datetime and not all(isinstance(value, str) for value in column.head(1)):
+            return None
+        if isinstance(column, MetadataColumn):
+            datatype = column.datatype
+            if column.datatype_args and not line_index:
+                return None  # Arguments of datatypes cannot be stored
+            if datatype is not None and getattr(metadata_elements, getattr(datatype, "__name__", ""), None) is not datatype:
+                return None  # Only metadata types that can be looked up by name
+            return {"type": MetadataColumn.__name__, "name": column.name, "rows": len(column),
+                    "index_start": int(column.index[0]) if len(column) > 0 else 0,
+                    "category": column.category,
+                    "datatype": datatype.__name__ if datatype is not None else None,
+                    "line_index": line_index,
+                    "datetime": datetime}
+        return None
+
+    def __serialize_line_index_column(self, column: MetadataColumn, i: int) -> dict:
+        ''' Lines of a line index column are kept in log files, store only their locations. '''
+        line_index = column.datatype_args["line_index"]
+        return {
+            f"column_{i}": column.to_numpy(dtype=numpy.int64),
+            f"column_{i}_file_paths": numpy.frombuffer(json.dumps(line_index.file_paths).encode("utf-8"), dtype=numpy.uint8),
+            f"column_{i}_file_ids": line_index.file_ids,
+            f"column_{i}_offsets": line_index.offsets,
+            f"column_{i}_lengths": line_index.lengths,
+        }
+
+    def __deserialize_line_index_column(self, column_header: dict, cached, i: int) -> MetadataColumn:
+        line_index = LineIndex()
+        line_index.file_paths = json.loads(cached[f"column_{i}_file_paths"].tobytes().decode("utf-8"))
+        line_index.file_ids = cached[f"column_{i}_file_ids"]
+        line_index.offsets = cached[f"column_{i}_offsets"]
+        line_index.lengths = cached[f"column_{i}_lengths"]
+        index = range(column_header["index_start"], column_header["index_start"] + column_header["rows"])
+        return MetadataColumn(Series(cached[f"column_{i}"], index=index, name=column_header["name"]),
+                              category=column_header["category"],
+                              datatype=getattr(metadata_elements, column_header["datatype"]),
+                              datatype_args={"line_index": line_index})
+
+    def __deserialize_datetime_column(self, column_header: dict, cached, i: int) -> MetadataColumn:
+        index = range(column_header["index_start"], column_header["index_start"] + column_header["rows"])
+        datatype = getattr(metadata_elements, column_header["datatype"]) if column_header["datatype"] else None
+        return MetadataColumn(Series(cached[f"column_{i}"].view("datetime64[ns]"), index=index, name=column_header["name"]),
+                              category=column_header["category"], datatype=datatype)
+
+    def __deserialize_column(self, column_header: dict, values: list[str]) -> COLUMN_TYPE:
+        index = range(column_header["index_start"], column_header["index_start"] + column_header["rows"])
+        data = Series(values, index=index, name=column_header["name"], dtype="string" if values else object)
+        if column_header["type"] == DataColumn.__name__:
+            return DataColumn(data.astype(column_header.get("dtype", "string")) if values else data)
+        elif column_header["type"] == MetadataColumn.__name__:
+            datatype = getattr(metadata_elements, column_header["datatype"]) if column_header["datatype"] else None
+            return MetadataColumn(data.astype(object), category=column_header["category"], datatype=datatype)
+        raise ValueError(f"Unsupported cached column type: {column_header['type']}")
@@ -10,7 +10,8 @@ RESERVED_METADATA_NAMES = get_namespaces({
     "General": {
         "OriginalLogs": "Original Logs",
         "ForegroundColor": "Foreground Color",
-        "BackgroundColor": "Background Color"
+        "BackgroundColor": "Background Color",
+        "ParsedTimestamp": "Parsed Timestamp"
     },
     "Capture Rows": {
         "CaptureRows": "Captured Logs",
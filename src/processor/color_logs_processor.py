@@ -1,14 +1,45 @@
-from pandas import DataFrame
+import numpy
+from pandas import DataFrame, Series, Categorical
 
 from processor.processor_intf import IProcessor
+from processor.column_matching import column_contains
 from util.config_store import ConfigManager as CfgMan, ConfigStore, Config
 from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
-from logs_managing.logs_column_types import MetadataColumn
+from logs_managing.logs_column_types import DataColumn, MetadataColumn, CaptureMessageColumn
 from util.presets_manager import PresetsManager
+from logs_managing.logs_style import DEFAULT_FOREGROUND_COLOR, DEFAULT_BACKGROUND_COLOR
 from gui.common.metadata_elements import MetadataColoredLabel
 
 
+class ColorRule:
+    ''' A color scheme entry resolved against columns of data: rows matching the pattern in any of the columns get its colors. '''
+    def __init__(self, columns: list[str], pattern: str, foreground: str, background: str):
+        self.columns = columns
+        self.pattern = pattern
+        self.foreground = foreground
+        self.background = background
+
+def compile_color_scheme(color_scheme: list, columns: list[str]) -> list[ColorRule]:
+    ''' Rules of valid color scheme entries, in order (later rules override colors of earlier ones).
+        Entries with an empty column apply to all columns, entries of missing columns or without colors are left out.
+    '''
+    rules = []
+    for entry in color_scheme:
+        if not isinstance(entry, list):
+            continue  # skip invalid color scheme entries
+        elif len(entry) != 4:
+            continue  # skip invalid color scheme entries
+        column, pattern, foreground, background = entry
+        if not foreground and not background:
+            continue
+        if column == "":
+            rules.append(ColorRule(list(columns), pattern, foreground, background))
+        # If rule applies to a specific column
+        elif column in columns:
+            rules.append(ColorRule([column], pattern, foreground, background))
+    return rules
+
 class ColorLogsProcessor(IProcessor):
     def register_config_store(self) -> ConfigStore|Config|None:
         return ConfigStore("color_logs",
@@ -16,6 +47,16 @@ class ColorLogsProcessor(IProcessor):
                 Config("color_scheme", [], type_of=list, element_type=str),
                 presetsmanager=PresetsManager("color")
             )
+    def get_input_column_types(self) -> list[type]:
+        # Visible data depends on data columns and on rows hidden by capture columns
+        return [DataColumn, CaptureMessageColumn]
+
+    def get_output_column_types(self) -> list[type]:
+        return [MetadataColumn]
+
+    def get_shard_args(self) -> dict:
+        return {"color_scheme_arg": CfgMan().get(CfgMan().r.color_logs.color_scheme, [])}
+
     # We expect input to be dataframe type with at least a 'Line' column
     def process(self, data,
                 color_scheme_arg:list|None=None) -> list[MetadataColumn]|None:
@@ -23,35 +64,41 @@ class ColorLogsProcessor(IProcessor):
             return None
         if RColNameNS.Message not in data.columns:
             return None
-        
+
         if color_scheme_arg is not None:
             color_scheme = color_scheme_arg
         else:
             color_scheme = CfgMan().get(CfgMan().r.color_logs.color_scheme, [])
 
-        # Initialize columns with default colors
-        data[RMetaNS.General.ForegroundColor] = "#000000"
-        data[RMetaNS.General.BackgroundColor] = "#FFFFFF"
-        for entry in color_scheme:
-            if not isinstance(entry, list):
-                continue  # skip invalid color scheme entries
-            elif len(entry) != 4:
-                continue  # skip invalid color scheme entries
-            column, pattern, foreground, background = entry
-            data["mask"] = False
-            if column == "":
-                for col in data.columns:
-                    data["mask"] |= data[col].astype(str).str.contains(pattern, regex=True, na=False)
-            # If rule applies to a specific column
-            elif column in data.columns:
-                data["mask"] |= data[column].astype(str).str.contains(pattern, regex=True, na=False)
-            else:
-                continue
-            if foreground:
-                data.loc[data["mask"], RMetaNS.General.ForegroundColor] = foreground
-            if background:
-                data.loc[data["mask"], RMetaNS.General.BackgroundColor] = background
+        rules = compile_color_scheme(color_scheme, list(data.columns))
+        # Every (column, pattern) pair is matched once, even if more rules use it
+        column_matches:dict[tuple[str, str], numpy.ndarray] = {}
+        rule_matches = []
+        for rule in rules:
+            matched = numpy.zeros(len(data), dtype=bool)
+            for column in rule.columns:
+                if (column, rule.pattern) not in column_matches:
+                    column_matches[(column, rule.pattern)] = column_contains(data[column], rule.pattern).to_numpy(dtype=bool)
+                matched |= column_matches[(column, rule.pattern)]
+            rule_matches.append(matched)
+
+        # Rows refer to colors by their code (position in colors), the last matching rule wins
+        colors = {DEFAULT_FOREGROUND_COLOR: 0, DEFAULT_BACKGROUND_COLOR: 1}
+        def get_color_codes(color_name: str, default_color: str) -> numpy.ndarray:
+            conditions, choices = [], []
+            for rule, matched in zip(rules, rule_matches):
+                color = getattr(rule, color_name)
+                if color:
+                    conditions.append(matched)
+                    choices.append(colors.setdefault(color, len(colors)))
+            if not conditions:
+                return numpy.full(len(data), colors[default_color])
+            return numpy.select(conditions[::-1], choices[::-1], default=colors[default_color])
+        foreground = get_color_codes("foreground", DEFAULT_FOREGROUND_COLOR)
+        background = get_color_codes("background", DEFAULT_BACKGROUND_COLOR)
         return [
-            MetadataColumn(data[RMetaNS.General.ForegroundColor], category=RMetaNS.General.name, datatype=MetadataColoredLabel),
-            MetadataColumn(data[RMetaNS.General.BackgroundColor], category=RMetaNS.General.name, datatype=MetadataColoredLabel)
+            MetadataColumn(Series(Categorical.from_codes(foreground, categories=list(colors)), index=data.index),
+                           name=RMetaNS.General.ForegroundColor, category=RMetaNS.General.name, datatype=MetadataColoredLabel),
+            MetadataColumn(Series(Categorical.from_codes(background, categories=list(colors)), index=data.index),
+                           name=RMetaNS.General.BackgroundColor, category=RMetaNS.General.name, datatype=MetadataColoredLabel)
         ]
\ No newline at end of file
@@ -0,0 +1,93 @@
+import re
+
+import numpy
+from pandas import Series, CategoricalDtype
+
+# Patterns referring to groups by number or name (backreferences, conditionals) cannot be combined,
+# their groups would refer to groups of other patterns
+GROUP_REFERENCE_REGEX = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+# Patterns without any of these are plain text, matched without the regex engine
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+def is_literal(pattern: str) -> bool:
+    return not any(char in REGEX_METACHARACTERS for char in pattern)
+
+def get_literals_regex(literals: list[str]) -> str:
+    ''' Regex matching any of the literals, built as a trie so common prefixes are matched only once
+        (e.g. ["req-10", "req-12", "req-2"] -> "req\\-(?:1[02]|2)"), instead of trying every literal at every position.
+    '''
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    def get_node_regex(node: dict) -> str:
+        branches, chars = [], []
+        for char, child in node.items():
+            if char == "":
+                continue
+            child_regex = get_node_regex(child)
+            if child_regex:
+                branches.append(re.escape(char) + child_regex)
+            else:
+                chars.append(re.escape(char))
+        if len(chars) == 1:
+            branches.append(chars[0])
+        elif chars:
+            branches.append(f"[{''.join(chars)}]")
+        if not branches:
+            return ""
+        node_regex = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A literal ends here, what follows is optional
+        if "" in node:
+            return f"(?:{node_regex})?"
+        return node_regex
+    return get_node_regex(trie)
+
+def column_contains(column: Series, pattern: str, case: bool = True) -> Series:
+    ''' Whether the text of every row of column contains a match of the pattern (regex).
+        Literal patterns are searched as substrings, without the regex engine.
+        Columns of categories are matched once per distinct value, instead of once per row.
+    '''
+    if isinstance(column.dtype, CategoricalDtype):
+        # Missing values have code -1, which picks the appended text of a missing value
+        categories = Series(list(column.cat.categories.astype(str)) + [str(numpy.nan)], dtype=object)
+        matched = column_contains(categories, pattern, case).to_numpy(dtype=bool)
+        return Series(matched[column.cat.codes.to_numpy()], index=column.index)
+    # Text of every row as rendered, literal patterns are matched by a single substring search over all of them
+    return column.astype(str).str.contains(pattern, case=case, regex=not is_literal(pattern), na=False)
+
+def combine_patterns(patterns: list[str]) -> str|None:
+    ''' Single regex (alternation) matching wherever any of the patterns matches,
+        or None if they cannot be combined (invalid together, or referring to their groups).
+        Literal patterns are combined into a trie (see get_literals_regex).
+    '''
+    if len(patterns) == 1:
+        return patterns[0]
+    literals = [pattern for pattern in patterns if is_literal(pattern)]
+    regexes = [pattern for pattern in patterns if not is_literal(pattern)]
+    if any(GROUP_REFERENCE_REGEX.search(pattern) for pattern in regexes):
+        return None
+    branches = [get_literals_regex(literals)] if literals else []
+    branches += regexes
+    if len(branches) == 1:
+        return branches[0]
+    combined = "|".join(f"(?:{branch})" for branch in branches)
+    try:
+        re.compile(combined)
+    except re.error:
+        return None
+    return combined
+
+def column_contains_any(column: Series, patterns: list[str], case: bool = True) -> Series:
+    ''' Whether the text of every row of column contains a match of any of the patterns (regexes).
+        Patterns are combined to scan the column once, if they cannot be, they are matched one by one.
+    '''
+    combined = combine_patterns(patterns)
+    if combined is not None:
+        return column_contains(column, combined, case)
+    matched = Series(False, index=column.index)
+    for pattern in patterns:
+        matched |= column_contains(column, pattern, case)
+    return matched
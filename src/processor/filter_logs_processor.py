@@ -1,8 +1,10 @@
+import numpy
 from pandas import DataFrame, Series
 from enum import Enum
 from typing import List
 
 from processor.processor_intf import IProcessor
+from processor.column_matching import column_contains_any
 from logs_managing.logs_column_types import COLUMN_TYPE, DataColumn, MetadataColumn, CaptureMessageColumn
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
 from util.config_store import ConfigManager as CfgMan, ConfigStore, Config
@@ -11,6 +13,17 @@ from util.presets_manager import PresetsManager
 
 FILTERED_LINE = "Filtered Line"
 
+def get_context_mask(matched: numpy.ndarray, lines_before: int, lines_after: int) -> numpy.ndarray:
+    ''' Rows within lines_before/lines_after rows of any matched row (including matched rows).
+        Computed with a difference array: +1 where the window of a matched row starts and -1 right after it ends,
+        so a row is in some window where the cumulative sum is positive.
+    '''
+    positions = numpy.flatnonzero(matched)
+    starts = numpy.maximum(positions - lines_before, 0)
+    ends = numpy.minimum(positions + lines_after, len(matched) - 1) + 1
+    windows = numpy.bincount(starts, minlength=len(matched) + 1) - numpy.bincount(ends, minlength=len(matched) + 1)
+    return numpy.cumsum(windows[:-1]) > 0
+
 class FilterLogsProcessor(IProcessor):
     def register_config_store(self) -> ConfigStore|Config|None:
         return ConfigStore("filter_logs",
@@ -21,6 +34,27 @@ class FilterLogsProcessor(IProcessor):
                 presetsmanager=PresetsManager("filter")
             )
     
+    def get_input_column_types(self) -> list[type]:
+        # Visible data depends on data columns and on rows hidden by capture columns
+        return [DataColumn, CaptureMessageColumn]
+
+    def get_output_column_types(self) -> list[type]:
+        return [CaptureMessageColumn]
+
+    def get_shard_args(self) -> dict:
+        return {
+            "filter_pattern_arg": CfgMan().get(CfgMan().r.filter_logs.filter_pattern, []),
+            "contextualize_lines_count_arg": CfgMan().get(CfgMan().r.filter_logs.contextualize_lines_count, 0),
+            "contextualize_lines_type_arg": CONTEXTUALIZE_LINES_ENUM(
+                CfgMan().get(CfgMan().r.filter_logs.contextualize_lines, CONTEXTUALIZE_LINES_ENUM.NONE.value)),
+        }
+
+    def get_shard_overlap(self, shard_args: dict) -> int:
+        # Rows shown as context of matches in neighbouring blocks
+        if shard_args["contextualize_lines_type_arg"] == CONTEXTUALIZE_LINES_ENUM.NONE:
+            return 0
+        return max(shard_args["contextualize_lines_count_arg"], 0)
+
     # We expect input to be dataframe type with at least a 'Line' column
     def process(self, data,
                 filter_pattern_arg:list|None=None,
@@ -40,10 +74,14 @@ class FilterLogsProcessor(IProcessor):
             return None
         if len(filter_pattern_data) == 0:
             return None
+        # Input is shared with LogsManager (not a copy), add working columns only to a shallow copy
+        data = data.copy(deep=False)
 
         data[FILTERED_LINE] = False
         # In case the list cannot be parsed correctly, make sure we don't fail completely
         try:
+            # Patterns of the same column are matched together, in a single scan of the column
+            column_patterns:dict[str, list[str]] = {}
             for pattern_column, pattern in filter_pattern_data:
                 if pattern_column == "" and pattern == "":
                     continue
@@ -51,7 +89,9 @@ class FilterLogsProcessor(IProcessor):
                     pattern_column = RColNameNS.Message
                 if pattern_column not in data.columns:
                     continue
-                data[FILTERED_LINE] |= data[pattern_column].astype(str).str.contains(pattern.strip(), regex=True, na=False)
+                column_patterns.setdefault(pattern_column, []).append(pattern.strip())
+            for pattern_column, patterns in column_patterns.items():
+                data[FILTERED_LINE] |= column_contains_any(data[pattern_column], patterns)
         except Exception as e:
             print("Error applying filter patterns:", e)
             return None
@@ -70,25 +110,15 @@ class FilterLogsProcessor(IProcessor):
         
         # Contextualize lines
         if contextualize_lines_count > 0 and contextualize_lines_type != CONTEXTUALIZE_LINES_ENUM.NONE:
-            show_indices = data.index[data[FILTERED_LINE]]
-            mask = data[FILTERED_LINE].copy()
-            for idx in show_indices:
-                if contextualize_lines_type == CONTEXTUALIZE_LINES_ENUM.LINES_BEFORE:
-                    start = max(idx - contextualize_lines_count, data.index[0])
-                    end = idx
-                elif contextualize_lines_type == CONTEXTUALIZE_LINES_ENUM.LINES_AFTER:
-                    start = idx
-                    end = min(idx + contextualize_lines_count, data.index[-1])
-                elif contextualize_lines_type == CONTEXTUALIZE_LINES_ENUM.LINES_BEFORE_AND_AFTER:
-                    start = max(idx - contextualize_lines_count, data.index[0])
-                    end = min(idx + contextualize_lines_count, data.index[-1])
-                mask.iloc[start:end+1] = True
-            data[FILTERED_LINE] = mask
+            # Work with positions, rows are not necessarily indexed from 0
+            lines_before = contextualize_lines_count if contextualize_lines_type in (CONTEXTUALIZE_LINES_ENUM.LINES_BEFORE,
+                                                                                     CONTEXTUALIZE_LINES_ENUM.LINES_BEFORE_AND_AFTER) else 0
+            lines_after = contextualize_lines_count if contextualize_lines_type in (CONTEXTUALIZE_LINES_ENUM.LINES_AFTER,
+                                                                                   CONTEXTUALIZE_LINES_ENUM.LINES_BEFORE_AND_AFTER) else 0
+            data[FILTERED_LINE] = get_context_mask(data[FILTERED_LINE].to_numpy(dtype=bool), lines_before, lines_after)
 
         # Every False in FILTERED_LINE means we want to filter it out, so set those to NONE
-        data[RColNameNS.Message] = data.apply(
-            lambda row: None if row[FILTERED_LINE]==False else row[RColNameNS.Message], axis=1
-        )
+        data[RColNameNS.Message] = data[RColNameNS.Message].astype(object).where(data[FILTERED_LINE].to_numpy(dtype=bool), None)
         # Return collapsing rows column if we are keeping hidden logs, otherwise just filter them out
         result = []
         result.append(CaptureMessageColumn(data[RColNameNS.Message], name="Filter", replace="<Filtered {count} row(s)>"))
@@ -1,29 +1,169 @@
 import os
-from typing import Callable
+from typing import Callable, Iterator
 
-from pandas import DataFrame
+import numpy
+from pandas import DataFrame, Series, RangeIndex
 from enum import Enum
 
-from gui.common.metadata_elements import MetadataLogLine
+from gui.common.metadata_elements import MetadataLogLine, MetadataIndexedLogLine
 from processor.processor_intf import IProcessor
-from logs_managing.logs_column_types import COLUMN_TYPE, DataColumn, MetadataColumn
+from logs_managing.logs_column_types import COLUMN_TYPE, DataColumn, MetadataColumn, slice_columns
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
 from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
 from util.config_store import ConfigManager as CfgMan, ConfigStore, Config
 from util.config_enums import KEEP_SOURCE_FILE_LOCATION_ENUM
+from util.log_file_reader import read_log_lines, read_log_lines_by_line, read_log_files
+from util.log_file_reader import LogFileState, find_last_line_end, read_indexed_log_lines
+from util.line_index import LineIndex
 
 class OpenLogsProcessor(IProcessor):
+    def __init__(self):
+        super().__init__()
+        # State of every opened file, so that follow mode reads only appended lines
+        self.log_files_states:dict[str, LogFileState] = {}
+        self.visible_file_values:dict[str, str] = {}
+        self.keep_source_file_location = KEEP_SOURCE_FILE_LOCATION_ENUM.NONE
+        # Locations of original log lines, if they are not kept in memory (index mode)
+        self.line_index:LineIndex|None = None
+        # File and offset of an incomplete last line read as the last row, replaced once it is finished (follow mode)
+        self.partial_line:tuple[str, int]|None = None
+
     def register_config_store(self) -> ConfigStore|Config|None:
         return ConfigStore("open_logs",
             Config("log_files", [], type_of=list, element_type=str),
             Config("keep_source_file_location", KEEP_SOURCE_FILE_LOCATION_ENUM, type_of=Enum),
+            Config("memory_mapped_reading", True, type_of=bool),
+            Config("loading_workers", 1, type_of=int),
+            Config("follow_interval_ms", 1000, type_of=int),
+            Config("index_original_logs", False, type_of=bool),
         )
     
     
     # We expect input to represent log file paths
     def process(self,
                 data: str | list | DataFrame | None = None,
-                keep_source_file_location_arg:KEEP_SOURCE_FILE_LOCATION_ENUM|None=None) -> list[COLUMN_TYPE]:
+                keep_source_file_location_arg:KEEP_SOURCE_FILE_LOCATION_ENUM|None=None,
+                memory_mapped_reading_arg:bool|None=None,
+                loading_workers_arg:int|None=None,
+                index_original_logs_arg:bool|None=None) -> list[COLUMN_TYPE]:
+        # Take file states before reading, anything appended later is read in follow mode
+        file_paths = self.set_opened_files(data, keep_source_file_location_arg)
+        if file_paths is None:
+            return None  # No valid files to open
+
+        if memory_mapped_reading_arg is not None:
+            memory_mapped_reading = memory_mapped_reading_arg
+        else:
+            memory_mapped_reading = self.get_config("open_logs.memory_mapped_reading", True)
+
+        # Number of processes reading files concurrently (1 = disabled, 0 = one per CPU core),
+        # used only for files big enough to outweigh starting the processes
+        if loading_workers_arg is not None:
+            loading_workers = loading_workers_arg
+        else:
+            loading_workers = self.get_config("open_logs.loading_workers", 1)
+
+        # Keep only locations of original lines instead of their copies, read them from files when shown
+        # (only possible for memory-mapped reading of uncompressed files, where byte offsets are known)
+        if index_original_logs_arg is not None:
+            index_original_logs = index_original_logs_arg
+        else:
+            index_original_logs = self.get_config("open_logs.index_original_logs", False)
+        if index_original_logs and memory_mapped_reading and \
+                all(self.log_files_states[file_path].followable for file_path in file_paths):
+            self.line_index = LineIndex()
+            reader = read_indexed_log_lines
+        else:
+            reader = read_log_lines if memory_mapped_reading else read_log_lines_by_line
+
+        lines_of_files = read_log_files(
+            file_paths,
+            reader=reader,
+            workers=loading_workers,
+            end_offsets=[self.log_files_states[file_path].offset for file_path in file_paths],
+            on_file_read=self.report_progress
+        )
+        if self.line_index is not None:
+            lines_of_files = self.__add_to_line_index(file_paths, lines_of_files)
+        print(f"Opened {sum(len(lines) for lines in lines_of_files)} log lines from {len(file_paths)} files.")
+        return self.__build_columns(file_paths, lines_of_files)
+
+    def get_chunks(self, first_chunk_bytes:int, max_chunk_bytes:int) -> Iterator[list[COLUMN_TYPE]]|None:
+        ''' Open configured files for reading them in chunks of lines (streaming), instead of all at once.
+            Chunks start small (so the first rows are available quickly) and double up to max_chunk_bytes.
+            Returns None if files cannot be streamed (only memory-mapped reading of uncompressed files can).
+        '''
+        file_paths = self.set_opened_files()
+        if file_paths is None or not self.get_config("open_logs.memory_mapped_reading", True):
+            return None
+        if not all(self.log_files_states[file_path].followable for file_path in file_paths):
+            return None
+        if self.get_config("open_logs.index_original_logs", False):
+            self.line_index = LineIndex()
+        return self.__read_chunks(file_paths, first_chunk_bytes, max_chunk_bytes)
+
+    def __read_chunks(self, file_paths:list[str], first_chunk_bytes:int, max_chunk_bytes:int) -> Iterator[list[COLUMN_TYPE]]:
+        total_bytes = sum(self.log_files_states[file_path].offset for file_path in file_paths)
+        read_bytes = 0
+        start_index = 0
+        chunk_bytes = max(first_chunk_bytes, 1)
+        for file_path in file_paths:
+            state = self.log_files_states[file_path]
+            # Files are tracked as read up to their size when opened, read them up to it chunk by chunk
+            file_end, state.offset = state.offset, 0
+            while state.offset < file_end:
+                end_offset = min(state.offset + chunk_bytes, file_end)
+                if end_offset < file_end:
+                    # Cut chunks after a complete line, grow the chunk if a single line does not fit in it
+                    end_offset = find_last_line_end(file_path, state.offset, end_offset)
+                    if end_offset == state.offset:
+                        chunk_bytes *= 2
+                        continue
+                if self.line_index is not None:
+                    lines = self.__add_to_line_index([file_path], [read_indexed_log_lines(file_path, state.offset, end_offset)])[0]
+                else:
+                    lines = read_log_lines(file_path, state.offset, end_offset)
+                read_bytes += end_offset - state.offset
+                state.offset = end_offset
+                chunk_bytes = min(chunk_bytes * 2, max(max_chunk_bytes, 1))
+                self.report_progress(read_bytes, total_bytes)
+                if lines:
+                    yield self.__build_columns([file_path], [lines], start_index=start_index)
+                    start_index += len(lines)
+
+    def set_opened_files(self,
+                         data: str | list | None = None,
+                         keep_source_file_location_arg:KEEP_SOURCE_FILE_LOCATION_ENUM|None=None) -> list[str]|None:
+        ''' Track files as opened (read up to their size), without reading them.
+            An incomplete last line of the last file (still being written) is read as a row too,
+            follow mode replaces it once it is finished.
+            Used directly when lines of the files were loaded otherwise (e.g. from the parsed logs cache).
+            Returns the opened file paths, or None if there are no valid files.
+        '''
+        files_to_open = self.get_files_to_open(data, keep_source_file_location_arg)
+        if files_to_open is None:
+            return None
+        file_paths, visible_file_values, keepSourceFileLocation = files_to_open
+        log_files_states = [LogFileState(file_path) for file_path in file_paths]
+        for state in log_files_states:
+            state.offset = state.size
+        self.log_files_states = {state.file_path: state for state in log_files_states}
+        self.partial_line = None
+        # Only the last row can be replaced, incomplete last lines of other files are continued by a new row
+        last_state = log_files_states[-1] if log_files_states else None
+        if last_state is not None and last_state.followable:
+            last_line_end = find_last_line_end(last_state.file_path, 0, last_state.size)
+            if last_line_end < last_state.size:
+                self.partial_line = (last_state.file_path, last_line_end)
+        self.visible_file_values = visible_file_values
+        self.keep_source_file_location = keepSourceFileLocation
+        self.line_index = None
+        return file_paths
+
+    def get_files_to_open(self,
+                          data: str | list | None = None,
+                          keep_source_file_location_arg:KEEP_SOURCE_FILE_LOCATION_ENUM|None=None) -> tuple[list[str], dict[str, str], KEEP_SOURCE_FILE_LOCATION_ENUM]|None:
+        ''' File paths to open, with values shown for them in the File column. None if there are no valid files. '''
         file_paths = []
         if data is None:
             data = list(CfgMan().get(CfgMan().r.open_logs.log_files, []))
@@ -48,37 +188,176 @@ class OpenLogsProcessor(IProcessor):
                 common_path_prefix = os.path.dirname(file_paths[0])
             else:
                 common_path_prefix = os.path.commonpath(file_paths)
-        rows = []
+
+        visible_file_values = {}
+        for file_path in file_paths:
+            if keepSourceFileLocation == KEEP_SOURCE_FILE_LOCATION_ENUM.FULL_PATH:
+                visible_file_values[file_path] = file_path
+            elif keepSourceFileLocation == KEEP_SOURCE_FILE_LOCATION_ENUM.FILE_ONLY:
+                visible_file_values[file_path] = os.path.basename(file_path)
+            elif keepSourceFileLocation == KEEP_SOURCE_FILE_LOCATION_ENUM.SHORT_PATH:
+                visible_file_values[file_path] = file_path.replace(common_path_prefix, "", 1).replace("\\", "/").lstrip("/")
+            else:
+                visible_file_values[file_path] = ""
+        return file_paths, visible_file_values, keepSourceFileLocation
+
+    def get_first_lines(self, max_lines:int) -> tuple[list[COLUMN_TYPE]|None, bool]:
+        ''' Columns of (at most) the first max_lines lines of configured files, e.g. for previewing processing.
+            Opened files are not changed, so this does not affect following them.
+            Also returns whether all lines of the files were read.
+        '''
+        files_to_open = self.get_files_to_open()
+        if files_to_open is None:
+            return None, True
+        file_paths, visible_file_values, keep_source_file_location = files_to_open
+        read_file_paths = []
+        lines_of_files = []
+        remaining_lines = max(max_lines, 0)
+        all_lines_read = True
         for file_path in file_paths:
-            with open(file_path, 'r', encoding='utf-8', errors='replace', newline='') as file:
-                for line in file:
-                    # Strip any line ending whitespace/newline characters and remove null bytes
-                    line = line.replace('\x00', '').rstrip()
-                    if not line:
-                        continue  # Skip empty lines
-                    if keepSourceFileLocation == KEEP_SOURCE_FILE_LOCATION_ENUM.FULL_PATH:
-                        visible_file_value = file_path
-                    elif keepSourceFileLocation == KEEP_SOURCE_FILE_LOCATION_ENUM.FILE_ONLY:
-                        visible_file_value = os.path.basename(file_path)
-                    elif keepSourceFileLocation == KEEP_SOURCE_FILE_LOCATION_ENUM.SHORT_PATH:
-                        visible_file_value = file_path.replace(common_path_prefix, "", 1).replace("\\", "/").lstrip("/")
-                    else:
-                        visible_file_value = ""
-                    
-                    rows.append({
-                        RColNameNS.File: visible_file_value,
-                        RColNameNS.Message: line,
-                        RMetaNS.General.OriginalLogs: line
-                    })
-        print(f"Opened {len(rows)} log lines from {len(file_paths)} files.")
-        print(rows[:5])
-        data = DataFrame(rows, dtype=str).reset_index(drop=True)
+            if remaining_lines == 0:
+                all_lines_read = False
+                break
+            # One more line than needed tells whether there are more lines left
+            lines = read_log_lines_by_line(file_path, max_lines=remaining_lines + 1)
+            if len(lines) > remaining_lines:
+                lines = lines[:remaining_lines]
+                all_lines_read = False
+            read_file_paths.append(file_path)
+            lines_of_files.append(lines)
+            remaining_lines -= len(lines)
+        return self.__build_columns(read_file_paths, lines_of_files,
+                                    visible_file_values=visible_file_values,
+                                    keep_source_file_location=keep_source_file_location,
+                                    index_lines=False), all_lines_read
+
+    def restore_opened_files(self, columns:list[COLUMN_TYPE]) -> list[str]|None:
+        ''' Track files as opened for columns that were loaded otherwise (e.g. from the parsed logs cache),
+            taking over the line index of original logs, if the columns have one.
+        '''
+        file_paths = self.set_opened_files()
+        for column in columns:
+            if isinstance(column, MetadataColumn) and isinstance(column.datatype_args.get("line_index"), LineIndex):
+                self.line_index = column.datatype_args["line_index"]
+        return file_paths
+
+    def get_opened_columns(self, columns:list[COLUMN_TYPE], begin:int=0) -> list[COLUMN_TYPE]|None:
+        ''' Columns returned when opening files, for rows from begin on, out of columns of a run
+            (e.g. loaded from the parsed logs cache, which keeps only the last column of every name).
+            Messages are rebuilt from original logs, later processors may have replaced them.
+        '''
+        file_column = next((column for column in columns if isinstance(column, DataColumn) and column.name == RColNameNS.File), None)
+        original_logs = next((column for column in columns
+                              if isinstance(column, MetadataColumn) and column.name == RMetaNS.General.OriginalLogs), None)
+        if original_logs is None:
+            return None
+        original_logs = slice_columns([original_logs], begin, len(original_logs))[0]
+        line_index = original_logs.datatype_args.get("line_index")
+        if isinstance(line_index, LineIndex):
+            messages = [line_index.get_line(int(position)) for position in original_logs]
+        else:
+            messages = original_logs.to_numpy(dtype=object)
+        result = slice_columns([file_column], begin, len(file_column)) if file_column is not None else []
+        result.append(DataColumn(Series(messages, index=original_logs.index, name=RColNameNS.Message, dtype="string")))
+        result.append(original_logs)
+        return result
+
+    def needs_reopen(self, file_paths:list[str]) -> bool:
+        ''' Check whether files must be opened from scratch, instead of following appended lines.
+            That is the case when other files are configured, or a file was rotated or truncated.
+        '''
+        if list(self.log_files_states.keys()) != list(file_paths):
+            return True
+        for file_path, state in self.log_files_states.items():
+            try:
+                current_state = LogFileState(file_path)
+            except OSError:
+                return True
+            if not state.is_same_file(current_state):
+                return True
+            if not state.followable and current_state.size != state.size:
+                return True
+        return False
+
+    def process_appended(self, start_index:int) -> list[COLUMN_TYPE]|None:
+        ''' Read only complete lines appended to the opened files since they were last read (follow mode).
+            Returned columns are indexed from start_index, so they can be appended to existing logs.
+            If the incomplete last line read as the last row was finished, it is read again as the first returned row,
+            indexed at start_index - 1 (so it replaces that row).
+        '''
+        partial_file_path, partial_line_offset = self.partial_line if self.partial_line is not None else (None, None)
+        self.partial_line = None
+        file_paths = []
+        lines_of_files = []
+        start_row = start_index
+        # The file of the incomplete last row goes first, the row is replaced only if it stays the last one
+        for file_path in sorted(self.log_files_states, key=lambda file_path: file_path != partial_file_path):
+            state = self.log_files_states[file_path]
+            if not state.followable:
+                continue
+            current_state = LogFileState(file_path)
+            begin_offset = partial_line_offset if file_path == partial_file_path else state.offset
+            # Leave an incomplete last line to be read once it is finished
+            end_offset = find_last_line_end(file_path, begin_offset, current_state.size)
+            if end_offset <= state.offset:
+                continue
+            if file_path == partial_file_path:
+                start_row -= 1
+            if self.line_index is not None:
+                lines = self.__add_to_line_index([file_path], [read_indexed_log_lines(file_path, begin_offset, end_offset)])[0]
+            else:
+                lines = read_log_lines(file_path, begin_offset, end_offset)
+            state.offset, state.size = end_offset, current_state.size
+            if lines:
+                file_paths.append(file_path)
+                lines_of_files.append(lines)
+        if not file_paths:
+            if partial_file_path is not None:
+                self.partial_line = (partial_file_path, partial_line_offset)
+            return None
+        print(f"Read {sum(len(lines) for lines in lines_of_files)} appended log lines from {len(file_paths)} files.")
+        return self.__build_columns(file_paths, lines_of_files, start_index=start_row)
+
+    def __add_to_line_index(self, file_paths:list[str], indexed_lines_of_files:list[tuple]) -> list[list[str]]:
+        ''' Add locations of read lines to the line index, in the same order the rows are built. '''
+        lines_of_files = []
+        for file_path, (lines, offsets, lengths) in zip(file_paths, indexed_lines_of_files):
+            self.line_index.append(file_path, offsets, lengths)
+            lines_of_files.append(lines)
+        return lines_of_files
+
+    def __build_columns(self,
+                        file_paths:list[str],
+                        lines_of_files:list[list[str]],
+                        start_index:int=0,
+                        visible_file_values:dict[str, str]|None=None,
+                        keep_source_file_location:KEEP_SOURCE_FILE_LOCATION_ENUM|None=None,
+                        index_lines:bool=True) -> list[COLUMN_TYPE]:
+        # Opened files by default
+        visible_file_values = visible_file_values if visible_file_values is not None else self.visible_file_values
+        keep_source_file_location = keep_source_file_location if keep_source_file_location is not None else self.keep_source_file_location
+        # Build columns directly as arrays, instead of a dict per line
+        messages = []
+        for lines in lines_of_files:
+            messages.extend(lines)
+        index = RangeIndex(start_index, start_index + len(messages))
+        message_column = Series(messages, index=index, name=RColNameNS.Message, dtype="string")
         # Optionally, return the RColNameNS.File column if requested
         result = []
-        if keepSourceFileLocation != KEEP_SOURCE_FILE_LOCATION_ENUM.NONE:
-            result.append(DataColumn(data[RColNameNS.File]))
+        if keep_source_file_location != KEEP_SOURCE_FILE_LOCATION_ENUM.NONE:
+            file_column = numpy.repeat(
+                numpy.array([visible_file_values[file_path] for file_path in file_paths], dtype=object),
+                [len(lines) for lines in lines_of_files]
+            )
+            result.append(DataColumn(Series(file_column, index=index, name=RColNameNS.File, dtype="string")))
         # Always return the RColNameNS.Message column
-        result.append(DataColumn(data[RColNameNS.Message]))
+        result.append(DataColumn(message_column))
         # We would like to keep the original messages for displaying them in detail
-        result.append(MetadataColumn(data[RMetaNS.General.OriginalLogs], category=RMetaNS.General.name, datatype=MetadataLogLine))
+        if index_lines and self.line_index is not None:
+            # Rows map to line index positions (which continue over appended lines, same as the rows)
+            positions = Series(numpy.arange(len(self.line_index) - len(messages), len(self.line_index)), index=index)
+            result.append(MetadataColumn(positions, name=RMetaNS.General.OriginalLogs, category=RMetaNS.General.name,
+                                         datatype=MetadataIndexedLogLine, datatype_args={"line_index": self.line_index}))
+        else:
+            result.append(MetadataColumn(message_column, name=RMetaNS.General.OriginalLogs, category=RMetaNS.General.name, datatype=MetadataLogLine))
         return result
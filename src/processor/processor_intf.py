@@ -2,9 +2,12 @@ from pandas import DataFrame
 from typing import List
 
 from logs_managing.logs_column_types import COLUMN_TYPE
-from util.config_store import ConfigStore, Config
+from util.config_store import ConfigManager as CfgMan, ConfigStore, Config
 
 class IProcessor():
+    # Token of the pipeline run the processor is part of (None when used standalone)
+    run_token = None
+
     def register_config_store(self) -> 'ConfigStore|Config|None':
         return None
     
@@ -12,4 +15,41 @@ class IProcessor():
         '''
         Process input data and return new columns to be added to LogsManager.
         '''
-        return None
\ No newline at end of file
+        return None
+
+    def get_input_column_types(self) -> 'List[type]|None':
+        ''' Column types whose results process() reads (through the data it gets from LogsManager).
+            None means the processor depends on all processors run before it.
+        '''
+        return None
+
+    def get_output_column_types(self) -> 'List[type]|None':
+        ''' Column types process() returns. None means it may return any type. '''
+        return None
+
+    def get_shard_args(self) -> 'dict|None':
+        ''' Keyword arguments of process() that replace all of its config lookups, so that blocks of rows
+            can be processed in other processes (see processor.sharded_execution).
+            None means the processor cannot process blocks of rows independently.
+        '''
+        return None
+
+    def get_shard_overlap(self, shard_args: dict) -> int:
+        ''' Number of rows of neighbouring blocks that processing of a block of rows depends on. '''
+        return 0
+
+    def report_progress(self, done: int, total: int):
+        ''' Report progress of processing (done out of total units, e.g. files or rows) to the running pipeline.
+            Raises RunCancelledError if the run was superseded, so processing stops early.
+        '''
+        if self.run_token is not None:
+            self.run_token.report_progress(self.__class__.__name__, done, total)
+
+    def get_config(self, key: str, default=None):
+        ''' Get a config value by its full key (e.g. "open_logs.log_files").
+            Falls back to default if the ConfigStore is not registered (processor used standalone).
+        '''
+        try:
+            return CfgMan().get(key, default)
+        except KeyError:
+            return default
@@ -1,15 +1,41 @@
+import hashlib
+import json
 import traceback
 import time
+from itertools import chain
+from typing import Callable, Iterator
+import numpy
+from pandas import DataFrame
 
 from util.singleton import singleton
 from logs_managing.logs_manager import LogsManager
-from logs_managing.logs_column_types import COLUMN_TYPE
-from util.config_store import ConfigManager as CfgMan
+from logs_managing.logs_container import LogsContainer
+from logs_managing.logs_column_types import COLUMN_TYPE, CaptureMessageColumn, concat_columns, slice_columns
+from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
+from logs_managing.parsed_logs_cache import ParsedLogsCache
+from util.config_store import ConfigManager as CfgMan, ConfigStore
 from processor.processor_intf import IProcessor
 from processor.open_logs_processor import OpenLogsProcessor
 from processor.split_log_lines_processor import SplitLogLinesProcessor
 from processor.filter_logs_processor import FilterLogsProcessor
 from processor.color_logs_processor import ColorLogsProcessor
+from processor.run_scheduler import RunToken, RunCancelledError
+from processor.sharded_execution import process_sharded, process_sharded_batch
+from util.log_file_reader import get_files_fingerprint
+
+# Rows held back while streaming, before they are appended regardless of the rows after them
+STREAMING_MAX_HELD_ROWS = 500000
+
+# Lines read at most for a preview, even if fewer rows than requested can be shown from them
+PREVIEW_MAX_LINES = 1000000
+
+class StageSnapshot:
+    ''' Columns returned by a processor, together with the hash of everything that produced them.
+        Columns of opening and splitting logs are not kept (None), they are loaded from the parsed logs cache again.
+    '''
+    def __init__(self, stage_hash: str, columns: list[COLUMN_TYPE]|None):
+        self.stage_hash = stage_hash
+        self.columns = columns
 
 @singleton
 class ProcessorManager:
@@ -23,6 +49,17 @@ class ProcessorManager:
 
         for processor in self.processors:
             self.initialize_processor(processor)
+
+        # Output of every processor from the last run, to resume from the first changed one
+        # (only outputs of processors after the cached ones are kept, the rest is in the parsed logs cache)
+        self.stage_snapshots:list[StageSnapshot] = []
+        # Opened columns of the last rows processed again with appended lines in follow mode, and how many of them
+        # are settled (only context of the following rows, the rest is replaced by its reprocessed version)
+        self.follow_tail:tuple[list[COLUMN_TYPE], int]|None = None
+
+        # Columns produced by opening and splitting logs are cached on disk (see the parsed_logs_cache config),
+        # so reopening the same unchanged files skips reading and parsing them
+        self.cached_processors_count = 2
     
     def get_processors(self) -> list[IProcessor]:
         return self.processors
@@ -30,35 +67,429 @@ class ProcessorManager:
     def initialize_processor(self, processor: IProcessor):
         CfgMan().register(processor.register_config_store())
 
-    def run(self):
-        LogsManager().erase_data()
+    def get_parsed_logs_cache(self) -> ParsedLogsCache|None:
+        if not CfgMan().get(CfgMan().r.parsed_logs_cache.enabled, True):
+            return None
+        return ParsedLogsCache(CfgMan().get(CfgMan().r.parsed_logs_cache.max_size_mb, 1024) * 1024 * 1024)
+
+    def get_parsed_logs_cache_key(self, parsed_logs_cache: ParsedLogsCache) -> str|None:
+        log_files = CfgMan().get(CfgMan().r.open_logs.log_files, [])
+        if not isinstance(log_files, list) or len(log_files) == 0:
+            return None
+        configs = {}
+        for processor in self.processors[:self.cached_processors_count]:
+            store = processor.register_config_store()
+            if isinstance(store, ConfigStore):
+                configs[store.name] = CfgMan().get(store.name).get_serialized()
+        return parsed_logs_cache.get_key(log_files, configs)
+
+    def get_stage_hashes(self) -> list[str]:
+        ''' Hash of every processor stage: its config, chained with hashes of all stages before it.
+            The first stage also depends on the log files (their size and modification time).
+        '''
+        stage_hashes = []
+        previous_hash = ""
         for processor in self.get_processors():
-            print(f"Running processor: {processor.__class__.__name__}")
+            store = processor.register_config_store()
+            stage_input = {
+                "previous": previous_hash,
+                "processor": processor.__class__.__name__,
+                "config": CfgMan().get(store.name).get_serialized() if isinstance(store, ConfigStore) else None,
+            }
+            if processor == self.processors[0]:
+                log_files = CfgMan().get(CfgMan().r.open_logs.log_files, [])
+                stage_input["files"] = get_files_fingerprint(log_files) if isinstance(log_files, list) else None
+            previous_hash = hashlib.sha256(json.dumps(stage_input, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            stage_hashes.append(previous_hash)
+        return stage_hashes
+
+    def get_first_changed_stage(self, stage_hashes: list[str]) -> int:
+        for i, stage_hash in enumerate(stage_hashes):
+            if i >= len(self.stage_snapshots) or self.stage_snapshots[i].stage_hash != stage_hash:
+                return i
+        return len(stage_hashes)
+
+    def reset_stage_snapshots(self):
+        ''' Forget outputs of the last run, so the next run runs all processors. '''
+        self.stage_snapshots = []
+
+    def set_run_token(self, run_token: RunToken|None):
+        for processor in self.processors:
+            processor.run_token = run_token
+
+    def run(self, run_token: RunToken|None = None, on_chunk: Callable[[LogsContainer, bool], None]|None = None):
+        ''' Run processors over the configured log files.
+            Processors whose config did not change since the last run (nor the config of any processor before them)
+            are not run again, their last returned columns are applied instead.
+            If run_token is given, progress is reported to it and the run stops once it is cancelled.
+            In streaming mode, on_chunk is called with every processed chunk appended to LogsManager
+            (and whether it is the first one).
+        '''
+        self.set_run_token(run_token)
+        try:
+            self.run_stages(run_token, on_chunk)
+        except RunCancelledError:
+            # Partially processed logs must be neither shown nor followed
+            LogsManager().erase_data()
+            raise
+        finally:
+            self.set_run_token(None)
+
+    def run_stages(self, run_token: RunToken|None = None, on_chunk: Callable[[LogsContainer, bool], None]|None = None):
+        LogsManager().erase_data()
+        self.follow_tail = None
+        processors = self.get_processors()
+        stage_hashes = self.get_stage_hashes()
+        first_stage = self.get_first_changed_stage(stage_hashes)
+        del self.stage_snapshots[first_stage:]
+        kept_snapshots = self.stage_snapshots[self.cached_processors_count:]
+        if any(stage_snapshot.columns is None for stage_snapshot in self.stage_snapshots):
+            # Outputs of cached processors are loaded from the parsed logs cache, or all processors run again
+            first_stage, self.stage_snapshots = 0, []
+        for stage_snapshot in self.stage_snapshots:
+            LogsManager().add_new_columns(stage_snapshot.columns)
+        print(f"Resuming processing from processor {first_stage}, previous outputs are reused.")
+
+        parsed_logs_cache, parsed_logs_cache_key = None, None
+        if first_stage < self.cached_processors_count:
+            parsed_logs_cache = self.get_parsed_logs_cache()
+            parsed_logs_cache_key = self.get_parsed_logs_cache_key(parsed_logs_cache) if parsed_logs_cache else None
+        if first_stage == 0 and parsed_logs_cache is not None:
+            cached_columns = parsed_logs_cache.load(parsed_logs_cache_key)
+            if cached_columns is not None:
+                print("Using parsed logs from cache.")
+                LogsManager().add_new_columns(cached_columns)
+                self.processors[0].restore_opened_files(cached_columns)
+                # Cached columns stand for the output of all cached processors, kept outputs of later ones are reused
+                self.stage_snapshots = [StageSnapshot(stage_hash, None) for stage_hash in stage_hashes[:self.cached_processors_count]]
+                for stage_snapshot in kept_snapshots:
+                    LogsManager().add_new_columns(stage_snapshot.columns)
+                    self.stage_snapshots.append(stage_snapshot)
+                first_stage = len(self.stage_snapshots)
+                parsed_logs_cache = None
+
+        if first_stage == 0 and CfgMan().get(CfgMan().r.streaming.enabled, False) and \
+                all(processor.get_shard_args() is not None for processor in processors[1:]):
+            chunks = self.processors[0].get_chunks(CfgMan().get(CfgMan().r.streaming.first_chunk_kb, 256) * 1024,
+                                                   CfgMan().get(CfgMan().r.streaming.max_chunk_mb, 64) * 1024 * 1024)
+            if chunks is not None:
+                self.run_streaming(chunks, on_chunk)
+                print("Processing complete.")
+                return
+
+        for batch in self.get_stage_batches(first_stage):
+            if run_token is not None:
+                run_token.report_progress(f"Running {', '.join(processors[stage].__class__.__name__ for stage in batch)}...",
+                                          batch[0], len(processors))
+            # Perform processing over "non-collapsed" visible data
+            # (metadata columns are not visible to processors)
+            # Only the first processor gets the list of log files as input
+            # Processors in a batch do not depend on each other, so they all get the same input
+            input_data = LogsManager().get_data(show_collapsed=False) if processors[batch[0]] != self.processors[0] else CfgMan().get(CfgMan().r.open_logs.log_files)
+            print(f"Input data type: {type(input_data)}")
+            print(input_data)
+            batch_columns = self.run_batch([processors[stage] for stage in batch], input_data)
+            # Apply returned columns in order of processors, the same as running them one after another
+            for stage, returned_columns in zip(batch, batch_columns):
+                processor = processors[stage]
+                if returned_columns is None:
+                    continue
+                try:
+                    # Update logs manager with new columns
+                    print(f"Processor {processor.__class__.__name__} returned {len(returned_columns)} columns.")
+                    LogsManager().add_new_columns(returned_columns)
+                    # Outputs after a failed processor are not reused, they were produced from incomplete data
+                    if len(self.stage_snapshots) == stage:
+                        self.stage_snapshots.append(StageSnapshot(stage_hashes[stage],
+                                                                  returned_columns if stage >= self.cached_processors_count else None))
+                except Exception as e:
+                    print(f"Error applying columns of processor {processor.__class__.__name__}: {e}")
+                    traceback.print_exc()
+                for col in LogsManager().get_columns():
+                    print(f"{col.__class__.__name__}({col.name})")
+                if parsed_logs_cache_key is not None and stage == self.cached_processors_count - 1:
+                    # Files changed while being read would be cached under a stale key
+                    if LogsManager().get_columns() and parsed_logs_cache_key == self.get_parsed_logs_cache_key(parsed_logs_cache):
+                        parsed_logs_cache.store(parsed_logs_cache_key, LogsManager().get_columns())
+        if run_token is not None:
+            run_token.report_progress("Finalizing...", len(processors), len(processors))
+        LogsManager().finalize()
+        if self.stage_snapshots:
+            settled = self.get_streaming_cut(LogsManager().logs_container, LogsManager().get_columns(), self.get_rows_overlap())
+            tail_start, settled = self.get_follow_tail_bounds(LogsManager().get_rows_count(), settled)
+            opened_columns = self.processors[0].get_opened_columns(LogsManager().get_columns(), tail_start)
+            self.follow_tail = (opened_columns, settled - tail_start) if opened_columns else None
+        print("Processing complete.")
+        print(LogsManager().get_data())
+
+    def run_processor(self, processor: IProcessor, input_data) -> list[COLUMN_TYPE]|None:
+        ''' Run a single processor, returns its columns (None if it failed). '''
+        print(f"Running processor: {processor.__class__.__name__}")
+        start_time = time.time()
+        try:
+            if self.is_sharded(processor, input_data):
+                returned_columns = process_sharded(processor, input_data,
+                                                   workers=CfgMan().get(CfgMan().r.sharded_processing.workers, 1),
+                                                   min_rows_per_shard=CfgMan().get(CfgMan().r.sharded_processing.min_rows_per_shard, 50000))
+            else:
+                returned_columns = processor.process(input_data)
+            if returned_columns is None:
+                print(f"Processor {processor.__class__.__name__} returned no columns. Skipping...")
+                returned_columns = []
+            self.validate_returned_columns(processor, returned_columns)
+        except RunCancelledError:
+            raise
+        except Exception as e:
+            print(f"Error running processor {processor.__class__.__name__}: {e}")
+            traceback.print_exc()
+            returned_columns = None
+        end_time = time.time()
+        print(f"Processor {processor.__class__.__name__} finished in {end_time - start_time:.4f} seconds.")
+        return returned_columns
+
+    def run_batch(self, batch_processors: list[IProcessor], input_data) -> list[list[COLUMN_TYPE]|None]:
+        ''' Run processors independent of each other over the same input, returns columns of every one (None if it failed).
+            They run concurrently only in a process pool (see is_concurrent), matching rows in threads holds the GIL.
+        '''
+        if self.is_concurrent(batch_processors, input_data):
+            print(f"Running processors concurrently: {[processor.__class__.__name__ for processor in batch_processors]}")
             start_time = time.time()
             try:
-                # Perform processing over "non-collapsed" visible data
-                # (metadata columns are not visible to processors)
-                # Only the first processor gets the list of log files as input
-                input_data = LogsManager().get_data(show_collapsed=False) if processor != self.processors[0] else CfgMan().get(CfgMan().r.open_logs.log_files)
-                print(f"Input data type: {type(input_data)}")
-                print(input_data)
-                returned_columns = processor.process(input_data)
-                # If the processor returns a generator (yields), collect all yielded columns
+                batch_columns = process_sharded_batch(batch_processors, input_data,
+                                                      workers=CfgMan().get(CfgMan().r.sharded_processing.workers, 1),
+                                                      min_rows_per_shard=CfgMan().get(CfgMan().r.sharded_processing.min_rows_per_shard, 50000))
+                batch_columns = [returned_columns if returned_columns is not None else [] for returned_columns in batch_columns]
+                for processor, returned_columns in zip(batch_processors, batch_columns):
+                    self.validate_returned_columns(processor, returned_columns)
+                print(f"Processors finished concurrently in {time.time() - start_time:.4f} seconds.")
+                return batch_columns
+            except RunCancelledError:
+                raise
+            except Exception as e:
+                print(f"Error running processors concurrently, running them one after another: {e}")
+                traceback.print_exc()
+        return [self.run_processor(processor, input_data) for processor in batch_processors]
+
+    def is_concurrent(self, batch_processors: list[IProcessor], input_data) -> bool:
+        ''' Whether processors of a batch run concurrently in a process pool
+            (enough rows for at least one block, so starting worker processes pays off).
+        '''
+        workers = CfgMan().get(CfgMan().r.sharded_processing.workers, 1)
+        min_rows_per_shard = max(CfgMan().get(CfgMan().r.sharded_processing.min_rows_per_shard, 50000), 1)
+        if len(batch_processors) < 2 or workers == 1 or not isinstance(input_data, DataFrame) or len(input_data) < min_rows_per_shard:
+            return False
+        return all(processor.get_shard_args() is not None for processor in batch_processors)
+
+    def is_sharded(self, processor: IProcessor, input_data) -> bool:
+        ''' Whether processor runs over blocks of rows in a process pool (enough rows for at least two blocks). '''
+        workers = CfgMan().get(CfgMan().r.sharded_processing.workers, 1)
+        min_rows_per_shard = max(CfgMan().get(CfgMan().r.sharded_processing.min_rows_per_shard, 50000), 1)
+        if workers == 1 or not isinstance(input_data, DataFrame) or len(input_data) < 2 * min_rows_per_shard:
+            return False
+        return processor.get_shard_args() is not None
+
+    def is_independent(self, processor: IProcessor, previous_processors: list[IProcessor]) -> bool:
+        ''' Whether processor reads none of the column types returned by previous processors. '''
+        input_types = processor.get_input_column_types()
+        if input_types is None:
+            return False
+        for previous_processor in previous_processors:
+            output_types = previous_processor.get_output_column_types()
+            if output_types is None or any(issubclass(output_type, input_type) for output_type in output_types for input_type in input_types):
+                return False
+        return True
+
+    def get_stage_batches(self, first_stage: int = 0) -> list[list[int]]:
+        ''' Stages from first_stage on, grouped into batches of consecutive processors independent of each other. '''
+        processors = self.get_processors()
+        batches = []
+        for stage in range(first_stage, len(processors)):
+            if batches and self.is_independent(processors[stage], [processors[previous] for previous in batches[-1]]):
+                batches[-1].append(stage)
+            else:
+                batches.append([stage])
+        return batches
+
+    def validate_returned_columns(self, processor: IProcessor, returned_columns):
+        if not isinstance(returned_columns, list) or not all(isinstance(col, COLUMN_TYPE) for col in returned_columns):
+            raise ValueError(f"Processor {processor.__class__.__name__} returned invalid data type: {type(returned_columns)}")
+
+    def follow(self, run_token: RunToken|None = None,
+               on_appended: Callable[[LogsContainer, int], None]|None = None) -> int|None:
+        ''' Process only lines appended to the opened log files and append them to LogsManager.
+            Falls back to a full run if files were changed otherwise (other files, rotated, truncated).
+            on_appended is called with the container of appended rows and the number of removed visible rows
+            (shown rows replaced by the appended ones), so views can update only their last rows.
+            Returns the number of appended rows, or None if the full pipeline was run instead.
+        '''
+        open_processor = self.processors[0]
+        log_files = CfgMan().get(CfgMan().r.open_logs.log_files, [])
+        if LogsManager().get_rows_count() == 0 or open_processor.needs_reopen(log_files):
+            self.run(run_token)
+            return None
+        # Outputs of the last run do not contain appended lines
+        self.reset_stage_snapshots()
+        rows_count = LogsManager().get_rows_count()
+        new_columns = open_processor.process_appended(start_index=rows_count)
+        if new_columns is None:
+            return 0
+        # An incomplete last row is replaced by its finished line
+        replaced_rows = rows_count - int(new_columns[0].index[0])
+        # Run the rest of the chain only over the new rows and the last rows they could change, in a separate container
+        tail_columns, settled = self.follow_tail if self.follow_tail is not None else ([], 0)
+        tail_rows = max((len(tail_columns[0]) if tail_columns else 0) - replaced_rows, 0)
+        tail_columns, settled = slice_columns(tail_columns, 0, tail_rows) if tail_rows > 0 else [], min(settled, tail_rows)
+        try:
+            opened_columns = concat_columns(tail_columns, new_columns) if tail_columns else new_columns
+        except ValueError as e:
+            print(f"Last rows are not processed again with appended lines: {e}")
+            tail_rows, settled, opened_columns = 0, 0, new_columns
+        logs_container, columns = self.process_rows(opened_columns, finalize=False)
+        rows = logs_container.get_rows_count()
+        appended_container = LogsContainer()
+        LogsManager().add_new_columns(slice_columns(opened_columns, settled, rows) + slice_columns(columns, settled, rows),
+                                      apply_post_process=True, logs_container=appended_container)
+        # Rows after the settled ones are replaced by their reprocessed version
+        removed_rows = LogsManager().truncate_logs(rows_count - replaced_rows - tail_rows + settled)
+        LogsManager().append_logs(appended_container)
+        self.set_follow_tail(opened_columns, max(self.get_streaming_cut(logs_container, columns, self.get_rows_overlap()), settled))
+        if on_appended is not None:
+            on_appended(appended_container, removed_rows)
+        return LogsManager().get_rows_count() - rows_count
+
+    def set_follow_tail(self, opened_columns: list[COLUMN_TYPE], settled: int):
+        ''' Keep the last rows of opened columns to process them again with lines appended in follow mode:
+            rows after the first settled ones, and the rows before them they depend on.
+        '''
+        rows = len(opened_columns[0]) if opened_columns else 0
+        tail_start, settled = self.get_follow_tail_bounds(rows, settled)
+        self.follow_tail = (slice_columns(opened_columns, tail_start, rows), settled - tail_start)
+
+    def get_follow_tail_bounds(self, rows: int, settled: int) -> tuple[int, int]:
+        ''' First row of the follow tail and the number of settled rows (see set_follow_tail). '''
+        # An incomplete last line is replaced once it is finished
+        if self.processors[0].partial_line is not None:
+            settled = min(settled, rows - 1)
+        if rows - settled > STREAMING_MAX_HELD_ROWS:
+            # A captured group spanning too many rows is split in two
+            settled = rows
+        return max(settled - self.get_rows_overlap(), 0), settled
+
+    def get_rows_overlap(self) -> int:
+        ''' Number of rows before and after a row that processors need to process it (e.g. context lines of filters). '''
+        return max([processor.get_shard_overlap(processor.get_shard_args()) for processor in self.get_processors()[1:]
+                    if processor.get_shard_args() is not None], default=0)
+
+    def process_rows(self, opened_columns: list[COLUMN_TYPE], finalize: bool = True) -> tuple[LogsContainer, list[COLUMN_TYPE]]:
+        ''' Run processors after opening logs over rows of opened columns only, in a separate container.
+            Returns the container and columns returned by the processors.
+        '''
+        logs_container = LogsContainer()
+        columns = []
+        LogsManager().add_new_columns(opened_columns, logs_container=logs_container)
+        for processor in self.get_processors()[1:]:
+            try:
+                returned_columns = processor.process(logs_container.get_data(show_collapsed=False))
                 if returned_columns is None:
-                    print(f"Processor {processor.__class__.__name__} returned no columns. Skipping...")
                     continue
-                elif not isinstance(returned_columns, list) or not all(isinstance(col, COLUMN_TYPE) for col in returned_columns):
-                    raise ValueError(f"Processor {processor.__class__.__name__} returned invalid data type: {type(returned_columns)}")
-                # Update logs manager with new columns
-                print(f"Processor {processor.__class__.__name__} returned {len(returned_columns)} columns.")
-                LogsManager().add_new_columns(returned_columns)
+                self.validate_returned_columns(processor, returned_columns)
+                LogsManager().add_new_columns(returned_columns, logs_container=logs_container)
+                columns.extend(returned_columns)
             except Exception as e:
-                print(f"Error running processor {processor.__class__.__name__}: {e}")
+                print(f"Error running processor {processor.__class__.__name__} on a chunk of rows: {e}")
                 traceback.print_exc()
-            end_time = time.time()
-            for col in LogsManager().get_columns():
-                print(f"{col.__class__.__name__}({col.name})")
-            print(f"Processor {processor.__class__.__name__} finished in {end_time - start_time:.4f} seconds.")
-        LogsManager().finalize()
-        print("Processing complete.")
-        print(LogsManager().get_data())
\ No newline at end of file
+        if finalize:
+            LogsManager().finalize(list(opened_columns) + columns, logs_container=logs_container)
+        return logs_container, columns
+
+    def run_streaming(self, chunks: Iterator[list[COLUMN_TYPE]], on_chunk: Callable[[LogsContainer, bool], None]|None = None):
+        ''' Process chunks of opened rows one by one (the same as lines appended in follow mode),
+            appending every processed chunk to LogsManager as soon as it is ready.
+            Rows at the end of a chunk whose results depend on the following rows (context lines of filters,
+            a captured group that may continue) are held back and processed again together with the next chunk.
+            The last already appended rows are processed again too, as leading context of the next chunk
+            (e.g. a filter match right before a chunk end shows its context lines in the next chunk).
+        '''
+        # Outputs are not kept per stage, the next run reads and processes everything again
+        self.reset_stage_snapshots()
+        overlap = self.get_rows_overlap()
+        # Held rows start with lead rows that were already appended
+        held_columns, held_rows, lead = None, 0, 0
+        for opened_columns in chain(chunks, [None]):
+            last_chunk = opened_columns is None
+            if last_chunk:
+                if held_rows <= lead:
+                    # All appended rows are settled, the last ones are context of lines appended in follow mode
+                    self.follow_tail = (held_columns, lead) if held_columns is not None else None
+                    break
+                opened_columns, held_columns = held_columns, None
+            elif held_columns is not None:
+                opened_columns = concat_columns(held_columns, opened_columns)
+                held_columns = None
+            logs_container, columns = self.process_rows(opened_columns, finalize=False)
+            rows = logs_container.get_rows_count()
+            cut = rows if last_chunk else self.get_streaming_cut(logs_container, columns, overlap)
+            if last_chunk:
+                # Rows at the end of files can still change with lines appended in follow mode
+                self.set_follow_tail(opened_columns, max(self.get_streaming_cut(logs_container, columns, overlap), lead))
+            if cut <= lead and rows - lead < STREAMING_MAX_HELD_ROWS:
+                held_columns, held_rows = opened_columns, rows
+                continue
+            if cut <= lead:
+                # Too many rows held back, a captured group spanning them is split in two
+                cut = max(rows - overlap, lead + 1)
+            if lead > 0 or cut < rows:
+                logs_container = LogsContainer()
+                LogsManager().add_new_columns(slice_columns(opened_columns, lead, cut) + slice_columns(columns, lead, cut),
+                                              apply_post_process=True, logs_container=logs_container)
+            else:
+                LogsManager().finalize(list(opened_columns) + columns, logs_container=logs_container)
+            held_start = max(cut - overlap, 0)
+            held_columns, held_rows, lead = slice_columns(opened_columns, held_start, rows), rows - held_start, cut - held_start
+            first_chunk = LogsManager().get_rows_count() == 0
+            LogsManager().append_logs(logs_container)
+            print(f"Streamed {len(logs_container.data)} rows ({LogsManager().get_rows_count()} in total).")
+            if on_chunk is not None:
+                on_chunk(logs_container, first_chunk)
+
+    def preview(self, max_rows: int, run_token: RunToken|None = None) -> LogsContainer|None:
+        ''' Run processors over only as many first lines of the configured log files as needed to show max_rows rows
+            (and the context of filters around them), into a separate container.
+            LogsManager and opened files are not changed. Returns None if there are no files to preview.
+        '''
+        overlap = self.get_rows_overlap()
+        max_lines = max(max_rows, 1) + overlap
+        while True:
+            opened_columns, all_lines_read = self.processors[0].get_first_lines(max_lines)
+            if opened_columns is None:
+                return None
+            logs_container, columns = self.process_rows(opened_columns, finalize=False)
+            # Rows near the end of read lines could change with more lines read
+            final_rows = len(logs_container.data) if all_lines_read else self.get_streaming_cut(logs_container, columns, overlap)
+            LogsManager().finalize(list(opened_columns) + columns, logs_container=logs_container)
+            shown_rows = int(logs_container.visible_rows[:final_rows].sum())
+            if run_token is not None:
+                run_token.report_progress("Previewing...", min(shown_rows, max_rows), max_rows)
+            if all_lines_read or shown_rows >= max_rows or max_lines >= PREVIEW_MAX_LINES:
+                print(f"Previewed {len(logs_container.data)} lines.")
+                return logs_container
+            # Captured rows are shown as one, read more lines
+            max_lines = min(max_lines * 4, PREVIEW_MAX_LINES)
+
+    def get_streaming_cut(self, logs_container: LogsContainer, columns: list[COLUMN_TYPE], overlap: int) -> int:
+        ''' Number of rows of a processed (not yet finalized) chunk that do not depend on the rows after it. '''
+        rows = logs_container.get_rows_count()
+        cut = max(rows - overlap, 0)
+        # Captured groups are not split, a group reaching past the cut could still grow with the following rows
+        messages = logs_container.data[RColNameNS.Message].to_numpy(dtype=object)
+        changed_columns = [messages != column.loc[logs_container.data.index].to_numpy(dtype=object)
+                           for column in columns if isinstance(column, CaptureMessageColumn)]
+        moved = True
+        while moved:
+            moved = False
+            for changed in changed_columns:
+                if cut > 0 and changed[cut - 1] and (cut == rows or changed[cut]):
+                    unchanged = numpy.flatnonzero(~changed[:cut])
+                    cut = unchanged[-1] + 1 if len(unchanged) > 0 else 0
+                    moved = True
+        return int(cut)
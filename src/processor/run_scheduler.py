@@ -0,0 +1,116 @@
+import threading
+import traceback
+from typing import Callable
+
+from util.singleton import singleton
+
+class RunCancelledError(Exception):
+    ''' Raised inside a run that was superseded by a newer run of the same kind. '''
+    pass
+
+class RunToken:
+    ''' Handed to a running command, to report its progress and check whether it was cancelled. '''
+    def __init__(self, on_progress: Callable[[str, int, int], None]|None = None):
+        self.on_progress = on_progress
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self.cancelled.is_set()
+
+    def check_cancelled(self):
+        if self.is_cancelled():
+            raise RunCancelledError()
+
+    def report_progress(self, text: str, done: int, total: int):
+        ''' Report progress (done out of total units of work), raises RunCancelledError if the run was cancelled. '''
+        if self.on_progress is not None:
+            self.on_progress(text, done, total)
+        self.check_cancelled()
+
+class ScheduledRun:
+    def __init__(self, key: str, cmd: Callable[[RunToken], None], token: RunToken):
+        self.key = key
+        self.cmd = cmd
+        self.token = token
+        self.on_done:list[Callable[[], None]] = []
+
+@singleton
+class RunScheduler:
+    ''' Runs commands that mutate LogsManager (e.g. ProcessorManager().run) one at a time, in a background thread.
+        Scheduling a command while another one with the same key is running cancels the running one,
+        and commands with the same key waiting to run are coalesced into one (the latest command runs,
+        all their on_done callbacks are called once it finishes).
+    '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending:dict[str, ScheduledRun] = {}
+        self.current:ScheduledRun|None = None
+        self.worker:threading.Thread|None = None
+
+    def submit(self,
+               cmd: Callable[[RunToken], None],
+               on_done: Callable[[], None]|None = None,
+               key: str = "run",
+               on_progress: Callable[[str, int, int], None]|None = None) -> RunToken:
+        ''' Schedule cmd(run_token) to run after already scheduled commands of other keys.
+            on_done is called in the worker thread when the command (or the one superseding it) finishes.
+        '''
+        with self.lock:
+            scheduled_run = self.pending.get(key)
+            if scheduled_run is None:
+                scheduled_run = ScheduledRun(key, cmd, RunToken(on_progress))
+                self.pending[key] = scheduled_run
+            else:
+                print(f"Coalescing scheduled '{key}' runs.")
+                scheduled_run.cmd = cmd
+                scheduled_run.token.on_progress = on_progress
+            if self.current is not None and self.current.key == key and not self.current.token.is_cancelled():
+                print(f"Cancelling superseded '{key}' run.")
+                self.current.token.cancel()
+                scheduled_run.on_done = self.current.on_done + scheduled_run.on_done
+                self.current.on_done = []
+            if on_done is not None:
+                scheduled_run.on_done.append(on_done)
+            if self.worker is None:
+                self.worker = threading.Thread(target=self.__work, daemon=True)
+                self.worker.start()
+            return scheduled_run.token
+
+    def is_busy(self) -> bool:
+        with self.lock:
+            return self.worker is not None
+
+    def wait(self, timeout: float|None = None) -> bool:
+        ''' Wait until all scheduled commands finish. Returns False on timeout. '''
+        with self.lock:
+            worker = self.worker
+        if worker is not None:
+            worker.join(timeout)
+            return not worker.is_alive()
+        return True
+
+    def __work(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.current = None
+                    self.worker = None
+                    return
+                self.current = self.pending.pop(next(iter(self.pending)))
+                scheduled_run = self.current
+            try:
+                scheduled_run.cmd(scheduled_run.token)
+            except RunCancelledError:
+                print(f"Run '{scheduled_run.key}' was cancelled.")
+            except Exception as e:
+                print(f"Error in scheduled run '{scheduled_run.key}': {e}")
+                traceback.print_exc()
+            with self.lock:
+                # Callbacks of a cancelled run were handed over to the run superseding it
+                on_done = scheduled_run.on_done
+                scheduled_run.on_done = []
+            for callback in on_done:
+                callback()
@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from pandas import DataFrame, Series, concat
+
+from processor.processor_intf import IProcessor
+from logs_managing.logs_column_types import COLUMN_TYPE, DataColumn, MetadataColumn, CaptureMessageColumn
+from logs_managing.logs_container import concat_data_values, concat_metadata_values
+from util.log_file_reader import get_workers_count
+
+def get_shard_bounds(rows: int, shards: int) -> list[tuple[int, int]]:
+    ''' Split positions of rows into (begin, end) bounds of consecutive blocks of (almost) the same size. '''
+    shards = max(1, min(shards, rows))
+    step, remainder = divmod(rows, shards)
+    bounds = []
+    begin = 0
+    for shard in range(shards):
+        end = begin + step + (1 if shard < remainder else 0)
+        bounds.append((begin, end))
+        begin = end
+    return bounds
+
+def _process_shard(processor_type: type, data: DataFrame, shard_args: dict, begin: int, end: int) -> list[tuple]|None:
+    ''' Process a block of rows (with overlapping rows of neighbouring blocks) in a worker process.
+        Returned columns are trimmed to rows from begin to end, and sent back as plain parts,
+        since attributes of column types do not survive pickling.
+    '''
+    columns = processor_type().process(data, **shard_args)
+    if columns is None:
+        return None
+    parts = []
+    for column in columns:
+        values = Series(column.iloc[begin:end], name=column.name)
+        if isinstance(column, MetadataColumn):
+            parts.append((MetadataColumn, column.name, values, {"category": column.category,
+                                                                 "datatype": column.datatype,
+                                                                 "datatype_args": column.datatype_args}))
+        elif isinstance(column, CaptureMessageColumn):
+            parts.append((CaptureMessageColumn, column.name, values, {"replace": column.replace}))
+        else:
+            parts.append((type(column), column.name, values, {}))
+    return parts
+
+def _assemble_columns(shard_parts: list[list[tuple]|None]) -> list[COLUMN_TYPE]|None:
+    ''' Concatenate columns returned for every block, in the order the processor returned them. '''
+    if all(parts is None for parts in shard_parts):
+        return None
+    if any(parts is None for parts in shard_parts):
+        raise ValueError("Processor returned columns only for some blocks of rows.")
+    layout = [(column_type, name) for column_type, name, _, _ in shard_parts[0]]
+    if any([(column_type, name) for column_type, name, _, _ in parts] != layout for parts in shard_parts):
+        raise ValueError("Processor returned different columns for different blocks of rows.")
+    columns = []
+    for i, (column_type, name) in enumerate(layout):
+        attributes = shard_parts[0][i][3]
+        if column_type is DataColumn:
+            # Compact dtypes inferred for every block may differ, they are inferred again over all rows
+            columns.append(DataColumn(concat_data_values([parts[i][2] for parts in shard_parts]), name=name))
+            continue
+        if column_type is MetadataColumn:
+            columns.append(MetadataColumn(concat_metadata_values([parts[i][2] for parts in shard_parts]), name=name, **attributes))
+            continue
+        values = concat([parts[i][2] for parts in shard_parts])
+        if column_type is CaptureMessageColumn:
+            columns.append(CaptureMessageColumn(values.astype(object).where(values.notna(), None), name=name, **attributes))
+        else:
+            columns.append(DataColumn(values, name=name))
+    return columns
+
+def process_sharded(processor: IProcessor, data: DataFrame, workers: int, min_rows_per_shard: int) -> list[COLUMN_TYPE]|None:
+    ''' Run processor over blocks of rows in a process pool, and reassemble the returned columns.
+        Every block is extended by rows of neighbouring blocks the processor depends on (e.g. context lines of filters),
+        those are processed with it, but only rows of the block itself are kept.
+        Config is resolved once here (processor.get_shard_args()), worker processes do not access ConfigManager.
+    '''
+    return process_sharded_batch([processor], data, workers, min_rows_per_shard)[0]
+
+def process_sharded_batch(processors: list[IProcessor], data: DataFrame, workers: int, min_rows_per_shard: int) -> list[list[COLUMN_TYPE]|None]:
+    ''' Run processors independent of each other over the same rows (see process_sharded) in a single process pool,
+        so blocks of all of them are processed concurrently. Returns columns of every processor, in their order.
+    '''
+    tasks = []
+    for processor in processors:
+        shard_args = processor.get_shard_args()
+        if shard_args is None:
+            raise ValueError(f"Processor {processor.__class__.__name__} does not support sharded processing.")
+        overlap = max(processor.get_shard_overlap(shard_args), 0)
+        shards = min(get_workers_count(workers, len(data)), len(data) // max(min_rows_per_shard, 1))
+        bounds = get_shard_bounds(len(data), shards)
+        print(f"Running processor {processor.__class__.__name__} over {len(bounds)} blocks of rows (overlap: {overlap}).")
+        for begin, end in bounds:
+            extended_begin, extended_end = max(begin - overlap, 0), min(end + overlap, len(data))
+            tasks.append((processor, data.iloc[extended_begin:extended_end], shard_args, begin - extended_begin, end - extended_begin))
+    with ProcessPoolExecutor(max_workers=get_workers_count(workers, len(tasks))) as executor:
+        futures = [(processor, executor.submit(_process_shard, type(processor), shard_data, shard_args, begin, end))
+                   for processor, shard_data, shard_args, begin, end in tasks]
+        results = []
+        for processor in processors:
+            processor_futures = [future for future_processor, future in futures if future_processor is processor]
+            shard_parts = []
+            for future in processor_futures:
+                shard_parts.append(future.result())
+                processor.report_progress(len(shard_parts), len(processor_futures))
+            results.append(_assemble_columns(shard_parts))
+    return results
@@ -1,26 +1,79 @@
 from typing import Callable
+from functools import lru_cache
 
 
-from pandas import DataFrame
+from pandas import DataFrame, Series, to_datetime
 import re
 
 from processor.processor_intf import IProcessor
-from logs_managing.logs_column_types import COLUMN_TYPE, DataColumn
+from logs_managing.logs_column_types import COLUMN_TYPE, DataColumn, MetadataColumn
+from logs_managing.logs_container import infer_column_dtype
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
+from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
 from util.config_store import ConfigManager as CfgMan, ConfigStore, Config
 from util.presets_manager import PresetsManager
 
+# Names of the working groups around the pattern, capturing text before and after the matched part of a line
+PREFIX_GROUP = "_split_prefix"
+REST_GROUP = "_split_rest"
+
+class SplitEngine:
+    ''' Compiled form of an input pattern (and a timestamp format), used to split lines in a single regex pass. '''
+    def __init__(self, pattern: str, timestamp_format: str):
+        self.groups = re.findall(r'<(.+?)>', pattern)
+        # Replace <Group> with named group that matches any regex word (all but separators)
+        regex_pattern = re.sub(r'<(.+?)>', r'(?P<\1>\\w+)', pattern)
+        # Replace spaces with \s+ to match any whitespace
+        regex_pattern = re.sub(r' ', r'\\s+', regex_pattern)
+        # Lazy prefix finds the first match in a line (as searching would), text after it is the remaining message
+        self.regex = re.compile(f'^(?P<{PREFIX_GROUP}>[\\s\\S]*?)(?:{regex_pattern})(?P<{REST_GROUP}>[\\s\\S]*)$')
+        # Only needed if the remaining message is captured by a group itself (<Message>)
+        self.remove_regex = re.compile('^' + re.sub(r'<(.+?)>', r'\\w+', pattern).replace(' ', r'\s+'))
+        # Timestamp format "<Day>.<Month> <Time>" is split to tags [Day, Month, Time] and literals around them ["", ".", " ", ""]
+        self.timestamp_tags = re.findall(r'<(.+?)>', timestamp_format)
+        self.timestamp_literals = re.split(r'<.+?>', timestamp_format)
+
+    def extract(self, messages: Series) -> dict[str, Series]:
+        ''' Match every message once, and get captured text of all groups (None where a message does not match). '''
+        match = self.regex.match
+        no_match = (None,) * self.regex.groups
+        rows = [found.groups() if isinstance(message, str) and (found := match(message)) else no_match
+                for message in messages.to_numpy(dtype=object)]
+        columns = list(zip(*rows)) if rows else [()] * self.regex.groups
+        # Patterns may contain unnamed groups of their own, pick named ones by their index
+        return {name: Series(columns[index - 1], index=messages.index, dtype=messages.dtype)
+                for name, index in self.regex.groupindex.items()}
+
+@lru_cache(maxsize=32)
+def get_split_engine(pattern: str, timestamp_format: str) -> SplitEngine:
+    ''' Compile pattern only once for every (pattern, timestamp format) pair, raises re.error if pattern is invalid. '''
+    return SplitEngine(pattern, timestamp_format)
+
 class SplitLogLinesProcessor(IProcessor):
     def register_config_store(self) -> ConfigStore|Config|None:
         return ConfigStore("process_logs",
                 Config("input_pattern", "", type_of=str),
                 Config("timestamp_format", "", type_of=str),
+                # strptime-style format (e.g. %Y-%m-%d %H:%M:%S) of the timestamp, to parse it into a datetime column
+                Config("timestamp_parse_format", "", type_of=str),
+                # Keep split groups in compact dtypes (categories, integers) instead of strings
+                Config("infer_column_types", False, type_of=bool),
                 presetsmanager=PresetsManager("process")
             )
 
+    def get_shard_args(self) -> dict:
+        return {
+            "pattern_format_arg": CfgMan().get(CfgMan().r.process_logs.input_pattern, ""),
+            "timestamp_format_arg": CfgMan().get(CfgMan().r.process_logs.timestamp_format, ""),
+            "timestamp_parse_format_arg": CfgMan().get(CfgMan().r.process_logs.timestamp_parse_format, ""),
+            "infer_column_types_arg": CfgMan().get(CfgMan().r.process_logs.infer_column_types, False),
+        }
+
     def process(self, data,
                 pattern_format_arg:str|None=None,
-                timestamp_format_arg:str|None=None) -> list[COLUMN_TYPE]|None:
+                timestamp_format_arg:str|None=None,
+                timestamp_parse_format_arg:str|None=None,
+                infer_column_types_arg:bool|None=None) -> list[COLUMN_TYPE]|None:
         if not isinstance(data, DataFrame):
             raise ValueError("Input must be a pandas DataFrame")
         if RColNameNS.Message not in data.columns and not data.empty:
@@ -42,57 +95,87 @@ class SplitLogLinesProcessor(IProcessor):
             pattern = CfgMan().get(CfgMan().r.process_logs.input_pattern, "").strip()
         if not pattern:
             return None
-        # Replace <Group> with named group that matches any regex word (all but separators)
-        regex_pattern = re.sub(r'<(.+?)>', r'(?P<\1>\\w+)', pattern)
-        # Replace spaces with \s+ to match any whitespace
-        regex_pattern = re.sub(r' ', r'\\s+', regex_pattern)
-        
-        # Apply regex to each Line in the DataFrame
+        if timestamp_format_arg is not None:
+            timestamp_format_arg = timestamp_format_arg.strip()
+        else:
+            timestamp_format_arg = CfgMan().get(CfgMan().r.process_logs.timestamp_format, "").strip()
+        # Input is shared with LogsManager (not a copy), add working columns only to a shallow copy
+        data = data.copy(deep=False)
+
+        # Apply regex to each Line in the DataFrame, capturing groups and the remaining message in one pass
         try:
-            extracted = data[RColNameNS.Message].str.extract(regex_pattern, expand=True)
-            for group in re.findall(r'<(.+?)>', pattern):
-                if group in extracted.columns:
-                    data[group] = extracted[group]
-                else:
-                    data[group] = None
+            engine = get_split_engine(pattern, timestamp_format_arg)
+            if not engine.groups:
+                raise ValueError("pattern contains no capture groups")
+            # Same check as the .str accessor does (e.g. an empty column without dtype has no strings)
+            if not hasattr(data[RColNameNS.Message], "str"):
+                raise ValueError(f"{RColNameNS.Message} column does not contain strings")
+            extracted = engine.extract(data[RColNameNS.Message])
+            # Matched part is removed only if it is at the start of a line
+            matched_at_start = extracted[PREFIX_GROUP].eq("").fillna(False).astype(bool)
+            remaining_message = extracted[REST_GROUP].where(matched_at_start, data[RColNameNS.Message])
+            for group in engine.groups:
+                data[group] = extracted[group]
         except Exception as e:
             print("Error extracting groups:", e)
             return None
 
         # Convert all possible nan's to empty string
         data = data.fillna("")
-
-        if timestamp_format_arg is not None:
-            timestamp_format_arg = timestamp_format_arg.strip()
-        else:
-            timestamp_format_arg = CfgMan().get(CfgMan().r.process_logs.timestamp_format, "").strip()
-        timestamp_tags = re.findall(r'<(.+?)>', timestamp_format_arg)
-        agg_format = re.sub(r'<(.+?)>', r'{}', timestamp_format_arg)
+        timestamp_tags = engine.timestamp_tags
+        parsed_timestamp = None
         if timestamp_format_arg:
             if False not in [tag in data.columns for tag in timestamp_tags]:
                 # Apply extraction from columns to RColNameNS.Timestamp column
+                # Concatenate whole columns with literals between them, empty if any of the tags is empty
+                timestamp_col = Series(engine.timestamp_literals[0], index=data.index, dtype="string")
+                complete = Series(True, index=data.index)
+                for tag, literal in zip(timestamp_tags, engine.timestamp_literals[1:]):
+                    timestamp_col = timestamp_col + data[tag].astype("string") + literal
+                    complete &= data[tag] != ""
+                timestamp_col = timestamp_col.where(complete, "")
                 # Insert as column 2
-                timestamp_col = data[timestamp_tags].apply(
-                    lambda row: agg_format.format(*row.values) if all(isinstance(val, str) and val!="" for val in row.values) else "",
-                    axis=1
-                )
                 data.insert(len(timestamp_tags)+1, RColNameNS.Timestamp, timestamp_col)
                 data.drop(columns=timestamp_tags, inplace=True, errors='ignore')
+                parsed_timestamp = self.parse_timestamp(timestamp_col, timestamp_parse_format_arg)
 
-        # Remove matched part (including separators) from RColNameNS.Message to get only the remaining message
-        last_group_match = list(re.finditer(r'<(.+?)>', pattern))
-        if last_group_match:
-            remove_regex = (
-            re.sub(r'<(.+?)>', r'\\w+', pattern)
-            .replace(' ', r'\s+')
-            )
-            data[RColNameNS.Message] = data[RColNameNS.Message].str.replace(f'^{remove_regex}', '', regex=True).str.lstrip()
+        # Keep only the remaining message (after the matched part, including separators) in RColNameNS.Message
+        if RColNameNS.Message in engine.groups:
+            # Message was captured by a group, matched part is removed from the captured text instead
+            data[RColNameNS.Message] = data[RColNameNS.Message].str.replace(engine.remove_regex, '', regex=True).str.lstrip()
         else:
-            data[RColNameNS.Message] = data[RColNameNS.Message]
+            data[RColNameNS.Message] = remaining_message.fillna("").str.lstrip()
+        if infer_column_types_arg is None:
+            infer_column_types_arg = CfgMan().get(CfgMan().r.process_logs.infer_column_types, False)
+        if infer_column_types_arg:
+            for group in engine.groups:
+                if group in data.columns and group != RColNameNS.Message:
+                    data[group] = infer_column_dtype(data[group])
         # Return new columns first, then the remaining message column
         results = []
         for col in data.columns:
             if col != RColNameNS.Message:
                 results.append(DataColumn(data[col]))
         results.append(DataColumn(data[RColNameNS.Message]))
+        if parsed_timestamp is not None:
+            results.append(MetadataColumn(parsed_timestamp, name=RMetaNS.General.ParsedTimestamp, category=RMetaNS.General.name))
         return results
+
+    def parse_timestamp(self, timestamp_col:Series, parse_format:str|None=None) -> Series|None:
+        ''' Parse timestamps into datetime64[ns] values (NaT where a timestamp does not match the format),
+            or None if no parse format is set. Timestamps with a time zone are converted to UTC.
+        '''
+        if parse_format is not None:
+            parse_format = parse_format.strip()
+        else:
+            parse_format = CfgMan().get(CfgMan().r.process_logs.timestamp_parse_format, "").strip()
+        if not parse_format:
+            return None
+        try:
+            parsed_timestamp = to_datetime(timestamp_col, format=parse_format, errors="coerce")
+            if parsed_timestamp.dt.tz is not None:
+                parsed_timestamp = parsed_timestamp.dt.tz_convert("UTC").dt.tz_localize(None)
+            return parsed_timestamp.astype("datetime64[ns]")
+        except Exception as e:
+            print("Error parsing timestamps:", e)
+            return None
@@ -88,4 +88,18 @@ class TestColorLogsProccessor(unittest.TestCase):
         expected_fg = ['#000000', '#000000', '#000000']
         expected_bg = ['#FFFFFF', '#FFFFFF', '#FFFFFF']
         assert list(ret_columns[0]) == expected_fg, f"Expected {expected_fg}, got {list(ret_columns[0])}"
-        assert list(ret_columns[1]) == expected_bg, f"Expected {expected_bg}, got {list(ret_columns[1])}"
\ No newline at end of file
+        assert list(ret_columns[1]) == expected_bg, f"Expected {expected_bg}, got {list(ret_columns[1])}"
+    def test_process_last_matching_rule_wins(self):
+        input_df = DataFrame({RColNameNS.Message: ['ERROR FF', 'WARN', 'INFO']}, dtype="string")
+        ret_columns = self.processor.process(input_df.copy(),
+            color_scheme_arg=[
+                ["", "ERROR|WARN", "#FF0000", "#FFFF00"],
+                [RColNameNS.Message, "WARN", "#00FF00", ""],
+                # Colors given by earlier rules are not matched (e.g. "#FFFF00" contains "FF")
+                ["", "FF", "", "#0000FF"]
+            ]
+        )
+        expected_fg = ['#FF0000', '#00FF00', '#000000']
+        expected_bg = ['#0000FF', '#FFFF00', '#FFFFFF']
+        assert list(ret_columns[0]) == expected_fg, f"Expected {expected_fg}, got {list(ret_columns[0])}"
+        assert list(ret_columns[1]) == expected_bg, f"Expected {expected_bg}, got {list(ret_columns[1])}"
@@ -0,0 +1,42 @@
+import unittest
+
+from pandas import Series
+
+from processor.column_matching import column_contains, column_contains_any, combine_patterns, get_literals_regex, is_literal
+
+class TestColumnMatching(unittest.TestCase):
+    def setUp(self):
+        self.column = Series(["ERROR disk full", "INFO started", "WARN aa", "DEBUG x", "INFO ERROR"], dtype="string")
+
+    def assert_same_as_one_by_one(self, patterns):
+        expected = Series(False, index=self.column.index)
+        for pattern in patterns:
+            expected |= column_contains(self.column, pattern)
+        self.assertEqual(list(column_contains_any(self.column, patterns)), list(expected))
+
+    def test_combine_patterns(self):
+        self.assertEqual(combine_patterns(["ERROR"]), "ERROR")
+        self.assertEqual(combine_patterns(["ERROR", "^WARN"]), "(?:ERROR)|(?:^WARN)")
+        # Backreferences would refer to groups of other patterns
+        self.assertIsNone(combine_patterns(["(ERROR)", r"(a)\1"]))
+        # Global flags are allowed only at the start of a regex
+        self.assertIsNone(combine_patterns(["ERROR", "(?i)warn"]))
+
+    def test_contains_any(self):
+        self.assert_same_as_one_by_one(["ERROR", "^WARN", "started$"])
+        self.assert_same_as_one_by_one(["DEBUG", r"(a)\1"])
+        self.assert_same_as_one_by_one(["ERROR", "(?i)debug"])
+        self.assertEqual(list(column_contains_any(self.column.astype("category"), ["ERROR", "^WARN"])),
+                         [True, False, True, False, True])
+
+    def test_literals(self):
+        self.assertTrue(is_literal("disk full"))
+        self.assertFalse(is_literal("^WARN"))
+        self.assertEqual(get_literals_regex(["req-10", "req-12", "req-2"]), r"req\-(?:1[02]|2)")
+        # Shorter literals end inside longer ones
+        self.assertEqual(get_literals_regex(["ab", "a"]), "a(?:b)?")
+        self.assertEqual(combine_patterns(["ERROR", "WARN", "^DEBUG"]), "(?:(?:ERROR|WARN))|(?:^DEBUG)")
+        self.assertEqual(list(column_contains(self.column, "error", case=False)), [True, False, False, False, True])
+        self.assertEqual(list(column_contains(self.column, "error")), [False] * 5)
+        self.assert_same_as_one_by_one(["ERROR", "started", "aa", ""])
+        self.assert_same_as_one_by_one(["x", "DEBUG x", "^INFO"])
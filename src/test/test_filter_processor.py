@@ -5,7 +5,7 @@ from pandas import DataFrame
 from pandas.testing import assert_frame_equal
 
 from util.config_enums import CONTEXTUALIZE_LINES_ENUM
-from processor.filter_logs_processor import FilterLogsProcessor
+from processor.filter_logs_processor import FilterLogsProcessor, get_context_mask
 from logs_managing.logs_manager import LogsManager
 from logs_managing.logs_column_types import CaptureMessageColumn, DataColumn
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
@@ -43,6 +43,25 @@ class TestFilterLogsProcessor(unittest.TestCase):
         })
         assert_frame_equal(result_df, expected_df, check_dtype=False)
 
+    def test_filter_category_column(self):
+        levels = ['INFO', 'ERROR', 'INFO', None]
+        for level_column in (DataFrame({"Level": levels}, dtype="string").fillna(""), DataFrame({"Level": levels}, dtype="category")):
+            input_df = DataFrame({"Level": level_column["Level"], RColNameNS.Message: ['a', 'b', 'c', 'd']})
+            ret_columns = self.processor.process(input_df.copy(),
+                filter_pattern_arg=[["Level", "ERR"]],
+                contextualize_lines_count_arg=0,
+                contextualize_lines_type_arg=CONTEXTUALIZE_LINES_ENUM.NONE
+            )
+            self.assertEqual(list(ret_columns[0].notna()), [False, True, False, False])
+
+    def test_context_mask(self):
+        matched = [False, False, True, False, False, False, False, True, False]
+        self.assertEqual(list(get_context_mask(matched, 1, 0)), [False, True, True, False, False, False, True, True, False])
+        self.assertEqual(list(get_context_mask(matched, 0, 2)), [False, False, True, True, True, False, False, True, True])
+        # Windows overlapping each other and the edges
+        self.assertEqual(list(get_context_mask(matched, 3, 3)), [True] * 9)
+        self.assertEqual(list(get_context_mask([], 3, 3)), [])
+
     def test_process_with_contextualization(self):
         # Test contextualization of filtered lines
         input_df = DataFrame({RColNameNS.Message: ['info message', 'error occurred', 'debug info']})
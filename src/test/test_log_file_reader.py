@@ -0,0 +1,101 @@
+import unittest
+
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+from unittest import mock
+
+from util.log_file_reader import read_log_lines, read_log_lines_by_line, read_log_files, split_log_text
+from util.log_file_reader import read_indexed_log_lines, normalize_log_line
+
+class TestLogFileReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix='.log')
+        self.tmp_file.close()
+
+    def tearDown(self):
+        os.unlink(self.tmp_file.name)
+
+    def write(self, content: bytes):
+        with open(self.tmp_file.name, 'wb') as f:
+            f.write(content)
+
+    def test_split_log_text(self):
+        self.assertEqual(split_log_text("a \nb\t\r\n\n  \r c\x00\x00\n"), ["a", "b", " c"])
+        self.assertEqual(split_log_text(""), [])
+
+    def test_empty_file(self):
+        self.write(b"")
+        self.assertEqual(read_log_lines(self.tmp_file.name), [])
+
+    def test_matches_line_by_line_reading(self):
+        self.write(
+            b"Line 1\r\nLine 2\rLine 3\n\n   \nLine\x00 4  \t\r\n" +
+            "Unicode é中 \n".encode('utf-8') + b"Invalid \xff\xfe bytes\nNo newline at end"
+        )
+        expected = read_log_lines_by_line(self.tmp_file.name)
+        self.assertEqual(read_log_lines(self.tmp_file.name), expected)
+        # Small chunks force chunk boundaries inside the text (and lines longer than a chunk)
+        for chunk_size in [1, 3, 7, 16]:
+            self.assertEqual(read_log_lines(self.tmp_file.name, chunk_size=chunk_size), expected)
+
+    def test_indexed_reading(self):
+        content = b"Line 1\r\nLine 2\rLine 3\n\n   \nLine\x00 4  \t\r\n \xc2\xa0 \n" + \
+            "Unicode é中 \n".encode('utf-8') + b"Invalid \xff\xfe bytes\nNo newline at end"
+        self.write(content)
+        expected = read_log_lines(self.tmp_file.name)
+        for chunk_size in [1, 7, 1024]:
+            lines, offsets, lengths = read_indexed_log_lines(self.tmp_file.name, chunk_size=chunk_size)
+            self.assertEqual(lines, expected)
+            # Every line can be read back from its location
+            self.assertEqual([normalize_log_line(content[o:o + l]) for o, l in zip(offsets, lengths)], expected)
+
+    def test_reading_offsets(self):
+        content = b"Line 1\r\nLine 2\rLine 3\nLine 4\nPartial"
+        self.write(content)
+        end_offset = content.rfind(b"\n") + 1
+        for reader in [read_log_lines, read_log_lines_by_line]:
+            self.assertEqual(reader(self.tmp_file.name, 0, end_offset), ["Line 1", "Line 2", "Line 3", "Line 4"])
+            self.assertEqual(reader(self.tmp_file.name, content.find(b"Line 3"), end_offset), ["Line 3", "Line 4"])
+            self.assertEqual(reader(self.tmp_file.name, end_offset), ["Partial"])
+
+    def test_multibyte_characters_on_chunk_boundary(self):
+        self.write(("中" * 10 + "\n").encode('utf-8') * 5)
+        self.assertEqual(read_log_lines(self.tmp_file.name, chunk_size=5), ["中" * 10] * 5)
+
+    def test_read_log_files_keeps_order(self):
+        self.write(b"First file\n")
+        tmp_file2 = tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix='.log')
+        tmp_file2.write(b"Second file 1\nSecond file 2\n")
+        tmp_file2.close()
+        try:
+            file_paths = [tmp_file2.name, self.tmp_file.name, tmp_file2.name]
+            expected = [["Second file 1", "Second file 2"], ["First file"], ["Second file 1", "Second file 2"]]
+            self.assertEqual(read_log_files(file_paths, workers=1), expected)
+            self.assertEqual(read_log_files(file_paths, workers=3, min_parallel_bytes=0), expected)
+            self.assertEqual(read_log_files(file_paths, reader=read_log_lines_by_line, workers=2, min_parallel_bytes=0), expected)
+            # Small files are read without starting worker processes
+            with mock.patch("util.log_file_reader.ProcessPoolExecutor") as process_pool:
+                self.assertEqual(read_log_files(file_paths, workers=3), expected)
+            process_pool.assert_not_called()
+        finally:
+            os.unlink(tmp_file2.name)
+
+    def test_compressed_files(self):
+        content = b"Line 1\r\nLine 2\n\nLine\x00 3  \n" * 50 + b"Last line"
+        expected = ["Line 1", "Line 2", "Line 3"] * 50 + ["Last line"]
+        for compress in [gzip.compress, bz2.compress, lzma.compress]:
+            self.write(compress(content))
+            self.assertEqual(read_log_lines(self.tmp_file.name), expected)
+            self.assertEqual(read_log_lines(self.tmp_file.name, chunk_size=7), expected)
+            self.assertEqual(read_log_lines_by_line(self.tmp_file.name), expected)
+
+    def test_plain_file_starting_like_compressed(self):
+        for content in [b"BZh event\n", b"BZh91AY&SY not really\nBZh event\n", b"\x1f\x8b garbage\n"]:
+            self.write(content)
+            expected = read_log_lines_by_line(self.tmp_file.name)
+            self.assertEqual(len(expected), content.count(b"\n"))
+            self.assertEqual(read_log_lines(self.tmp_file.name), expected)
+        self.assertEqual(read_log_lines(self.tmp_file.name), ["\x1f\ufffd garbage"])
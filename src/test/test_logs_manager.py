@@ -2,13 +2,14 @@ import unittest
 
 from enum import Enum
 from pandas import DataFrame
-from pandas import Series
+from pandas import Categorical, Series, to_datetime
 from pandas.testing import assert_frame_equal
 
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
 from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
 from logs_managing.logs_column_types import CaptureMessageColumn, DataColumn, MetadataColumn
 from logs_managing.logs_manager import LogsManager
+from logs_managing.logs_container import LogsContainer
 
 class TestLogsManager(unittest.TestCase):
     def test_simulate_rendered_data_errors(self):
@@ -212,3 +213,193 @@ class TestLogsManager(unittest.TestCase):
             'Category': ['A', 'B', 'C'],
             RColNameNS.Message: ['<Collapsed>', 'LINE2', '<Collapsed>'],
         }), check_dtype=False)
+
+    def test_append_logs(self):
+        LogsManager().erase_data()
+        LogsManager().add_new_columns([
+            DataColumn(['line1', 'line2'], name=RColNameNS.Message),
+            MetadataColumn(['info', 'error'], name='Level')
+        ])
+        LogsManager().finalize()
+
+        # Appended rows are processed in a separate container, indexed after existing rows
+        logs_container = LogsContainer()
+        index = [2, 3, 4]
+        appended_columns = [
+            DataColumn(Series(['line3', 'line4', 'line5'], index=index), name=RColNameNS.Message),
+            MetadataColumn(Series(['debug', 'info', 'debug'], index=index), name='Level'),
+            CaptureMessageColumn(Series([None, 'line4', None], index=index), name="Collapsing Rows", replace="<Collapsed {count}>")
+        ]
+        LogsManager().add_new_columns(appended_columns, logs_container=logs_container)
+        LogsManager().finalize(appended_columns, logs_container=logs_container)
+        self.assertEqual(LogsManager().append_logs(logs_container), 3)
+
+        self.assertEqual(LogsManager().get_rows_count(), 5)
+        assert_frame_equal(LogsManager().get_data().reset_index(drop=True), DataFrame({
+            RColNameNS.Message: ['line1', 'line2', '<Collapsed 1>', 'line4', '<Collapsed 1>']
+        }), check_dtype=False)
+        metadata = LogsManager().get_metadata(show_collapsed=False)
+        self.assertEqual(list(metadata.index), [0, 1, 2, 3, 4])
+        self.assertEqual(metadata[3][RMetaNS.General.name]['Level'], 'info')
+
+    def test_truncate_logs(self):
+        LogsManager().erase_data()
+        LogsManager().add_new_columns([
+            DataColumn(['line1', 'line2'], name=RColNameNS.Message),
+            MetadataColumn(['info', 'error'], name='Level')
+        ])
+        LogsManager().finalize()
+
+        def appended(lines, first_index):
+            logs_container = LogsContainer()
+            index = list(range(first_index, first_index + len(lines)))
+            columns = [
+                DataColumn(Series(lines, index=index), name=RColNameNS.Message),
+                MetadataColumn(Series(['debug'] * len(lines), index=index), name='Source'),
+                CaptureMessageColumn(Series([None] + lines[1:], index=index), name="Collapsing Rows", replace="<Collapsed {count}>")
+            ]
+            LogsManager().add_new_columns(columns, logs_container=logs_container)
+            LogsManager().finalize(columns, logs_container=logs_container)
+            return logs_container
+
+        first = appended(['line3', 'line4'], 2)
+        LogsManager().append_logs(first)
+        LogsManager().append_logs(appended(['line5', 'line6', 'line7'], 4))
+        self.assertEqual(LogsManager().get_rows_count(), 7)
+        # Appended containers are not changed by later appends
+        self.assertEqual(len(first.style), 2)
+        self.assertEqual(len(first.metadata.index), 2)
+
+        # Replace the last rows by other ones, removed rows are not kept anywhere
+        self.assertEqual(LogsManager().truncate_logs(4), 3)
+        self.assertEqual(LogsManager().get_rows_count(), 4)
+        self.assertEqual(len(LogsManager().logs_container.captured_sections), 1)
+        LogsManager().append_logs(appended(['line5', 'line6'], 4))
+        self.assertEqual(list(LogsManager().get_data(show_collapsed=False).index), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(LogsManager().get_data()[RColNameNS.Message].tolist(),
+                         ['line1', 'line2', '<Collapsed 1>', 'line4', '<Collapsed 1>', 'line6'])
+        metadata = LogsManager().get_metadata(show_collapsed=False)
+        self.assertEqual(metadata[1][RMetaNS.General.name], {'Level': 'error'})
+        self.assertEqual(metadata[5][RMetaNS.General.name], {'Source': 'debug'})
+        self.assertEqual(len(LogsManager().get_style(show_collapsed=False)), 6)
+
+    def test_metadata_and_style(self):
+        LogsManager().erase_data()
+        LogsManager().add_new_columns([
+            DataColumn(['line1', 'line2', 'line3'], name=RColNameNS.Message),
+            MetadataColumn(['info', 'error', 'debug'], name='Level'),
+            MetadataColumn(['#FF0000', '#00FF00', '#0000FF'], name=RMetaNS.General.ForegroundColor, category=RMetaNS.General.name),
+            MetadataColumn(['x', 'y', 'z'], name='Level'),
+            CaptureMessageColumn([None, None, 'line3'], name="Collapsing Rows", replace="<Collapsed>"),
+        ])
+        LogsManager().finalize()
+        # Metadata dicts are built per row, later columns of the same name replace earlier ones
+        metadata = LogsManager().get_metadata(show_collapsed=False)
+        self.assertEqual(metadata[1][RMetaNS.General.name], {'Level': 'y', RMetaNS.General.ForegroundColor: '#00FF00'})
+        self.assertNotIn(RMetaNS.CaptureRows.name, metadata[1])
+        self.assertIn(RMetaNS.CaptureRows.name, metadata[0])
+        self.assertEqual(list(LogsManager().get_metadata([2]).index), [2])
+        with self.assertRaises(KeyError):
+            LogsManager().get_metadata([1])  # Collapsed row
+        # Style of the capture header is overridden
+        style = LogsManager().get_style()
+        self.assertEqual(list(style.index), [0, 2])
+        self.assertEqual(style.get_foreground(0), '#878787')
+        self.assertEqual(style.get_foreground(1), '#0000FF')
+        self.assertEqual(style.get_background(1), '#FFFFFF')
+        # Captured rows keep their colors from before capturing
+        section = metadata[0][RMetaNS.CaptureRows.name][RMetaNS.CaptureRows.CaptureRows]
+        section.get_value()
+        self.assertEqual([section.style.get_foreground(i) for i in range(2)], ['#FF0000', '#00FF00'])
+
+    def test_collapse_groups(self):
+        logs_container = LogsContainer()
+        index = list(range(10, 18))
+        logs_container.set_data_column(Series([f'm{i}' for i in index], index=index, dtype="string"), RColNameNS.Message)
+        # Groups: [10, 11] without a header, [13, 14, 15] with the last new message as header, [17] alone
+        logs_container.set_collapsable(Series([None, None, 'm12', 'A', 'B {count}', None, 'm16', None], index=index), "<Collapsed {count}>")
+        self.assertEqual(list(logs_container.get_data()[RColNameNS.Message]), ['<Collapsed 2>', 'm12', 'B 3', 'm16', '<Collapsed 1>'])
+        self.assertEqual(list(logs_container.get_data().index), [10, 12, 14, 16, 17])
+        capture = logs_container.get_metadata([14]).iloc[0][RMetaNS.CaptureRows.name]
+        self.assertEqual(capture[RMetaNS.CaptureRows.FromToIndexes], "Lines 13 to 15")
+        self.assertEqual(capture[RMetaNS.CaptureRows.CollapsedInTotal], 3)
+        self.assertEqual(list(capture[RMetaNS.CaptureRows.CaptureRows].get_value()[RColNameNS.Message]), ['m13', 'm14', 'm15'])
+
+    def test_captured_sections_after_append(self):
+        LogsManager().erase_data()
+        LogsManager().add_new_columns([DataColumn(['line1', 'line2'], name=RColNameNS.Message)])
+        LogsManager().finalize()
+        logs_container = LogsContainer()
+        index = [2, 3, 4]
+        appended_columns = [
+            DataColumn(Series(['line3', 'line4', 'line5'], index=index), name=RColNameNS.Message),
+            CaptureMessageColumn(Series(['<Header>', None, 'line5'], index=index), name="Collapsing Rows", replace="<Collapsed>")
+        ]
+        LogsManager().add_new_columns(appended_columns, logs_container=logs_container)
+        LogsManager().finalize(appended_columns, logs_container=logs_container)
+        LogsManager().append_logs(logs_container)
+        logs_container.clear()
+        # Captured rows are read from the container they were appended to, when shown
+        section = LogsManager().get_metadata([2]).iloc[0][RMetaNS.CaptureRows.name][RMetaNS.CaptureRows.CaptureRows]
+        self.assertEqual(list(section.get_value()[RColNameNS.Message]), ['line3', 'line4'])
+        self.assertEqual(list(section.style.index), [2, 3])
+
+    def test_visible_data_is_cached(self):
+        logs_container = LogsContainer()
+        logs_container.set_data_column(Series(['a', 'b', 'c'], dtype="string"), RColNameNS.Message)
+        # All rows visible, data is returned without copying
+        self.assertIs(logs_container.get_data(), logs_container.data)
+        logs_container.set_collapsable(Series([None, None, 'c']), "<Collapsed>")
+        self.assertEqual(list(logs_container.visible_rows), [True, False, True])
+        visible_data = logs_container.get_data()
+        self.assertIs(logs_container.get_data(), visible_data)
+        self.assertEqual(list(visible_data.index), [0, 2])
+        self.assertEqual(list(logs_container.get_visible_positions()), [0, 2])
+        # Changing collapsing drops the cache
+        logs_container.visible_rows = [True, True, True]
+        self.assertEqual(list(logs_container.get_data().index), [0, 1, 2])
+
+    def test_time_range_positions(self):
+        logs_container = LogsContainer()
+        logs_container.set_data_column(Series(['a', 'b', 'c', 'd'], dtype="string"), RColNameNS.Message)
+        parsed = to_datetime(Series(["2024-01-01 10:00:00", "2024-01-01 09:00:00", None, "2024-01-01 11:00:00"]))
+        MetadataColumn(parsed, name=RMetaNS.General.ParsedTimestamp, category=RMetaNS.General.name).process(logs_container)
+        # Timestamps are kept typed, rows without one do not have it in metadata
+        self.assertEqual(logs_container.metadata.columns[(RMetaNS.General.name, RMetaNS.General.ParsedTimestamp)].values.dtype, "datetime64[ns]")
+        metadata = logs_container.get_metadata()
+        self.assertEqual(metadata[0][RMetaNS.General.name][RMetaNS.General.ParsedTimestamp], "2024-01-01 10:00:00")
+        self.assertNotIn(RMetaNS.General.ParsedTimestamp, metadata[2].get(RMetaNS.General.name, {}))
+        self.assertEqual(list(logs_container.get_time_range_positions("2024-01-01 09:30")), [0, 3])
+        self.assertEqual(list(logs_container.get_time_range_positions(end="2024-01-01 11:00")), [0, 1])
+        # Positions are among visible rows
+        logs_container.visible_rows = [False, True, True, True]
+        self.assertEqual(list(logs_container.get_time_range_positions("2024-01-01 09:30")), [2])
+
+    def test_metadata_keeps_dtypes(self):
+        def get_container(messages, codes, colors, start=0):
+            index = range(start, start + len(messages))
+            logs_container = LogsContainer()
+            logs_container.set_data_column(Series(messages, index=index, dtype="string"), RColNameNS.Message)
+            MetadataColumn(Series(Categorical.from_codes(codes, categories=colors), index=index),
+                           name=RMetaNS.General.ForegroundColor, category=RMetaNS.General.name).process(logs_container)
+            MetadataColumn(Series(index, index=index, dtype="uint16"), name="Position", category="Test").process(logs_container)
+            MetadataColumn(Series(messages, index=index, dtype="string"), name="Text", category="Test").process(logs_container)
+            return logs_container
+        logs_container = get_container(['a', 'b'], [0, 1], ["red", "blue"])
+        columns = logs_container.metadata.columns
+        # Numbers and categories are not converted to Python objects
+        self.assertEqual(columns[(RMetaNS.General.name, RMetaNS.General.ForegroundColor)].values.dtype, "int8")
+        self.assertEqual(list(columns[(RMetaNS.General.name, RMetaNS.General.ForegroundColor)].categories), ["red", "blue"])
+        self.assertEqual(columns[("Test", "Position")].values.dtype, "uint16")
+        self.assertEqual(columns[("Test", "Text")].values.dtype, object)
+        # Appended rows with other categories get merged categories, missing keys are not present
+        other_container = get_container(['c', 'd'], [1, -1], ["red", "green"], start=2)
+        other_container.metadata.columns.pop(("Test", "Position"))
+        logs_container.append(other_container)
+        self.assertEqual(columns[(RMetaNS.General.name, RMetaNS.General.ForegroundColor)].values.dtype, "int8")
+        self.assertEqual(columns[("Test", "Position")].values.dtype, "uint16")
+        metadata = logs_container.get_metadata()
+        self.assertEqual([row.get(RMetaNS.General.name, {}).get(RMetaNS.General.ForegroundColor) for row in metadata],
+                         ["red", "blue", "green", None])
+        self.assertEqual([row["Test"].get("Position") for row in metadata], ["0", "1", None, None])
+        self.assertEqual([row["Test"]["Text"] for row in metadata], ['a', 'b', 'c', 'd'])
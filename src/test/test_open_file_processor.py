@@ -135,6 +135,111 @@ class TestOpenLogsProcessor(unittest.TestCase):
         finally:
             os.unlink(tmp_file_crlf.name)
 
+    def test_memory_mapped_reading_matches_line_reading(self):
+        tmp_file_mixed = tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix='.log')
+        tmp_file_mixed.write(b"Line 1\r\n\x00Line 2\rLine 3   \n\n\t\nLine 4")
+        tmp_file_mixed.close()
+        try:
+            results = []
+            for memory_mapped_reading in [True, False]:
+                results.append(LogsManager().simulate_rendered_data(
+                    self.processor.process(
+                        data=[self.tmp_file.name, tmp_file_mixed.name],
+                        keep_source_file_location_arg=KEEP_SOURCE_FILE_LOCATION_ENUM.FILE_ONLY,
+                        memory_mapped_reading_arg=memory_mapped_reading
+                    )
+                ))
+            assert_frame_equal(results[0], results[1])
+            # The last line is not finished yet (no newline), it is read as it is and replaced once finished
+            expected_df = DataFrame({
+                RColNameNS.File: 3 * [os.path.basename(self.tmp_file.name)] + 4 * [os.path.basename(tmp_file_mixed.name)],
+                RColNameNS.Message: ["Sample 1 abc", "Sample 2 def", "Sample 3 ghi", "Line 1", "Line 2", "Line 3", "Line 4"]
+            })
+            assert_frame_equal(results[0], expected_df, check_dtype=False)
+            with open(tmp_file_mixed.name, 'ab') as f:
+                f.write(b" finished\n")
+            appended_columns = self.processor.process_appended(start_index=7)
+            self.assertEqual(list(appended_columns[1].index), [6])
+            appended_df = LogsManager().simulate_rendered_data(appended_columns)
+            self.assertEqual(list(appended_df[RColNameNS.Message]), ["Line 4 finished"])
+        finally:
+            os.unlink(tmp_file_mixed.name)
+
+    def test_last_line_without_newline(self):
+        with open(self.tmp_file.name, 'w', encoding='utf-8', newline='') as f:
+            f.write("INFO a\nERROR b\nINFO c")
+        for memory_mapped_reading in [True, False]:
+            ret_columns = self.processor.process(
+                data=self.tmp_file.name,
+                keep_source_file_location_arg=KEEP_SOURCE_FILE_LOCATION_ENUM.NONE,
+                memory_mapped_reading_arg=memory_mapped_reading
+            )
+            self.assertEqual(list(ret_columns[0]), ["INFO a", "ERROR b", "INFO c"])
+        # Nothing more is read until the line is finished
+        self.assertIsNone(self.processor.process_appended(start_index=3))
+
+    def test_process_appended_lines(self):
+        ret_columns = self.processor.process(
+            data=self.tmp_file.name,
+            keep_source_file_location_arg=KEEP_SOURCE_FILE_LOCATION_ENUM.FILE_ONLY
+        )
+        self.assertFalse(self.processor.needs_reopen([self.tmp_file.name]))
+        # Nothing appended yet
+        self.assertIsNone(self.processor.process_appended(start_index=3))
+
+        # Incomplete last line is not read until it is finished
+        with open(self.tmp_file.name, 'a', encoding='utf-8', newline='') as f:
+            f.write("Sample 4 jkl\n\nSample 5 ")
+        ret_columns = self.processor.process_appended(start_index=3)
+        expected_cols = [(DataColumn, RColNameNS.File), (DataColumn, RColNameNS.Message), (MetadataColumn, RMetaNS.General.OriginalLogs)]
+        assert_columns_by_type(ret_columns, expected_cols)
+        self.assertEqual(list(ret_columns[1].index), [3])
+        self.assertEqual(list(ret_columns[1]), ["Sample 4 jkl"])
+        self.assertEqual(list(ret_columns[0]), [os.path.basename(self.tmp_file.name)])
+
+        with open(self.tmp_file.name, 'a', encoding='utf-8', newline='') as f:
+            f.write("mno\r\n")
+        ret_columns = self.processor.process_appended(start_index=4)
+        self.assertEqual(list(ret_columns[1].index), [4])
+        self.assertEqual(list(ret_columns[1]), ["Sample 5 mno"])
+        self.assertFalse(self.processor.needs_reopen([self.tmp_file.name]))
+
+    def test_needs_reopen(self):
+        self.processor.process(
+            data=self.tmp_file.name,
+            keep_source_file_location_arg=KEEP_SOURCE_FILE_LOCATION_ENUM.NONE
+        )
+        self.assertFalse(self.processor.needs_reopen([self.tmp_file.name]))
+        # Other files configured
+        self.assertTrue(self.processor.needs_reopen([self.tmp_file.name, self.tmp_file.name + ".1"]))
+        # Truncated file
+        with open(self.tmp_file.name, 'w', encoding='utf-8') as f:
+            f.write("New\n")
+        self.assertTrue(self.processor.needs_reopen([self.tmp_file.name]))
+
+    def test_index_original_logs(self):
+        with open(self.tmp_file.name, 'w', encoding='utf-8', newline='') as f:
+            f.write("Line 1  \r\n\n \x00\nLine\x00 2\rUnicode é中\n")
+        ret_columns = self.processor.process(
+            data=self.tmp_file.name,
+            keep_source_file_location_arg=KEEP_SOURCE_FILE_LOCATION_ENUM.NONE,
+            index_original_logs_arg=True
+        )
+        expected_cols = [(DataColumn, RColNameNS.Message), (MetadataColumn, RMetaNS.General.OriginalLogs)]
+        assert_columns_by_type(ret_columns, expected_cols)
+        self.assertEqual(list(ret_columns[0]), ["Line 1", "Line 2", "Unicode é中"])
+        # Only positions of lines are kept, lines are read from the file
+        self.assertEqual(list(ret_columns[1]), [0, 1, 2])
+        line_index = ret_columns[1].datatype_args["line_index"]
+        self.assertEqual([line_index.get_line(i) for i in range(3)], ["Line 1", "Line 2", "Unicode é中"])
+
+        with open(self.tmp_file.name, 'a', encoding='utf-8', newline='') as f:
+            f.write("Line 4\n")
+        ret_columns = self.processor.process_appended(start_index=3)
+        self.assertEqual(list(ret_columns[1].index), [3])
+        self.assertEqual(list(ret_columns[1]), [3])
+        self.assertEqual(line_index.get_line(3), "Line 4")
+
 
 # Run this command to start unittest
 # python -m unittest discover -s test
@@ -0,0 +1,122 @@
+import unittest
+
+import os
+import tempfile
+from unittest import mock
+from pandas import Series, to_datetime
+from pandas.testing import assert_series_equal
+
+from gui.common.metadata_elements import MetadataLogLine, MetadataIndexedLogLine
+from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
+from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
+from logs_managing.logs_column_types import DataColumn, MetadataColumn
+from logs_managing.parsed_logs_cache import ParsedLogsCache
+from util.line_index import LineIndex
+
+class TestParsedLogsCache(unittest.TestCase):
+    def setUp(self):
+        # An absolute directory is used as is, the cache of the user is never touched
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = ParsedLogsCache(1024 * 1024, dir=self.cache_dir.name)
+        self.tmp_file = tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.log')
+        self.tmp_file.write("INFO Line 1\nERROR Line 2\n")
+        self.tmp_file.close()
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+        os.unlink(self.tmp_file.name)
+
+    def get_columns(self):
+        message = Series(["Line 1", "Line 2"], name=RColNameNS.Message, dtype="string")
+        return [
+            DataColumn(Series(["INFO Line 1", "ERROR Line 2"], name=RColNameNS.Message, dtype="string")),
+            MetadataColumn(Series(["INFO Line 1", "ERROR Line 2"], dtype="string"),
+                           name=RMetaNS.General.OriginalLogs, category=RMetaNS.General.name, datatype=MetadataLogLine),
+            DataColumn(Series(["INFO", "ERROR"], name="Level", dtype="string")),
+            DataColumn(message),
+        ]
+
+    def test_store_and_load(self):
+        key = self.cache.get_key([self.tmp_file.name], {"process_logs": {"input_pattern": "<Level> "}})
+        self.assertIsNone(self.cache.load(key))
+        self.assertTrue(self.cache.store(key, self.get_columns()))
+        columns = self.cache.load(key)
+        # Only the last column of each name is kept, in the order of the last occurrence
+        self.assertEqual([(type(col), col.name) for col in columns], [
+            (MetadataColumn, RMetaNS.General.OriginalLogs),
+            (DataColumn, "Level"),
+            (DataColumn, RColNameNS.Message),
+        ])
+        self.assertEqual(columns[0].category, RMetaNS.General.name)
+        self.assertIs(columns[0].datatype, MetadataLogLine)
+        self.assertEqual(list(columns[0]), ["INFO Line 1", "ERROR Line 2"])
+        assert_series_equal(columns[2], self.get_columns()[3], check_series_type=False)
+
+    def test_store_and_load_line_index(self):
+        line_index = LineIndex()
+        line_index.append(self.tmp_file.name, [0, 12], [11, 12])
+        column = MetadataColumn(Series([0, 1]), name=RMetaNS.General.OriginalLogs, category=RMetaNS.General.name,
+                                datatype=MetadataIndexedLogLine, datatype_args={"line_index": line_index})
+        key = self.cache.get_key([self.tmp_file.name], {})
+        self.assertTrue(self.cache.store(key, [column]))
+        columns = self.cache.load(key)
+        self.assertIs(columns[0].datatype, MetadataIndexedLogLine)
+        self.assertEqual(list(columns[0]), [0, 1])
+        loaded_line_index = columns[0].datatype_args["line_index"]
+        self.assertEqual([loaded_line_index.get_line(i) for i in range(2)], ["INFO Line 1", "ERROR Line 2"])
+
+    def test_store_and_load_datetime(self):
+        column = MetadataColumn(to_datetime(Series(["2023-10-01 12:00:00", "not a timestamp"]), errors="coerce"),
+                                name=RMetaNS.General.ParsedTimestamp, category=RMetaNS.General.name)
+        key = self.cache.get_key([self.tmp_file.name], {})
+        self.assertTrue(self.cache.store(key, [column]))
+        columns = self.cache.load(key)
+        self.assertIsInstance(columns[0], MetadataColumn)
+        assert_series_equal(columns[0], column, check_series_type=False, check_index_type=False)
+
+    def test_store_and_load_compact_dtypes(self):
+        columns = [DataColumn(Series(["INFO", "ERROR", "INFO"], name="Level", dtype="category")),
+                   DataColumn(Series([1, 20, 300], name="Id"))]
+        key = self.cache.get_key([self.tmp_file.name], {})
+        self.assertTrue(self.cache.store(key, columns))
+        for loaded, column in zip(self.cache.load(key), columns):
+            self.assertEqual(str(loaded.dtype), str(column.dtype))
+            self.assertEqual(list(loaded), list(column))
+
+    def test_key_changes(self):
+        key = self.cache.get_key([self.tmp_file.name], {"process_logs": {"input_pattern": ""}})
+        self.assertEqual(key, self.cache.get_key([self.tmp_file.name], {"process_logs": {"input_pattern": ""}}))
+        self.assertNotEqual(key, self.cache.get_key([self.tmp_file.name], {"process_logs": {"input_pattern": "<Level> "}}))
+        with open(self.tmp_file.name, 'a') as f:
+            f.write("INFO Line 3\n")
+        self.assertNotEqual(key, self.cache.get_key([self.tmp_file.name], {"process_logs": {"input_pattern": ""}}))
+        self.assertIsNone(self.cache.get_key([self.tmp_file.name + ".missing"], {}))
+
+    def test_values_with_newlines_are_not_stored(self):
+        key = self.cache.get_key([self.tmp_file.name], {})
+        column = DataColumn(Series(["Line\n1", "Line 2"], name=RColNameNS.Message, dtype="string"))
+        self.assertFalse(self.cache.store(key, [column]))
+        self.assertIsNone(self.cache.load(key))
+
+    def test_failed_store_leaves_no_files(self):
+        key = self.cache.get_key([self.tmp_file.name], {})
+        with mock.patch("logs_managing.parsed_logs_cache.numpy.savez", side_effect=OSError("No space left on device")):
+            with self.assertRaises(OSError):
+                self.cache.store(key, self.get_columns())
+        self.assertEqual(os.listdir(self.cache.dir), [])
+        self.assertIsNone(self.cache.load(key))
+
+    def test_least_recently_used_eviction(self):
+        keys = [self.cache.get_key([self.tmp_file.name], {"n": i}) for i in range(3)]
+        self.cache.store(keys[0], self.get_columns())
+        entry_size = os.path.getsize(self.cache.get_file_path(keys[0]))
+        self.cache.max_size_bytes = entry_size * 2
+        os.utime(self.cache.get_file_path(keys[0]), (0, 0))
+        self.cache.store(keys[1], self.get_columns())
+        os.utime(self.cache.get_file_path(keys[1]), (1, 1))
+        # Loading marks the first entry as recently used, so the second one is evicted
+        self.assertIsNotNone(self.cache.load(keys[0]))
+        self.cache.store(keys[2], self.get_columns())
+        self.assertTrue(os.path.exists(self.cache.get_file_path(keys[0])))
+        self.assertFalse(os.path.exists(self.cache.get_file_path(keys[1])))
+        self.assertTrue(os.path.exists(self.cache.get_file_path(keys[2])))
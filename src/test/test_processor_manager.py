@@ -0,0 +1,260 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy
+from pandas import DataFrame
+
+from init import register_config_stores
+from util.config_store import ConfigManager as CfgMan
+from processor.processor_manager import ProcessorManager
+from processor.run_scheduler import RunToken, RunCancelledError
+from logs_managing.logs_manager import LogsManager
+from logs_managing.parsed_logs_cache import ParsedLogsCache
+from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
+
+# Config stores changed by the tests, restored after every test
+CHANGED_CONFIG_STORES = ["open_logs", "process_logs", "color_logs", "filter_logs", "parsed_logs_cache", "streaming", "sharded_processing"]
+
+class TestProcessorManager(unittest.TestCase):
+    def setUp(self):
+        register_config_stores()
+        self.manager = ProcessorManager()
+        self.manager.reset_stage_snapshots()
+        self.original_configs = {store: CfgMan().get(store).get_serialized() for store in CHANGED_CONFIG_STORES}
+        self.tmp_file = tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.log', encoding='utf-8')
+        self.tmp_file.write("INFO Line 1\nERROR Line 2\n")
+        self.tmp_file.close()
+        CfgMan().set(CfgMan().r.parsed_logs_cache.enabled, False)
+        CfgMan().set(CfgMan().r.open_logs.log_files, [self.tmp_file.name])
+        CfgMan().set(CfgMan().r.process_logs.input_pattern, "<Level> <Message>")
+        # Count how many times every processor runs
+        self.process_calls = {}
+        self.original_process = {}
+        for processor in self.manager.get_processors():
+            self.original_process[processor] = processor.process
+            processor.process = self.get_counted_process(processor)
+
+    def tearDown(self):
+        for processor, process in self.original_process.items():
+            processor.process = process
+        self.manager.reset_stage_snapshots()
+        for store, configs in self.original_configs.items():
+            for name, value in configs.items():
+                CfgMan().set(f"{store}.{name}", value)
+        os.unlink(self.tmp_file.name)
+
+    def get_counted_process(self, processor):
+        def process(*args, **kwargs):
+            name = processor.__class__.__name__
+            self.process_calls[name] = self.process_calls.get(name, 0) + 1
+            return self.original_process[processor](*args, **kwargs)
+        return process
+
+    def test_only_changed_stages_run_again(self):
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.object(self.manager, "get_parsed_logs_cache", return_value=ParsedLogsCache(1024 * 1024, dir=cache_dir)):
+            self.manager.run()
+            expected_data = LogsManager().get_data().copy()
+            self.assertEqual(list(expected_data["Level"]), ["INFO", "ERROR"])
+            self.assertEqual(set(self.process_calls.values()), {1})
+            # Outputs of opening and splitting logs are not kept, they are in the parsed logs cache
+            self.assertEqual([stage_snapshot.columns is None for stage_snapshot in self.manager.stage_snapshots],
+                             [True, True, False, False])
+
+            # Nothing changed, all outputs are reused
+            self.manager.run()
+            self.assertEqual(set(self.process_calls.values()), {1})
+            self.assertTrue(LogsManager().get_data().equals(expected_data))
+
+            # Changing coloring runs coloring and everything after it
+            CfgMan().set(CfgMan().r.color_logs.color_logs_enabled, False)
+            try:
+                self.manager.run()
+            finally:
+                CfgMan().set(CfgMan().r.color_logs.color_logs_enabled, self.original_configs["color_logs"]["color_logs_enabled"])
+        self.assertEqual(self.process_calls["OpenLogsProcessor"], 1)
+        self.assertEqual(self.process_calls["SplitLogLinesProcessor"], 1)
+        self.assertEqual(self.process_calls["ColorLogsProcessor"], 2)
+        self.assertEqual(self.process_calls["FilterLogsProcessor"], 2)
+        self.assertEqual(list(LogsManager().get_data()["Level"]), ["INFO", "ERROR"])
+
+        # Without the parsed logs cache, logs are opened and split again
+        self.manager.run()
+        self.assertEqual(set(self.process_calls.values()), {2, 3})
+        self.assertEqual(self.process_calls["OpenLogsProcessor"], 2)
+        self.assertTrue(LogsManager().get_data().equals(expected_data))
+
+    def test_changed_file_runs_all_stages(self):
+        self.manager.run()
+        with open(self.tmp_file.name, 'a', encoding='utf-8') as f:
+            f.write("WARNING Line 3\n")
+        self.manager.run()
+        self.assertEqual(set(self.process_calls.values()), {2})
+        self.assertEqual(list(LogsManager().get_data()["Level"]), ["INFO", "ERROR", "WARNING"])
+
+    def test_independent_processors_are_batched(self):
+        # Coloring and filtering both read split data and do not read each other's columns
+        self.assertEqual(self.manager.get_stage_batches(), [[0], [1], [2, 3]])
+        self.assertEqual(self.manager.get_stage_batches(3), [[3]])
+
+    def test_concurrent_run_matches_sequential_run(self):
+        CfgMan().set(CfgMan().r.color_logs.color_scheme, [["Level", "ERROR", "#FF0000", ""]])
+        CfgMan().set(CfgMan().r.filter_logs.filter_pattern, [["Level", "ERROR"]])
+        # Coloring and filtering run concurrently in a process pool
+        CfgMan().set(CfgMan().r.sharded_processing.workers, 2)
+        CfgMan().set(CfgMan().r.sharded_processing.min_rows_per_shard, 2)
+        self.assertTrue(self.manager.is_concurrent(self.manager.get_processors()[2:], DataFrame({"Level": ["INFO", "ERROR"]})))
+        self.manager.run()
+        concurrent_data = LogsManager().get_data().copy()
+        concurrent_style = LogsManager().get_style()
+        self.manager.reset_stage_snapshots()
+        self.manager.get_stage_batches = lambda first_stage=0: [[stage] for stage in range(first_stage, 4)]
+        try:
+            self.manager.run()
+        finally:
+            del self.manager.get_stage_batches
+        self.assertTrue(LogsManager().get_data().equals(concurrent_data))
+        sequential_style = LogsManager().get_style()
+        self.assertEqual([sequential_style.get_foreground(i) for i in range(len(sequential_style))],
+                         [concurrent_style.get_foreground(i) for i in range(len(concurrent_style))])
+        self.assertEqual(list(concurrent_data[RColNameNS.Message]), ["<Filtered 1 row(s)>", "Line"])
+
+    def test_run_reports_progress_and_stops_when_cancelled(self):
+        progress = []
+        self.manager.run(RunToken(on_progress=lambda text, done, total: progress.append((text, done, total))))
+        self.assertIn(("OpenLogsProcessor", 1, 1), progress)
+        self.assertEqual(progress[-1][1:], (4, 4))
+
+        def cancel_after_split(text, done, total):
+            if done >= 2:
+                run_token.cancel()
+        run_token = RunToken(on_progress=cancel_after_split)
+        self.manager.reset_stage_snapshots()
+        with self.assertRaises(RunCancelledError):
+            self.manager.run(run_token)
+        self.assertEqual(LogsManager().get_rows_count(), 0)
+        self.assertEqual(self.process_calls["ColorLogsProcessor"], 1)
+        self.assertIsNone(self.manager.get_processors()[0].run_token)
+
+    def test_streaming_matches_full_run(self):
+        with open(self.tmp_file.name, 'w', encoding='utf-8') as f:
+            for i in range(3000):
+                f.write(f"{'ERROR' if i % 97 in (0, 1) or i % 11 == 0 or 1000 <= i < 1300 else 'INFO'} Line {i}\n")
+        CfgMan().set(CfgMan().r.filter_logs.filter_pattern, [["Level", "ERROR"]])
+        CfgMan().set(CfgMan().r.filter_logs.contextualize_lines, "Lines before and after")
+        CfgMan().set(CfgMan().r.filter_logs.contextualize_lines_count, 3)
+        CfgMan().set(CfgMan().r.color_logs.color_scheme, [["Level", "ERROR", "#FF0000", ""]])
+        self.manager.run()
+        expected_data = LogsManager().get_data(show_collapsed=True).copy()
+        expected_visible = LogsManager().get_data(show_collapsed=False).copy()
+        expected_style = LogsManager().get_style(show_collapsed=False)
+        CfgMan().set(CfgMan().r.streaming.enabled, True)
+        CfgMan().set(CfgMan().r.streaming.first_chunk_kb, 1)
+        CfgMan().set(CfgMan().r.streaming.max_chunk_mb, 1)
+        chunks = []
+        self.manager.reset_stage_snapshots()
+        self.manager.run(on_chunk=lambda logs_container, first_chunk: chunks.append((len(logs_container.data), first_chunk)))
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual([first_chunk for _, first_chunk in chunks], [True] + [False] * (len(chunks) - 1))
+        self.assertEqual(sum(rows for rows, _ in chunks), 3000)
+        # Some chunk ends right after a match, its context lines are in the next chunk
+        matches = {i for i in range(3000) if i % 97 in (0, 1) or i % 11 == 0 or 1000 <= i < 1300}
+        chunk_ends = numpy.cumsum([rows for rows, _ in chunks])[:-1]
+        self.assertTrue(any(matches & {end - 1, end - 2, end - 3} for end in chunk_ends))
+        self.assertTrue(LogsManager().get_data(show_collapsed=True).equals(expected_data))
+        self.assertTrue(LogsManager().get_data(show_collapsed=False).equals(expected_visible))
+        style = LogsManager().get_style(show_collapsed=False)
+        self.assertEqual([style.get_foreground(i) for i in range(len(style))],
+                         [expected_style.get_foreground(i) for i in range(len(expected_style))])
+        # Following continues after the streamed rows
+        with open(self.tmp_file.name, 'a', encoding='utf-8') as f:
+            f.write("ERROR Line 3000\n")
+        self.assertEqual(self.manager.follow(), 1)
+
+    def test_follow_matches_full_run(self):
+        def write_lines(levels, mode):
+            with open(self.tmp_file.name, mode, encoding='utf-8') as f:
+                for level in levels:
+                    f.write(f"{level} Line\n")
+        def get_full_run_data():
+            self.manager.reset_stage_snapshots()
+            self.manager.run()
+            return LogsManager().get_data(show_collapsed=True).copy()
+        def follow():
+            appended = []
+            self.manager.follow(on_appended=lambda logs_container, removed_rows: appended.append((logs_container, removed_rows)))
+            for logs_container, removed_rows in appended:
+                del shown_messages[len(shown_messages) - removed_rows:]
+                shown_messages.extend(logs_container.get_data(show_collapsed=True)[RColNameNS.Message])
+
+        CfgMan().set(CfgMan().r.filter_logs.filter_pattern, [["Level", "ERROR"]])
+        CfgMan().set(CfgMan().r.filter_logs.contextualize_lines, "Lines before and after")
+        CfgMan().set(CfgMan().r.filter_logs.contextualize_lines_count, 2)
+        # A match right before the appended lines shows them as its context
+        write_lines(["INFO"] * 10 + ["ERROR"], 'w')
+        get_full_run_data()
+        shown_messages = list(LogsManager().get_data(show_collapsed=True)[RColNameNS.Message])
+        for levels in (["INFO"] * 4, ["INFO"] * 3, ["ERROR", "INFO"]):
+            write_lines(levels, 'a')
+            follow()
+            followed_data = LogsManager().get_data(show_collapsed=True).copy()
+            self.assertEqual(shown_messages, list(followed_data[RColNameNS.Message]))
+            self.assertTrue(followed_data.equals(get_full_run_data()))
+        # The group of filtered rows between matches continued over follow ticks
+        self.assertEqual(list(followed_data[RColNameNS.Message]),
+                         ["<Filtered 8 row(s)>"] + ["Line"] * 5 + ["<Filtered 3 row(s)>"] + ["Line"] * 4)
+
+    def test_follow_replaces_unfinished_last_line(self):
+        for streaming in [False, True]:
+            with open(self.tmp_file.name, 'w', encoding='utf-8') as f:
+                f.write("INFO a\nERROR b\nINFO c")
+            CfgMan().set(CfgMan().r.streaming.enabled, streaming)
+            self.manager.reset_stage_snapshots()
+            self.manager.run()
+            # The last line is read, even though it is not finished yet
+            self.assertEqual(list(LogsManager().get_data()[RColNameNS.Message]), ["a", "b", "c"])
+            with open(self.tmp_file.name, 'a', encoding='utf-8') as f:
+                f.write("d\nINFO e\n")
+            appended = []
+            self.assertEqual(self.manager.follow(on_appended=lambda logs_container, removed_rows: appended.append(removed_rows)), 1)
+            self.assertEqual(appended, [1])
+            self.assertEqual(list(LogsManager().get_data()[RColNameNS.Message]), ["a", "b", "cd", "e"])
+
+    def test_inferred_dtypes_with_sharding_and_streaming(self):
+        with open(self.tmp_file.name, 'w', encoding='utf-8') as f:
+            for i in range(3000):
+                # ERROR only shows up in the last blocks, so earlier blocks have other categories
+                f.write(f"{['INFO', 'WARN'][i % 2] if i < 2500 else 'ERROR'} {i} Line\n")
+        CfgMan().set(CfgMan().r.process_logs.input_pattern, "<Level> <Id> <Message>")
+        CfgMan().set(CfgMan().r.process_logs.infer_column_types, True)
+        results = []
+        for streaming, workers in [(False, 1), (True, 1), (False, 2)]:
+            CfgMan().set(CfgMan().r.streaming.enabled, streaming)
+            CfgMan().set(CfgMan().r.streaming.first_chunk_kb, 1)
+            CfgMan().set(CfgMan().r.sharded_processing.workers, workers)
+            CfgMan().set(CfgMan().r.sharded_processing.min_rows_per_shard, 500)
+            self.manager.reset_stage_snapshots()
+            self.manager.run()
+            results.append(LogsManager().get_data(show_collapsed=False).copy())
+        # Blocks of rows processed separately get the same compact dtypes as all rows processed at once
+        self.assertEqual(results[0]["Level"].dtype, "category")
+        self.assertEqual(results[0]["Id"].dtype, "int64")
+        for result in results[1:]:
+            self.assertEqual(dict(result.dtypes), dict(results[0].dtypes))
+            self.assertTrue(result.equals(results[0]))
+
+    def test_preview_reads_only_first_lines(self):
+        self.manager.run()
+        with open(self.tmp_file.name, 'w', encoding='utf-8') as f:
+            for i in range(1000):
+                f.write(f"{'ERROR' if i % 100 == 99 else 'INFO'} Line {i}\n")
+        CfgMan().set(CfgMan().r.filter_logs.filter_pattern, [["Level", "ERROR"]])
+        preview_container = self.manager.preview(4)
+        # Filtered rows are shown as one, so more lines than shown rows were read
+        shown_data = preview_container.get_data(4, show_collapsed=True)
+        self.assertEqual(list(shown_data[RColNameNS.Message]), ["<Filtered 99 row(s)>", "Line", "<Filtered 99 row(s)>", "Line"])
+        self.assertLess(len(preview_container.data), 1000)
+        # Logs of the session are not changed
+        self.assertEqual(LogsManager().get_rows_count(), 2)
+        self.assertEqual(list(LogsManager().get_data()["Level"]), ["INFO", "ERROR"])
@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+
+from processor.run_scheduler import RunScheduler, RunCancelledError, RunToken
+
+class TestRunScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = RunScheduler()
+        self.running = 0
+        self.max_running = 0
+        self.finished = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.assertTrue(self.scheduler.wait(5))
+
+    def get_cmd(self, name, steps=20):
+        def cmd(run_token: RunToken):
+            with self.lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                for step in range(steps):
+                    run_token.report_progress(name, step, steps)
+                    time.sleep(0.005)
+                self.finished.append(name)
+            finally:
+                with self.lock:
+                    self.running -= 1
+        return cmd
+
+    def test_superseded_run_is_cancelled(self):
+        done = []
+        started = threading.Event()
+        def first(run_token):
+            started.set()
+            self.get_cmd("first", steps=200)(run_token)
+        first_token = self.scheduler.submit(first, on_done=lambda: done.append("first"))
+        started.wait(5)
+        self.scheduler.submit(self.get_cmd("second"), on_done=lambda: done.append("second"))
+        self.assertTrue(self.scheduler.wait(5))
+        self.assertTrue(first_token.is_cancelled())
+        self.assertEqual(self.finished, ["second"])
+        # Callbacks of the cancelled run are called once the run superseding it finishes
+        self.assertEqual(done, ["first", "second"])
+
+    def test_pending_runs_are_coalesced(self):
+        done = []
+        blocker = threading.Event()
+        self.scheduler.submit(lambda run_token: blocker.wait(5), key="follow")
+        for name in ("a", "b", "c"):
+            self.scheduler.submit(self.get_cmd(name), on_done=lambda name=name: done.append(name))
+        blocker.set()
+        self.assertTrue(self.scheduler.wait(5))
+        self.assertEqual(self.finished, ["c"])
+        self.assertEqual(done, ["a", "b", "c"])
+
+    def test_runs_of_different_keys_do_not_overlap(self):
+        progress = []
+        self.scheduler.submit(self.get_cmd("run"), on_progress=lambda text, done, total: progress.append((text, done, total)))
+        self.scheduler.submit(self.get_cmd("follow"), key="follow")
+        self.assertTrue(self.scheduler.wait(5))
+        self.assertEqual(self.finished, ["run", "follow"])
+        self.assertEqual(self.max_running, 1)
+        self.assertEqual(progress[0], ("run", 0, 20))
+        self.assertEqual(progress[-1], ("run", 19, 20))
+
+    def test_cancelled_token_raises(self):
+        run_token = RunToken()
+        run_token.report_progress("test", 0, 1)
+        run_token.cancel()
+        with self.assertRaises(RunCancelledError):
+            run_token.report_progress("test", 1, 1)
@@ -0,0 +1,88 @@
+import os
+import time
+import unittest
+
+from pandas import DataFrame, RangeIndex
+from pandas.testing import assert_series_equal
+
+from util.config_enums import CONTEXTUALIZE_LINES_ENUM
+from processor.color_logs_processor import ColorLogsProcessor
+from processor.filter_logs_processor import FilterLogsProcessor
+from processor.split_log_lines_processor import SplitLogLinesProcessor
+from processor.sharded_execution import get_shard_bounds, process_sharded, process_sharded_batch
+from logs_managing.logs_column_types import CaptureMessageColumn
+from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
+
+class ContextFilterProcessor(FilterLogsProcessor):
+    def get_shard_args(self) -> dict:
+        return {
+            "filter_pattern_arg": [["", "ERROR"]],
+            "contextualize_lines_count_arg": 2,
+            "contextualize_lines_type_arg": CONTEXTUALIZE_LINES_ENUM.LINES_BEFORE_AND_AFTER,
+        }
+
+class PatternSplitProcessor(SplitLogLinesProcessor):
+    def get_shard_args(self) -> dict:
+        return {"pattern_format_arg": "<Level> <Thread>", "timestamp_format_arg": ""}
+
+class RequestColorProcessor(ColorLogsProcessor):
+    ''' Colors rows by digits of request IDs (one rule per digit, every rule scans all rows). '''
+    pattern = r"req-\d*{digit}\d* "
+
+    def get_shard_args(self) -> dict:
+        return {"color_scheme_arg": [[RColNameNS.Message, self.pattern.format(digit=digit), "#FF0000", ""] for digit in range(10)]}
+
+class NumberColorProcessor(RequestColorProcessor):
+    pattern = r"message \d*{digit}\d*$"
+
+class TestShardedExecution(unittest.TestCase):
+    def setUp(self):
+        # Errors close to block boundaries (blocks of 10 rows), so their context lines are in neighbouring blocks
+        levels = ["ERROR" if i in (9, 21, 39) else "INFO" for i in range(40)]
+        self.data = DataFrame({RColNameNS.Message: [f"{level} t{i} message {i}" for i, level in enumerate(levels)]},
+                              index=RangeIndex(100, 140), dtype="string")
+
+    def assert_same_columns(self, sharded_columns, columns):
+        self.assertEqual([(type(col), col.name) for col in sharded_columns], [(type(col), col.name) for col in columns])
+        for sharded_column, column in zip(sharded_columns, columns):
+            assert_series_equal(sharded_column, column, check_series_type=False, check_dtype=False)
+
+    def test_shard_bounds(self):
+        self.assertEqual(get_shard_bounds(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(get_shard_bounds(2, 5), [(0, 1), (1, 2)])
+
+    def test_filter_context_across_blocks(self):
+        processor = ContextFilterProcessor()
+        columns = processor.process(self.data, **processor.get_shard_args())
+        sharded_columns = process_sharded(processor, self.data, workers=4, min_rows_per_shard=10)
+        self.assertIsInstance(sharded_columns[0], CaptureMessageColumn)
+        self.assertEqual(sharded_columns[0].replace, columns[0].replace)
+        self.assert_same_columns(sharded_columns, columns)
+        # Context of the error at the end of the first block reaches into the second one
+        self.assertEqual(sharded_columns[0].notna().to_numpy().nonzero()[0].tolist(),
+                         [7, 8, 9, 10, 11, 19, 20, 21, 22, 23, 37, 38, 39])
+
+    def test_split_blocks(self):
+        processor = PatternSplitProcessor()
+        columns = processor.process(self.data, **processor.get_shard_args())
+        self.assert_same_columns(process_sharded(processor, self.data, workers=3, min_rows_per_shard=10), columns)
+
+    def test_batch_matches_processors_run_alone(self):
+        processors = [ContextFilterProcessor(), PatternSplitProcessor()]
+        batch_columns = process_sharded_batch(processors, self.data, workers=3, min_rows_per_shard=10)
+        for processor, columns in zip(processors, batch_columns):
+            self.assert_same_columns(columns, processor.process(self.data, **processor.get_shard_args()))
+
+    @unittest.skipIf((os.cpu_count() or 1) < 2, "Processors run concurrently only with more than one CPU core.")
+    def test_batch_runs_faster_than_processors_one_after_another(self):
+        data = DataFrame({RColNameNS.Message: [f"INFO req-{i} message {i * 7}" for i in range(200000)]}, dtype="string")
+        processors = [RequestColorProcessor(), NumberColorProcessor()]
+        start_time = time.perf_counter()
+        for processor in processors:
+            processor.process(data, **processor.get_shard_args())
+        sequential_time = time.perf_counter() - start_time
+        # A single block per processor, so only running processors concurrently makes a difference
+        start_time = time.perf_counter()
+        process_sharded_batch(processors, data, workers=2, min_rows_per_shard=len(data))
+        concurrent_time = time.perf_counter() - start_time
+        self.assertLess(concurrent_time, 0.8 * sequential_time)
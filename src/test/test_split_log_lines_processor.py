@@ -5,10 +5,11 @@ from enum import Enum
 from pandas import DataFrame
 from pandas.testing import assert_frame_equal
 
-from processor.split_log_lines_processor import SplitLogLinesProcessor
+from processor.split_log_lines_processor import SplitLogLinesProcessor, get_split_engine
 from logs_managing.logs_manager import LogsManager
-from logs_managing.logs_column_types import DataColumn
+from logs_managing.logs_column_types import DataColumn, MetadataColumn
 from logs_managing.reserved_names import RESERVED_COLUMN_NAMES as RColNameNS
+from logs_managing.reserved_names import RESERVED_METADATA_NAMES as RMetaNS
 
 from util.test_util import assert_columns_by_type
 
@@ -86,4 +87,54 @@ class TestSplitLogLinesProcessor(unittest.TestCase):
             'From': ["1", "2", "3"],
             RColNameNS.Message: ["abc", "def", "ghi"]
         })
-        assert_frame_equal(result_df, expected_df, check_dtype=False)
\ No newline at end of file
+        assert_frame_equal(result_df, expected_df, check_dtype=False)
+
+    def test_matched_part_removed_only_at_start(self):
+        input_df = DataFrame({RColNameNS.Message: ["INFO t1  first message", "garbage", "[x] WARN t2 second", ""]}, dtype="string")
+        get_split_engine.cache_clear()
+        for _ in range(2):
+            ret_columns = self.processor.process(
+                input_df.copy(),
+                pattern_format_arg="<Level> <Thread>",
+                timestamp_format_arg=""
+            )
+        # Pattern is compiled only once
+        self.assertEqual(get_split_engine.cache_info().misses, 1)
+        result_df = LogsManager().simulate_rendered_data(ret_columns)
+        expected_df = DataFrame({
+            'Level': ["INFO", "", "WARN", ""],
+            'Thread': ["t1", "", "t2", ""],
+            RColNameNS.Message: ["first message", "garbage", "[x] WARN t2 second", ""]
+        })
+        assert_frame_equal(result_df, expected_df, check_dtype=False)
+
+    def test_parsed_timestamp(self):
+        input_df = DataFrame({RColNameNS.Message: ["2023-10-01 12:00:00 INFO a", "2023-10-01 12:00:00 INFO b", "2023-13-01 12:00:00 INFO c", "garbage"]}, dtype="string")
+        ret_columns = self.processor.process(
+            input_df.copy(),
+            pattern_format_arg="<Year>-<Month>-<Day> <Hour>:<Minutes>:<Seconds> <Level>",
+            timestamp_format_arg="<Year>-<Month>-<Day> <Hour>:<Minutes>:<Seconds>",
+            timestamp_parse_format_arg="%Y-%m-%d %H:%M:%S"
+        )
+        expected_columns = [(DataColumn, RColNameNS.Timestamp), (DataColumn, 'Level'), (DataColumn, RColNameNS.Message),
+                            (MetadataColumn, RMetaNS.General.ParsedTimestamp)]
+        assert_columns_by_type(ret_columns, expected_columns)
+        self.assertEqual(list(ret_columns[0]), ["2023-10-01 12:00:00", "2023-10-01 12:00:00", "2023-13-01 12:00:00", ""])
+        # Timestamps not matching the parse format are NaT
+        parsed = ret_columns[-1]
+        self.assertEqual(str(parsed.dtype), "datetime64[ns]")
+        self.assertEqual(list(parsed.isna()), [False, False, True, True])
+        self.assertEqual(parsed.iloc[0].value, 1696161600 * 10**9)
+
+    def test_infer_column_types(self):
+        input_df = DataFrame({RColNameNS.Message: [f"{'ERROR' if i % 5 == 0 else 'INFO'} {i} 0{i % 3} line {i}" for i in range(40)]}, dtype="string")
+        ret_columns = self.processor.process(
+            input_df.copy(),
+            pattern_format_arg="<Level> <Id> <Code>",
+            timestamp_format_arg="",
+            infer_column_types_arg=True
+        )
+        # Few distinct levels are categories, ids are integers, codes with leading zeros stay text
+        self.assertEqual([str(column.dtype) for column in ret_columns], ["category", "int64", "category", "string"])
+        result_df = LogsManager().simulate_rendered_data(ret_columns)
+        self.assertEqual(result_df.iloc[5].astype(str).tolist(), ["ERROR", "5", "02", "line 5"])
@@ -0,0 +1,35 @@
+import numpy
+
+class GrowableArray:
+    ''' 1-D array that rows are appended to (e.g. lines of followed files) in amortized O(appended rows).
+        Values are kept in a buffer whose capacity doubles whenever it is full, the array is a view of its used part.
+    '''
+    def __init__(self, values):
+        self.__buffer = numpy.asarray(values)
+        self.__length = len(self.__buffer)
+        # The initial buffer may be shared with the caller, it is never written to
+        self.__owned = False
+
+    def __len__(self) -> int:
+        return self.__length
+
+    @property
+    def values(self) -> numpy.ndarray:
+        return self.__buffer[:self.__length]
+
+    def extend(self, values):
+        ''' Append values after the existing ones (converted to the dtype of the array). '''
+        end = self.__length + len(values)
+        if end > len(self.__buffer) or not self.__owned:
+            buffer = numpy.empty(max(end, 2 * len(self.__buffer)), dtype=self.__buffer.dtype)
+            buffer[:self.__length] = self.values
+            self.__buffer = buffer
+            self.__owned = True
+        self.__buffer[self.__length:end] = values
+        self.__length = end
+        return self
+
+    def truncate(self, length:int):
+        ''' Keep only the first length values (the capacity is kept for values appended later). '''
+        self.__length = max(min(length, self.__length), 0)
+        return self
@@ -0,0 +1,82 @@
+import mmap
+
+import numpy
+
+from util.log_file_reader import normalize_log_line
+from util.growable_array import GrowableArray
+
+class LineIndex:
+    ''' Location of every log line in its file: (file id, byte offset, byte length) per line,
+        kept in compact numpy arrays instead of the line text.
+        Lines are read back lazily from memory-mapped files, only when needed.
+        Arrays grow in place, so locations of lines appended in follow mode are added without copying existing ones.
+    '''
+    def __init__(self):
+        self.file_paths:list[str] = []
+        self.file_ids = numpy.empty(0, dtype=numpy.uint16)
+        self.offsets = numpy.empty(0, dtype=numpy.int64)
+        self.lengths = numpy.empty(0, dtype=numpy.uint32)
+        self.__mmaps:dict[int, mmap.mmap] = {}
+
+    @property
+    def file_ids(self) -> numpy.ndarray:
+        return self.__file_ids.values
+
+    @file_ids.setter
+    def file_ids(self, file_ids:numpy.ndarray):
+        self.__file_ids = GrowableArray(numpy.asarray(file_ids, dtype=numpy.uint16))
+
+    @property
+    def offsets(self) -> numpy.ndarray:
+        return self.__offsets.values
+
+    @offsets.setter
+    def offsets(self, offsets:numpy.ndarray):
+        self.__offsets = GrowableArray(numpy.asarray(offsets, dtype=numpy.int64))
+
+    @property
+    def lengths(self) -> numpy.ndarray:
+        return self.__lengths.values
+
+    @lengths.setter
+    def lengths(self, lengths:numpy.ndarray):
+        self.__lengths = GrowableArray(numpy.asarray(lengths, dtype=numpy.uint32))
+
+    def __len__(self) -> int:
+        return len(self.__offsets)
+
+    def get_file_id(self, file_path:str) -> int:
+        if file_path not in self.file_paths:
+            if len(self.file_paths) > numpy.iinfo(self.file_ids.dtype).max:
+                raise ValueError(f"Too many files in line index: {len(self.file_paths)}")
+            self.file_paths.append(file_path)
+        return self.file_paths.index(file_path)
+
+    def append(self, file_path:str, offsets:numpy.ndarray, lengths:numpy.ndarray):
+        ''' Append locations of lines of a file (positions continue from the current length). '''
+        if len(offsets) != len(lengths):
+            raise ValueError("Offsets and lengths must have the same length.")
+        file_id = self.get_file_id(file_path)
+        self.__file_ids.extend(numpy.full(len(offsets), file_id, dtype=self.file_ids.dtype))
+        self.__offsets.extend(numpy.asarray(offsets, dtype=self.offsets.dtype))
+        self.__lengths.extend(numpy.asarray(lengths, dtype=self.lengths.dtype))
+
+    def get_line(self, position:int) -> str:
+        ''' Read the line at a position from its file. '''
+        file_id = int(self.file_ids[position])
+        begin = int(self.offsets[position])
+        end = begin + int(self.lengths[position])
+        mm = self.__mmaps.get(file_id)
+        if mm is None or len(mm) < end:
+            # Map the file (again, if it grew since it was mapped)
+            if mm is not None:
+                mm.close()
+            with open(self.file_paths[file_id], 'rb') as file:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__mmaps[file_id] = mm
+        return normalize_log_line(mm[begin:end])
+
+    def close(self):
+        for mm in self.__mmaps.values():
+            mm.close()
+        self.__mmaps = {}
@@ -0,0 +1,295 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+import numpy
+
+READ_CHUNK_SIZE = 64 * 1024 * 1024
+''' Size of a byte chunk that is decoded and split at once. '''
+
+COMPRESSED_FILE_OPENERS = {
+    re.compile(rb'\x1f\x8b'): gzip.open,
+    # Block size digit, followed by the magic of the first block (or of the end of an empty stream)
+    re.compile(rb'BZh[1-9](?:1AY&SY|\x17rE8P\x90)'): bz2.open,
+    re.compile(rb'\xfd7zXZ\x00'): lzma.open,
+}
+''' Openers of compressed files, keyed by the file signature (regex of magic bytes at the start of the file). '''
+
+COMPRESSED_SIGNATURE_SIZE = 10
+''' Number of bytes at the start of a file its signature is matched in. '''
+
+PARALLEL_READING_MIN_BYTES = 32 * 1024 * 1024
+''' Total size of files below which they are read in this process, starting worker processes would take longer. '''
+
+# Trailing whitespace of every line, matched for the whole text at once
+_TRAILING_WHITESPACE = re.compile(r'[^\S\n]+$', re.MULTILINE)
+# Bytes that alone do not make a line non-empty (stripped whitespace and null)
+_BLANK_BYTES = numpy.zeros(256, dtype=bool)
+_BLANK_BYTES[[0x00, 0x09, 0x0B, 0x0C, 0x1C, 0x1D, 0x1E, 0x1F, 0x20]] = True
+
+def split_log_text(text: str) -> list[str]:
+    ''' Split decoded text into log lines, the same way as reading the file line by line.
+        Line endings (\\n, \\r\\n, \\r) are normalized, null bytes removed,
+        trailing whitespace stripped and empty lines skipped - all over the whole text at once.
+    '''
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if '\x00' in text:
+        text = text.replace('\x00', '')
+    text = _TRAILING_WHITESPACE.sub('', text)
+    return list(filter(None, text.split('\n')))
+
+def get_compressed_file_opener(file_path: str) -> Callable|None:
+    ''' Get the opener of a compressed file (gzip, bz2, xz) by its signature, None for plain files.
+        Plain text can start like a signature (e.g. "BZh..."), so a file is compressed only if its first block decompresses.
+    '''
+    with open(file_path, 'rb') as file:
+        signature = file.read(COMPRESSED_SIGNATURE_SIZE)
+    for magic, opener in COMPRESSED_FILE_OPENERS.items():
+        if magic.match(signature):
+            try:
+                with opener(file_path, 'rb') as file:
+                    file.read(1)
+            except (OSError, EOFError, lzma.LZMAError) as e:
+                print(f"File {file_path} is not compressed as its signature suggests ({e}), reading it as plain text.")
+                return None
+            return opener
+    return None
+
+class LogFileState:
+    ''' Fingerprint of a log file and the byte offset up to which it was read. '''
+    def __init__(self, file_path: str, offset: int = 0):
+        stat = os.stat(file_path)
+        self.file_path = file_path
+        self.inode = stat.st_ino
+        self.size = stat.st_size
+        self.offset = offset
+        # Offsets of compressed files do not map to the decompressed lines
+        self.followable = get_compressed_file_opener(file_path) is None
+
+    def is_same_file(self, other: "LogFileState") -> bool:
+        ''' The file was not replaced (rotated) or truncated since this state was taken. '''
+        return self.file_path == other.file_path and \
+            self.inode == other.inode and \
+            other.size >= self.offset
+
+def get_files_fingerprint(file_paths: list[str]) -> list|None:
+    ''' Fingerprint (absolute path, size, modification time) of files, None if any cannot be accessed. '''
+    fingerprint = []
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        fingerprint.append([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+def find_last_line_end(file_path: str, start_offset: int, end_offset: int, block_size: int = 64 * 1024) -> int:
+    ''' Get the offset right after the last newline in [start_offset, end_offset),
+        or start_offset if there is no complete line in that range.
+    '''
+    with open(file_path, 'rb') as file:
+        block_end = end_offset
+        while block_end > start_offset:
+            block_begin = max(start_offset, block_end - block_size)
+            file.seek(block_begin)
+            newline = file.read(block_end - block_begin).rfind(b'\n')
+            if newline != -1:
+                return block_begin + newline + 1
+            block_end = block_begin
+    return start_offset
+
+def read_log_lines(file_path: str,
+                   start_offset: int = 0,
+                   end_offset: int|None = None,
+                   chunk_size: int = READ_CHUNK_SIZE) -> list[str]:
+    ''' Read log lines of a file by memory-mapping it and splitting it in large byte chunks.
+        Only bytes in [start_offset, end_offset) are read (end_offset=None reads up to the end).
+        Chunks are always cut after a newline, so no line (or multi-byte character) is split in two.
+        Compressed files are decompressed while streaming, using the same chunked splitting
+        (offsets are ignored, the whole file is read).
+    '''
+    opener = get_compressed_file_opener(file_path)
+    if opener is not None:
+        return read_compressed_log_lines(file_path, opener, chunk_size)
+    lines = []
+    with open(file_path, 'rb') as file:
+        try:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return lines  # Empty files cannot be mapped
+        with mm:
+            for begin, end in iter_chunk_bounds(mm, start_offset, end_offset, chunk_size):
+                lines.extend(split_log_text(mm[begin:end].decode('utf-8', errors='replace')))
+    return lines
+
+def iter_chunk_bounds(mm: mmap.mmap, start_offset: int, end_offset: int|None, chunk_size: int):
+    ''' Yield (begin, end) byte ranges of chunks in [start_offset, end_offset),
+        every chunk (but the last) cut right after a newline.
+    '''
+    size = len(mm) if end_offset is None else min(len(mm), end_offset)
+    begin = start_offset
+    while begin < size:
+        end = min(begin + chunk_size, size)
+        if end < size:
+            newline = mm.rfind(b'\n', begin, end)
+            if newline == -1:
+                # Line longer than the chunk, extend to its end
+                newline = mm.find(b'\n', end)
+            end = size if newline == -1 else newline + 1
+        yield begin, end
+        begin = end
+
+def normalize_log_line(raw_line: bytes) -> str:
+    ''' Decode a single raw line the same way as split_log_text does for whole text. '''
+    return raw_line.decode('utf-8', errors='replace').replace('\x00', '').rstrip()
+
+def index_log_text(chunk: bytes, base_offset: int = 0) -> tuple[list[str], numpy.ndarray, numpy.ndarray]:
+    ''' Split a chunk into log lines (like split_log_text) and locate every line in the file.
+        Returns lines, their byte offsets (base_offset + position in chunk) and byte lengths.
+        Line boundaries are found over the raw bytes with numpy, lines are decoded all at once.
+    '''
+    data = numpy.frombuffer(chunk, dtype=numpy.uint8)
+    separators = numpy.flatnonzero((data == 0x0A) | (data == 0x0D))
+    starts = numpy.concatenate(([0], separators + 1))
+    ends = numpy.concatenate((separators, [len(data)]))
+    # A line is kept if it has any byte other than ASCII whitespace or null
+    content = numpy.flatnonzero(~_BLANK_BYTES[data])
+    has_content = numpy.searchsorted(content, starts) < numpy.searchsorted(content, ends)
+    lines = split_log_text(chunk.decode('utf-8', errors='replace'))
+    if len(lines) != numpy.count_nonzero(has_content):
+        # Lines of only non-ASCII whitespace are skipped as well, check every line on its own
+        lines = []
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            line = normalize_log_line(chunk[start:end]) if has_content[i] else ""
+            has_content[i] = line != ""
+            if line:
+                lines.append(line)
+    starts, ends = starts[has_content], ends[has_content]
+    return lines, (starts + base_offset).astype(numpy.int64), (ends - starts).astype(numpy.uint32)
+
+def read_indexed_log_lines(file_path: str,
+                           start_offset: int = 0,
+                           end_offset: int|None = None,
+                           chunk_size: int = READ_CHUNK_SIZE) -> tuple[list[str], numpy.ndarray, numpy.ndarray]:
+    ''' Read log lines like read_log_lines, together with their byte offsets and lengths in the file. '''
+    lines, offsets, lengths = [], [], []
+    with open(file_path, 'rb') as file:
+        try:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mm = None  # Empty files cannot be mapped
+        if mm is not None:
+            with mm:
+                for begin, end in iter_chunk_bounds(mm, start_offset, end_offset, chunk_size):
+                    chunk_lines, chunk_offsets, chunk_lengths = index_log_text(mm[begin:end], begin)
+                    lines.extend(chunk_lines)
+                    offsets.append(chunk_offsets)
+                    lengths.append(chunk_lengths)
+    return lines, \
+        numpy.concatenate(offsets) if offsets else numpy.empty(0, dtype=numpy.int64), \
+        numpy.concatenate(lengths) if lengths else numpy.empty(0, dtype=numpy.uint32)
+
+def read_compressed_log_lines(file_path: str, opener: Callable, chunk_size: int = READ_CHUNK_SIZE) -> list[str]:
+    ''' Read all log lines of a compressed file, decompressing it chunk by chunk (never to disk). '''
+    lines = []
+    remainder = b''
+    with opener(file_path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            chunk = remainder + chunk
+            newline = chunk.rfind(b'\n')
+            if newline == -1:
+                remainder = chunk
+                continue
+            remainder = chunk[newline + 1:]
+            lines.extend(split_log_text(chunk[:newline + 1].decode('utf-8', errors='replace')))
+    if remainder:
+        lines.extend(split_log_text(remainder.decode('utf-8', errors='replace')))
+    return lines
+
+class BoundedFileReader(io.RawIOBase):
+    ''' Raw binary stream of an open file from its current position, ending at end_offset. '''
+    def __init__(self, file, end_offset: int):
+        self.file = file
+        self.end_offset = end_offset
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.end_offset - self.file.tell())
+        if size <= 0:
+            return 0
+        return self.file.readinto(memoryview(buffer)[:size])
+
+def read_log_lines_by_line(file_path: str,
+                           start_offset: int = 0,
+                           end_offset: int|None = None,
+                           max_lines: int|None = None) -> list[str]:
+    ''' Read log lines by iterating over the file as text, one line at a time.
+        Only bytes in [start_offset, end_offset) are read (end_offset=None reads up to the end),
+        offsets are ignored for compressed files, same as in read_log_lines.
+        If max_lines is given, reading stops after that many lines.
+    '''
+    lines = []
+    opener = get_compressed_file_opener(file_path)
+    with open(file_path, 'rb') if opener is None else opener(file_path, 'rb') as raw_file:
+        if opener is None:
+            raw_file.seek(start_offset)
+            if end_offset is not None:
+                raw_file = io.BufferedReader(BoundedFileReader(raw_file, end_offset))
+        file = io.TextIOWrapper(raw_file, encoding='utf-8', errors='replace', newline='')
+        for line in file:
+            if max_lines is not None and len(lines) >= max_lines:
+                break
+            # Strip any line ending whitespace/newline characters and remove null bytes
+            line = line.replace('\x00', '').rstrip()
+            if not line:
+                continue  # Skip empty lines
+            lines.append(line)
+    return lines
+
+def get_workers_count(workers: int, jobs: int) -> int:
+    ''' Number of worker processes to use for jobs (workers <= 0 means one per CPU core). '''
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, jobs))
+
+def read_log_files(file_paths: list[str],
+                   reader: Callable[..., list[str]] = read_log_lines,
+                   workers: int = 1,
+                   end_offsets: list[int]|None = None,
+                   on_file_read: Callable[[int, int], None]|None = None,
+                   min_parallel_bytes: int = PARALLEL_READING_MIN_BYTES) -> list[list[str]]:
+    ''' Read multiple log files, in a process pool if more than one worker is used
+        and files have at least min_parallel_bytes in total (so decompression and decoding of several files run concurrently).
+        If end_offsets are given, reader is called as reader(file_path, 0, end_offset).
+        on_file_read is called with (files read, files count) whenever the next file is read.
+        Results are always returned in the order of file_paths.
+    '''
+    args = [file_paths] if end_offsets is None else [file_paths, [0] * len(file_paths), end_offsets]
+    workers = get_workers_count(workers, len(file_paths))
+    if workers > 1 and min_parallel_bytes > 0:
+        sizes = end_offsets if end_offsets is not None else [os.path.getsize(file_path) for file_path in file_paths]
+        if sum(sizes) < min_parallel_bytes:
+            workers = 1
+    if workers == 1:
+        return _collect_read_files(map(reader, *args), len(file_paths), on_file_read)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _collect_read_files(executor.map(reader, *args), len(file_paths), on_file_read)
+
+def _collect_read_files(read_files, files_count: int, on_file_read: Callable[[int, int], None]|None) -> list[list[str]]:
+    lines_of_files = []
+    for lines in read_files:
+        lines_of_files.append(lines)
+        if on_file_read is not None:
+            on_file_read(len(lines_of_files), files_count)
+    return lines_of_files